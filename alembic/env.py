@@ -25,6 +25,7 @@ from app import database
 from app.models.user import User
 from app.models.plate import AutoPlate
 from app.models.bid import Bid
+from app.models.proxy_bid import ProxyBid
 
 target_metadata = database.Base.metadata
 
@@ -0,0 +1,79 @@
+"""Migrations for the bid shards listed in BID_SHARD_URLS.
+
+    alembic -n shards -x shard=all upgrade head
+    alembic -n shards -x shard=2 upgrade head
+
+Each shard keeps its own alembic_version table. The shard index is passed
+to migrations as config.attributes["shard"].
+"""
+
+import asyncio
+from logging.config import fileConfig
+
+from sqlalchemy import pool
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from alembic import context
+
+from app.core.config import settings
+
+config = context.config
+
+if config.config_file_name is not None:
+    fileConfig(config.config_file_name)
+
+# Shard tables are maintained by hand-written migrations only
+target_metadata = None
+
+
+def shard_urls():
+    urls = [url.strip() for url in settings.BID_SHARD_URLS.split(",") if url.strip()]
+    if not urls:
+        raise SystemExit("BID_SHARD_URLS is not set, there are no shards to migrate")
+    selected = context.get_x_argument(as_dictionary=True).get("shard", "all")
+    if selected == "all":
+        return list(enumerate(urls))
+    index = int(selected)
+    return [(index, urls[index])]
+
+
+def run_migrations_offline() -> None:
+    """Emit the SQL of every selected shard, one after the other."""
+    for shard, url in shard_urls():
+        config.attributes["shard"] = shard
+        context.configure(
+            url=url,
+            target_metadata=target_metadata,
+            literal_binds=True,
+            dialect_opts={"paramstyle": "named"},
+        )
+        with context.begin_transaction():
+            context.run_migrations()
+
+
+def do_run_migrations(connection: Connection) -> None:
+    context.configure(connection=connection, target_metadata=target_metadata)
+
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+async def run_async_migrations() -> None:
+    for shard, url in shard_urls():
+        print(f"Migrating bid shard {shard}")
+        config.attributes["shard"] = shard
+        connectable = create_async_engine(url, poolclass=pool.NullPool)
+        async with connectable.connect() as connection:
+            await connection.run_sync(do_run_migrations)
+        await connectable.dispose()
+
+
+def run_migrations_online() -> None:
+    asyncio.run(run_async_migrations())
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
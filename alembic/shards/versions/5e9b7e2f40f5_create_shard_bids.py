@@ -0,0 +1,64 @@
+"""Create the bids table on a bid shard
+
+Revision ID: 5e9b7e2f40f5
+Revises:
+Create Date: 2026-10-19 14:05:12.604381
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.sharding import SHARD_ID_BITS
+
+
+# revision identifiers, used by Alembic.
+revision: str = "5e9b7e2f40f5"
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # No foreign keys: users and plates live on the primary
+    op.create_table(
+        "bids",
+        sa.Column(
+            "id",
+            sa.BigInteger().with_variant(sa.Integer(), "sqlite"),
+            primary_key=True,
+        ),
+        sa.Column("amount", sa.Float(precision=2), nullable=True),
+        sa.Column("user_id", sa.Integer(), nullable=True),
+        sa.Column("plate_id", sa.Integer(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("is_active", sa.Boolean(), nullable=True),
+        sa.UniqueConstraint("user_id", "plate_id", name="uq_user_plate"),
+        sqlite_autoincrement=True,
+    )
+    op.create_index(op.f("ix_bids_plate_id"), "bids", ["plate_id"], unique=False)
+    op.create_index(op.f("ix_bids_user_id"), "bids", ["user_id"], unique=False)
+
+    # Start this shard's ids at the beginning of its range
+    start = op.get_context().config.attributes["shard"] << SHARD_ID_BITS
+    if not start:
+        return
+    dialect = op.get_context().dialect.name
+    if dialect == "sqlite":
+        op.execute(
+            f"INSERT INTO sqlite_sequence (name, seq) VALUES ('bids', {start})"
+        )
+    elif dialect == "postgresql":
+        op.execute(f"ALTER SEQUENCE bids_id_seq RESTART WITH {start + 1}")
+    elif dialect == "mysql":
+        op.execute(f"ALTER TABLE bids AUTO_INCREMENT = {start + 1}")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f("ix_bids_user_id"), table_name="bids")
+    op.drop_index(op.f("ix_bids_plate_id"), table_name="bids")
+    op.drop_table("bids")
@@ -0,0 +1,68 @@
+"""Store shard bid amounts as integer minor units
+
+Revision ID: b7d24f81c6e9
+Revises: 5e9b7e2f40f5
+Create Date: 2026-10-19 16:24:37.914552
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.core.money import MINOR_PER_UNIT
+from app.sharding import SHARD_ID_BITS
+
+
+# revision identifiers, used by Alembic.
+revision: str = "b7d24f81c6e9"
+down_revision: Union[str, None] = "5e9b7e2f40f5"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _keep_id_range() -> None:
+    """
+    SQLite batch mode recreates the table, which loses the id sequence
+    seeded to the start of this shard's range
+    """
+    if op.get_context().dialect.name != "sqlite":
+        return
+    start = op.get_context().config.attributes["shard"] << SHARD_ID_BITS
+    op.execute("DELETE FROM sqlite_sequence WHERE name = 'bids'")
+    op.execute(
+        "INSERT INTO sqlite_sequence (name, seq) "
+        f"SELECT 'bids', MAX(COALESCE(MAX(id), 0), {start}) FROM bids"
+    )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute(f"UPDATE bids SET amount = ROUND(amount * {MINOR_PER_UNIT})")
+    with op.batch_alter_table(
+        "bids", table_kwargs={"sqlite_autoincrement": True}
+    ) as batch_op:
+        batch_op.alter_column(
+            "amount",
+            existing_type=sa.Float(precision=2),
+            type_=sa.BigInteger(),
+            postgresql_using="amount::bigint",
+        )
+        batch_op.create_index(
+            "ix_bids_plate_id_amount", ["plate_id", "amount"], unique=False
+        )
+    _keep_id_range()
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table(
+        "bids", table_kwargs={"sqlite_autoincrement": True}
+    ) as batch_op:
+        batch_op.drop_index("ix_bids_plate_id_amount")
+        batch_op.alter_column(
+            "amount", existing_type=sa.BigInteger(), type_=sa.Float(precision=2)
+        )
+    _keep_id_range()
+    op.execute(f"UPDATE bids SET amount = amount / {MINOR_PER_UNIT}.0")
@@ -0,0 +1,45 @@
+"""Create proxy_bids on a bid shard
+
+Revision ID: f2a6c8e4b1d7
+Revises: b7d24f81c6e9
+Create Date: 2026-10-19 18:14:02.337915
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "f2a6c8e4b1d7"
+down_revision: Union[str, None] = "b7d24f81c6e9"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Proxies live with the bids of their plate, without foreign keys
+    op.create_table(
+        "proxy_bids",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=True),
+        sa.Column("plate_id", sa.Integer(), nullable=True),
+        sa.Column("max_amount", sa.BigInteger(), nullable=False),
+        sa.Column("is_active", sa.Boolean(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("user_id", "plate_id", name="uq_proxy_user_plate"),
+    )
+    op.create_index(
+        op.f("ix_proxy_bids_plate_id"), "proxy_bids", ["plate_id"], unique=False
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f("ix_proxy_bids_plate_id"), table_name="proxy_bids")
+    op.drop_table("proxy_bids")
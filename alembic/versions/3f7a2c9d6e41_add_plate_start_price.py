@@ -0,0 +1,34 @@
+"""Add start_price to auto_plates
+
+Revision ID: 3f7a2c9d6e41
+Revises: 6c3d9e1a2f58
+Create Date: 2026-10-19 23:05:42.871903
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "3f7a2c9d6e41"
+down_revision: Union[str, None] = "6c3d9e1a2f58"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table("auto_plates") as batch_op:
+        batch_op.add_column(sa.Column("start_price", sa.BigInteger(), nullable=True))
+
+    # Only plates without bids still show the price staff set
+    op.execute("UPDATE auto_plates SET start_price = price WHERE bidder_count = 0")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table("auto_plates") as batch_op:
+        batch_op.drop_column("start_price")
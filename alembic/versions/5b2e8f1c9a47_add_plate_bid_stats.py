@@ -0,0 +1,46 @@
+"""Add bid statistics counters to auto_plates
+
+Revision ID: 5b2e8f1c9a47
+Revises: d3f979bf031e
+Create Date: 2026-10-19 09:12:41.318204
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "5b2e8f1c9a47"
+down_revision: Union[str, None] = "d3f979bf031e"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table("auto_plates") as batch_op:
+        batch_op.add_column(
+            sa.Column("bid_count", sa.Integer(), server_default="0", nullable=False)
+        )
+        batch_op.add_column(
+            sa.Column(
+                "bidder_count", sa.Integer(), server_default="0", nullable=False
+            )
+        )
+
+    # Backfill the counters from existing bids
+    op.execute(
+        "UPDATE auto_plates SET "
+        "bidder_count = (SELECT COUNT(*) FROM bids WHERE bids.plate_id = auto_plates.id), "
+        "bid_count = (SELECT COUNT(*) FROM bids WHERE bids.plate_id = auto_plates.id)"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table("auto_plates") as batch_op:
+        batch_op.drop_column("bidder_count")
+        batch_op.drop_column("bid_count")
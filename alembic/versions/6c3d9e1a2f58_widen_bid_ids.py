@@ -0,0 +1,35 @@
+"""Widen bid ids to 64 bits
+
+Revision ID: 6c3d9e1a2f58
+Revises: a8d3f6b2c1e4
+Create Date: 2026-10-19 21:40:18.227591
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "6c3d9e1a2f58"
+down_revision: Union[str, None] = "a8d3f6b2c1e4"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # SQLite integer keys are 64-bit already, and rebuilding the table
+    # would stop the id being the rowid
+    if op.get_context().dialect.name == "sqlite":
+        return
+    op.alter_column("bids", "id", existing_type=sa.Integer(), type_=sa.BigInteger())
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_context().dialect.name == "sqlite":
+        return
+    op.alter_column("bids", "id", existing_type=sa.BigInteger(), type_=sa.Integer())
@@ -0,0 +1,39 @@
+"""Add leading_bid_id to auto_plates
+
+Revision ID: 8e2b5f4c1a73
+Revises: 3f7a2c9d6e41
+Create Date: 2026-10-20 10:12:07.409318
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "8e2b5f4c1a73"
+down_revision: Union[str, None] = "3f7a2c9d6e41"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table("auto_plates") as batch_op:
+        batch_op.add_column(sa.Column("leading_bid_id", sa.BigInteger(), nullable=True))
+
+    # Bids kept on the primary: the earliest at the price, as _settle took
+    # it. Plates whose bids are sharded stay NULL until their next bid
+    op.execute(
+        "UPDATE auto_plates SET leading_bid_id = ("
+        "SELECT MIN(bids.id) FROM bids WHERE bids.plate_id = auto_plates.id "
+        "AND bids.amount = auto_plates.price) WHERE bidder_count > 0"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table("auto_plates") as batch_op:
+        batch_op.drop_column("leading_bid_id")
@@ -0,0 +1,75 @@
+"""Store bid amounts and plate prices as integer minor units
+
+Revision ID: 9a1c7e3d5b20
+Revises: 5b2e8f1c9a47
+Create Date: 2026-10-19 16:21:08.527103
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.core.money import MINOR_PER_UNIT
+
+
+# revision identifiers, used by Alembic.
+revision: str = "9a1c7e3d5b20"
+down_revision: Union[str, None] = "5b2e8f1c9a47"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Convert the values first, the column types follow (SQLite copies the
+    # data as is when batch mode recreates the tables)
+    op.execute(f"UPDATE bids SET amount = ROUND(amount * {MINOR_PER_UNIT})")
+    # auto_plates.price was added to existing databases outside this
+    # revision chain, so a database built from these migrations alone has none
+    has_price = "price" in {
+        column["name"]
+        for column in sa.inspect(op.get_bind()).get_columns("auto_plates")
+    }
+    if has_price:
+        op.execute(
+            f"UPDATE auto_plates SET price = ROUND(price * {MINOR_PER_UNIT})"
+        )
+
+    with op.batch_alter_table("bids") as batch_op:
+        batch_op.alter_column(
+            "amount",
+            existing_type=sa.Float(precision=2),
+            type_=sa.BigInteger(),
+            postgresql_using="amount::bigint",
+        )
+        batch_op.create_index(
+            "ix_bids_plate_id_amount", ["plate_id", "amount"], unique=False
+        )
+    with op.batch_alter_table("auto_plates") as batch_op:
+        if has_price:
+            batch_op.alter_column(
+                "price",
+                existing_type=sa.Float(precision=2),
+                type_=sa.BigInteger(),
+                postgresql_using="price::bigint",
+            )
+        else:
+            batch_op.add_column(sa.Column("price", sa.BigInteger(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table("auto_plates") as batch_op:
+        batch_op.alter_column(
+            "price", existing_type=sa.BigInteger(), type_=sa.Float(precision=2)
+        )
+    with op.batch_alter_table("bids") as batch_op:
+        batch_op.drop_index("ix_bids_plate_id_amount")
+        batch_op.alter_column(
+            "amount", existing_type=sa.BigInteger(), type_=sa.Float(precision=2)
+        )
+
+    op.execute(f"UPDATE auto_plates SET price = price / {MINOR_PER_UNIT}.0")
+    op.execute(f"UPDATE bids SET amount = amount / {MINOR_PER_UNIT}.0")
@@ -0,0 +1,33 @@
+"""Index open plates by deadline
+
+Revision ID: a8d3f6b2c1e4
+Revises: e5f1b9c3a7d2
+Create Date: 2026-10-19 19:24:07.518230
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "a8d3f6b2c1e4"
+down_revision: Union[str, None] = "e5f1b9c3a7d2"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        "ix_auto_plates_is_active_deadline",
+        "auto_plates",
+        ["is_active", "deadline"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_auto_plates_is_active_deadline", table_name="auto_plates")
@@ -0,0 +1,37 @@
+"""Add bid rules to auto_plates
+
+Revision ID: c4e8a2f6d913
+Revises: 9a1c7e3d5b20
+Create Date: 2026-10-19 17:02:55.160734
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "c4e8a2f6d913"
+down_revision: Union[str, None] = "9a1c7e3d5b20"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table("auto_plates") as batch_op:
+        batch_op.add_column(sa.Column("reserve_price", sa.BigInteger(), nullable=True))
+        batch_op.add_column(sa.Column("max_bid", sa.BigInteger(), nullable=True))
+        batch_op.add_column(
+            sa.Column("increment_tiers", sa.String(length=200), nullable=True)
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table("auto_plates") as batch_op:
+        batch_op.drop_column("increment_tiers")
+        batch_op.drop_column("max_bid")
+        batch_op.drop_column("reserve_price")
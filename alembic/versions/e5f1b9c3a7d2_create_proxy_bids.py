@@ -0,0 +1,48 @@
+"""Create proxy_bids
+
+Revision ID: e5f1b9c3a7d2
+Revises: c4e8a2f6d913
+Create Date: 2026-10-19 18:11:40.902318
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "e5f1b9c3a7d2"
+down_revision: Union[str, None] = "c4e8a2f6d913"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "proxy_bids",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=True),
+        sa.Column("plate_id", sa.Integer(), nullable=True),
+        sa.Column("max_amount", sa.BigInteger(), nullable=False),
+        sa.Column("is_active", sa.Boolean(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(["plate_id"], ["auto_plates.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("user_id", "plate_id", name="uq_proxy_user_plate"),
+    )
+    op.create_index(op.f("ix_proxy_bids_id"), "proxy_bids", ["id"], unique=False)
+    op.create_index(
+        op.f("ix_proxy_bids_plate_id"), "proxy_bids", ["plate_id"], unique=False
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f("ix_proxy_bids_plate_id"), table_name="proxy_bids")
+    op.drop_index(op.f("ix_proxy_bids_id"), table_name="proxy_bids")
+    op.drop_table("proxy_bids")
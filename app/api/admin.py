@@ -0,0 +1,76 @@
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import PlainTextResponse
+
+from app.core.profiling import request_profiler
+from app.core.security import get_current_user
+from app.models.user import User
+from app.schemas.profiling import ProfiledRequest, ProfilingStatus, ProfilingUpdate
+
+
+async def require_staff(current_user: User = Depends(get_current_user)) -> User:
+    if not current_user.is_staff:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions",
+        )
+    return current_user
+
+
+router = APIRouter(
+    prefix="/admin", tags=["admin"], dependencies=[Depends(require_staff)]
+)
+
+
+def profiling_status() -> dict:
+    return {**request_profiler.status(), "token": request_profiler.token}
+
+
+@router.get("/profiling", response_model=ProfilingStatus)
+async def get_profiling():
+    """
+    Profiler state of the worker that handles this call. Each worker
+    profiles its own requests.
+    """
+    return profiling_status()
+
+
+@router.put("/profiling", response_model=ProfilingStatus)
+async def update_profiling(data: ProfilingUpdate):
+    """
+    Switch profiling on or off without a restart. While on, `sample_rate`
+    of requests are sampled, and requests with the returned `token` in an
+    X-Profile header run under cProfile.
+    """
+    if data.enabled:
+        request_profiler.enable(data.sample_rate, data.interval_ms)
+    else:
+        request_profiler.disable()
+    return profiling_status()
+
+
+@router.delete("/profiling", status_code=status.HTTP_204_NO_CONTENT)
+async def clear_profiling():
+    """
+    Drop the collected stacks and requests.
+    """
+    request_profiler.clear()
+    return None
+
+
+@router.get("/profiling/stacks", response_class=PlainTextResponse)
+async def get_profiling_stacks(route: Optional[str] = None):
+    """
+    Sampled stacks in collapsed format, one "<route>;<frames> <count>" line
+    per stack, for flamegraph.pl or speedscope. Optionally for one route,
+    e.g. "POST /api/v1/bids/".
+    """
+    return request_profiler.collapsed(route)
+
+
+@router.get("/profiling/requests", response_model=List[ProfiledRequest])
+async def get_profiled_requests(limit: int = Query(20, ge=1)):
+    """
+    Most recent profiled requests with their SQL statements and timings.
+    """
+    return list(request_profiler.requests)[-limit:][::-1]
@@ -5,7 +5,7 @@ from datetime import timedelta
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.controllers.user_controller import UserController
-from app.database import get_session
+from app.dependencies import get_session
 from app.models.user import User
 from app.schemas.user import UserCreate, UserResponse, UserLogin
 from app.core.security import (
@@ -31,7 +31,6 @@ async def login_for_access_token(
     """
     Authenticate user and generate JWT token
     """
-    print(form_data)
     user = await authenticate_user(form_data.username, form_data.password, session)
     if not user:
         raise HTTPException(
@@ -1,13 +1,26 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status
+from datetime import datetime
+from typing import List, Literal, Optional
+from fastapi import APIRouter, Body, Depends, HTTPException, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.actors import plate_actors
+from app.core.config import settings
 from app.core.security import get_current_user
 from app.controllers.bid_controller import BidController
+from app.controllers.export_controller import BidExportController, EXPORT_MEDIA_TYPES
 from app.controllers.plate_controller import PlateController
-from app.database import get_session as get_db
+from app.dependencies import get_read_session, get_session as get_db
 from app.models.user import User
-from app.schemas.bid import Bid, BidCreate, BidUpdate
+from app.schemas.bid import (
+    ActiveBid,
+    Bid,
+    BidBatchResult,
+    BidCreate,
+    BidUpdate,
+    ProxyBid,
+    ProxyBidCreate,
+)
 
 router = APIRouter(prefix="/bids", tags=["bids"])
 
@@ -20,17 +33,113 @@ router = APIRouter(prefix="/bids", tags=["bids"])
     summary="Get all bids",
 )
 async def get_bids_by_user(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_session),
     current_user: User = Depends(get_current_user),
 ):
     bid_controller = BidController(db)
     return await bid_controller.get_bids_by_user(current_user.id)
 
 
+@router.get("/active", response_model=List[ActiveBid])
+async def get_active_bids(
+    db: AsyncSession = Depends(get_read_session),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Get the current user's bids on plates still open for bidding, each
+    marked leading or outbid.
+    """
+    bid_controller = BidController(db)
+    return await bid_controller.get_active_bids(current_user.id)
+
+
+@router.get("/export")
+async def export_bids(
+    format: Literal["csv", "ndjson", "columnar"] = "csv",
+    plate_id: Optional[int] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Stream all bids, optionally for one plate and a created_at range
+    [since, until). `columnar` emits one JSON line per batch with a list of
+    values per column.
+    """
+    if not current_user.is_staff:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions to export bids",
+        )
+
+    export_controller = BidExportController(plate_id, since, until)
+    extension = "csv" if format == "csv" else "ndjson"
+    return StreamingResponse(
+        export_controller.export(format),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="bids.{extension}"'},
+    )
+
+
+@router.get("/proxy", response_model=List[ProxyBid])
+async def get_proxy_bids(
+    db: AsyncSession = Depends(get_read_session),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Get the current user's proxy bids.
+    """
+    bid_controller = BidController(db)
+    return await bid_controller.get_proxy_bids_by_user(current_user.id)
+
+
+@router.post(
+    "/proxy",
+    response_model=ProxyBid,
+    status_code=status.HTTP_201_CREATED,
+    description="Bid automatically on the user's behalf up to max_amount",
+    summary="Set a proxy bid",
+)
+async def set_proxy_bid(
+    proxy_in: ProxyBidCreate,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    bid_controller = BidController(db)
+    # Proxies bid through the plate's actor like every other bid
+    await db.commit()
+    return await plate_actors.run(
+        proxy_in.plate_id,
+        lambda: bid_controller.set_proxy_bid(proxy_in, current_user),
+    )
+
+
+@router.delete("/proxy/{plate_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def withdraw_proxy_bid(
+    plate_id: int,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Withdraw the current user's proxy bid on a plate. Bids it already
+    placed stay.
+    """
+    bid_controller = BidController(db)
+    await db.commit()
+    withdrawn = await plate_actors.run(
+        plate_id, lambda: bid_controller.withdraw_proxy_bid(plate_id, current_user)
+    )
+    if not withdrawn:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Proxy bid not found"
+        )
+    return None
+
+
 @router.get("/{bid_id}", response_model=Bid)
 async def get_bid(
     bid_id: int,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_session),
 ):
     """
     Get a specific bid by ID.
@@ -59,7 +168,37 @@ async def create_bid(
     bid_controller = BidController(db)
     bid_data = bid_in.model_dump()
     new_bid = BidCreate(**bid_data)
-    return await bid_controller.create_bid(new_bid, current_user)
+    # Hand back the connection used to load the user while this request
+    # waits for its turn; bids on the same plate are applied one at a time,
+    # in arrival order
+    await db.commit()
+    return await plate_actors.run(
+        new_bid.plate_id, lambda: bid_controller.create_bid(new_bid, current_user)
+    )
+
+
+@router.post(
+    "/batch",
+    response_model=List[BidBatchResult],
+    status_code=status.HTTP_200_OK,
+    description="Place bids on several plates in one request, results in request order",
+    summary="Create bids in bulk",
+)
+async def create_bids(
+    bids_in: List[BidCreate] = Body(
+        ..., min_length=1, max_length=settings.BID_BATCH_MAX_SIZE
+    ),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    bid_controller = BidController(db)
+    await db.commit()
+    # Holds every plate's actor, so the batch is applied in between the
+    # single bids on those plates
+    return await plate_actors.run_many(
+        [bid.plate_id for bid in bids_in],
+        lambda: bid_controller.create_bids(bids_in, current_user),
+    )
 
 
 @router.put(
@@ -76,8 +215,23 @@ async def update_bid(
     current_user: User = Depends(get_current_user),
 ):
     bid_controller = BidController(db)
-    updated_bid = await bid_controller.update_bid(bid_id, bid_in, current_user)
-    return updated_bid
+    bid = await bid_controller.get_bid(bid_id)
+    if not bid:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Bid not found"
+        )
+    # Raising a bid bids on its owner's behalf
+    if bid.user_id != current_user.id and not current_user.is_staff:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions to update this bid",
+        )
+    await db.commit()
+    # Changes the plate's price, so it waits its turn with the new bids
+    return await plate_actors.run(
+        bid.plate_id,
+        lambda: bid_controller.update_bid(bid_id, bid_in, current_user),
+    )
 
 
 @router.delete("/{bid_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -104,18 +258,21 @@ async def delete_bid(
             detail="Not enough permissions to delete this bid",
         )
 
-    await bid_controller.delete_bid(bid_id)
+    await db.commit()
+    await plate_actors.run(bid.plate_id, lambda: bid_controller.delete_bid(bid_id))
     return None
 
 
 @router.get("/plates/{plate_id}/highest", response_model=Bid)
-async def get_highest_bid(plate_id: int, db: AsyncSession = Depends(get_db)):
+async def get_highest_bid(
+    plate_id: int, db: AsyncSession = Depends(get_read_session)
+):
     """
     Get the highest bid for a specific plate.
     """
     plate_controller = PlateController(db)
     try:
-        highest_bid = await plate_controller.get_highest_bid_for_plate(plate_id)
+        highest_bid = await plate_controller.get_highest_bid_coalesced(plate_id)
         if not highest_bid:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -1,19 +1,33 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import List, Literal, Optional
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.security import get_current_active_user, get_current_user
+from app.controllers.bid_controller import BidController
+from app.controllers.import_controller import PlateImportController, parse_rows
 from app.controllers.plate_controller import PlateController
-from app.database import get_session as get_db
+from app.core.leaderboard import hot_auctions
+from app.database import shared_session
+from app.dependencies import get_read_session, get_session as get_db
 from app.models.user import User
-from app.schemas.plate import Plate, PlateCreate, PlateUpdate
+from app.schemas.plate import (
+    HotPlate,
+    Plate,
+    PlateCreate,
+    PlateImportResult,
+    PlateStats,
+    PlateUpdate,
+)
+from app.sse import plate_event_stream
+from app.websocket import highest_bid_message, manager
 
 router = APIRouter(prefix="/plates", tags=["plates"])
 
 
 @router.get("/", response_model=List[Plate])
 async def get_plates(
-    skip: int = 0, limit: int = 100, db: AsyncSession = Depends(get_db)
+    skip: int = 0, limit: int = 100, db: AsyncSession = Depends(get_read_session)
 ):
     """
     Get all plates.
@@ -22,17 +36,36 @@ async def get_plates(
     return await plate_controller.get_plates(skip, limit)
 
 
+@router.get("/hot", response_model=List[HotPlate])
+async def get_hot_plates(
+    by: Literal["activity", "price"] = "activity",
+    limit: int = Query(10, gt=0, le=100),
+    db: AsyncSession = Depends(get_read_session),
+):
+    """
+    Get the plates with the most recent bid activity or the highest price.
+    """
+    entries = await hot_auctions.top(by, limit)
+    plate_controller = PlateController(db)
+    plates = await plate_controller.get_plates_by_ids([pid for pid, _ in entries])
+    scores = dict(entries)
+    return [
+        HotPlate(**Plate.model_validate(plate).model_dump(), score=scores[plate.id])
+        for plate in plates
+    ]
+
+
 @router.get("/{plate_id}", response_model=Plate)
 async def get_plate(
     plate_id: int,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_session),
     current_user: User = Depends(get_current_active_user),
 ):
     """
     Get a specific plate by ID.
     """
     plate_controller = PlateController(db)
-    plate = await plate_controller.get_plate(plate_id)
+    plate = await plate_controller.get_plate_coalesced(plate_id)
     if not plate:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Plate not found"
@@ -40,6 +73,55 @@ async def get_plate(
     return plate
 
 
+@router.get("/{plate_id}/stats", response_model=PlateStats)
+async def get_plate_stats(plate_id: int, db: AsyncSession = Depends(get_read_session)):
+    """
+    Get bid count, bidder count and bid velocity for a plate.
+    """
+    plate_controller = PlateController(db)
+    stats = await plate_controller.get_plate_stats(plate_id)
+    if not stats:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Plate not found"
+        )
+    return stats
+
+
+@router.get("/{plate_id}/events")
+async def stream_plate_events(
+    plate_id: int,
+    last_event_id: Optional[int] = Header(None),
+):
+    """
+    Server-Sent Events feed of a plate's bids, a read-only alternative to
+    the websocket. Reconnecting clients resume from Last-Event-ID.
+    """
+    # Listen before reading state so no broadcast falls in between
+    queue = manager.add_listener(plate_id)
+    initial = (
+        manager.events_since(plate_id, last_event_id)
+        if last_event_id is not None
+        else None
+    )
+    if initial is None:
+        seq = manager.current_sequence(plate_id)
+        try:
+            # Short-lived session, nothing is held while the stream is open
+            async with shared_session(readonly=True) as session:
+                bid_controller = BidController(session)
+                highest_bid = await bid_controller.get_highest_bid_for_plate(plate_id)
+        except Exception:
+            manager.remove_listener(plate_id, queue)
+            raise
+        initial = [highest_bid_message(plate_id, seq, highest_bid)]
+
+    return StreamingResponse(
+        plate_event_stream(plate_id, queue, initial),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @router.post("/", response_model=Plate, status_code=status.HTTP_201_CREATED)
 async def create_plate(
     plate_in: PlateCreate,
@@ -61,6 +143,30 @@ async def create_plate(
     return await plate_controller.create_plate(plate_in, current_user)
 
 
+@router.post("/import", response_model=PlateImportResult)
+async def import_plates(
+    request: Request,
+    format: Literal["csv", "ndjson"] = "csv",
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Create plates in bulk from a CSV (with header row) or NDJSON request
+    body. The body is processed as it streams in; invalid rows are reported
+    and skipped.
+    """
+    if not current_user.is_staff:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions to create plates",
+        )
+
+    import_controller = PlateImportController(db)
+    return await import_controller.import_plates(
+        parse_rows(request.stream(), format), current_user
+    )
+
+
 @router.put("/{plate_id}", response_model=Plate)
 async def update_plate(
     plate_id: int,
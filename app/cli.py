@@ -0,0 +1,151 @@
+"""
+Command line tools for operators.
+
+    python -m app.cli import-plates plates.csv --created-by admin
+    python -m app.cli import-plates plates.ndjson --format ndjson --created-by admin
+    python -m app.cli export-bids --format csv --since 2025-01-01 -o bids.csv
+"""
+
+import argparse
+import asyncio
+import sys
+from datetime import datetime
+from typing import AsyncIterator, BinaryIO
+
+from sqlalchemy import select
+
+from app.core.config import settings
+
+READ_CHUNK_SIZE = 64 * 1024
+
+
+async def read_chunks(stream: BinaryIO) -> AsyncIterator[bytes]:
+    while True:
+        chunk = stream.read(READ_CHUNK_SIZE)
+        if not chunk:
+            return
+        yield chunk
+
+
+def detect_format(path: str) -> str:
+    return "ndjson" if path.endswith((".ndjson", ".jsonl")) else "csv"
+
+
+async def import_plates(args) -> int:
+    from app.controllers.import_controller import PlateImportController, parse_rows
+    from app.database import async_session_factory, engine
+    from app.models.bid import Bid  # noqa: F401
+    from app.models.user import User
+
+    engine.echo = False
+    fmt = args.format or detect_format(args.file)
+
+    def progress(imported: int, failed: int, seconds: float) -> None:
+        rate = imported / seconds if seconds else 0.0
+        print(
+            f"\r{imported} imported, {failed} failed, {rate:,.0f} rows/sec",
+            end="",
+            file=sys.stderr,
+        )
+
+    async with async_session_factory() as session:
+        user = (
+            await session.execute(select(User).where(User.username == args.created_by))
+        ).scalar_one_or_none()
+        if user is None:
+            print(f"User {args.created_by!r} not found", file=sys.stderr)
+            return 1
+
+        stream = sys.stdin.buffer if args.file == "-" else open(args.file, "rb")
+        try:
+            result = await PlateImportController(session).import_plates(
+                parse_rows(read_chunks(stream), fmt),
+                user,
+                batch_size=args.batch_size,
+                on_batch=progress,
+            )
+        finally:
+            if stream is not sys.stdin.buffer:
+                stream.close()
+    await engine.dispose()
+
+    print(file=sys.stderr)
+    for error in result["errors"]:
+        print(f"line {error['line']}: {error['error']}")
+    if result["failed"] > len(result["errors"]):
+        print(f"... and {result['failed'] - len(result['errors'])} more rejected rows")
+    print(
+        f"Imported {result['imported']} plates, {result['failed']} rejected,"
+        f" {result['seconds']}s ({result['rows_per_second']:,.0f} rows/sec)"
+    )
+    return 0 if not result["failed"] else 2
+
+
+async def export_bids(args) -> int:
+    from app.controllers.export_controller import BidExportController
+    from app.database import engine
+
+    engine.echo = False
+    export_controller = BidExportController(
+        args.plate_id, args.since, args.until, batch_size=args.batch_size
+    )
+    stream = sys.stdout.buffer if args.output == "-" else open(args.output, "wb")
+    try:
+        async for chunk in export_controller.export(args.format):
+            stream.write(chunk)
+    finally:
+        if stream is sys.stdout.buffer:
+            stream.flush()
+        else:
+            stream.close()
+    await engine.dispose()
+    return 0
+
+
+def main(argv=None) -> int:
+    from app.controllers.export_controller import EXPORT_FORMATS
+    from app.controllers.import_controller import IMPORT_FORMATS
+
+    parser = argparse.ArgumentParser(prog="python -m app.cli")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    import_parser = commands.add_parser(
+        "import-plates", help="Bulk import plates from a CSV or NDJSON file"
+    )
+    import_parser.add_argument("file", help="Path to the file, - for stdin")
+    import_parser.add_argument(
+        "--format",
+        choices=IMPORT_FORMATS,
+        help="Defaults to ndjson for .ndjson/.jsonl files, csv otherwise",
+    )
+    import_parser.add_argument(
+        "--created-by", required=True, help="Username recorded as the creator"
+    )
+    import_parser.add_argument(
+        "--batch-size", type=int, default=settings.IMPORT_BATCH_SIZE
+    )
+    import_parser.set_defaults(handler=import_plates)
+
+    export_parser = commands.add_parser(
+        "export-bids", help="Stream bids to a CSV, NDJSON or columnar file"
+    )
+    export_parser.add_argument("--format", choices=EXPORT_FORMATS, default="csv")
+    export_parser.add_argument("--plate-id", type=int)
+    export_parser.add_argument(
+        "--since", type=datetime.fromisoformat, help="Inclusive, ISO date or datetime"
+    )
+    export_parser.add_argument(
+        "--until", type=datetime.fromisoformat, help="Exclusive, ISO date or datetime"
+    )
+    export_parser.add_argument("-o", "--output", default="-", help="Defaults to stdout")
+    export_parser.add_argument(
+        "--batch-size", type=int, default=settings.EXPORT_BATCH_SIZE
+    )
+    export_parser.set_defaults(handler=export_bids)
+
+    args = parser.parse_args(argv)
+    return asyncio.run(args.handler(args))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,16 +1,50 @@
-from typing import Optional, Sequence, List
+import logging
+from contextlib import AsyncExitStack
+from decimal import Decimal
+from typing import Dict, Iterable, Optional, Sequence, List, Tuple
 from fastapi import Depends, HTTPException, status
 
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
 from datetime import datetime
 
-from app.database import get_session
+from app.dependencies import get_session
 from app.models.bid import Bid
-from app.models.user import User
 from app.models.plate import AutoPlate
-from app.schemas.bid import BidCreate, BidUpdate
-from app.tasks.notification_tasks import send_bid_notification
+from app.models.proxy_bid import ProxyBid
+from app.schemas.bid import Bid as BidSchema, BidCreate, BidUpdate, ProxyBidCreate
+from app.core.active_bids import active_bid_views
+from app.core.actors import lock_plates
+from app.core.leaderboard import hot_auctions
+from app.core.bid_rules import rules_for
+from app.core.money import from_minor, to_minor
+from app.core.proxy_bidding import Bidder, resolve
+from app.core.singleflight import highest_bid_reads, plate_reads
+from app.core.stats import bid_rates
+from app.queries import (
+    active_bid_rows,
+    active_bids,
+    active_user_proxy,
+    bids_by_plate,
+    bids_by_user,
+    bids_in_play,
+    highest_bid,
+    highest_bids,
+    locked_plates_by_ids,
+    open_plate_rows,
+    plates_by_ids,
+    proxies_in_play,
+    proxy_bids_by_user,
+    user_proxy,
+)
+from app.sharding import (
+    bid_session_for_bid,
+    bid_session_for_plate,
+    bid_shards,
+    scatter_bids,
+)
+
+# Per-bid events, sampled by LOG_SAMPLE_RATES
+logger = logging.getLogger(__name__)
 
 
 class BidController:
@@ -30,81 +64,436 @@ class BidController:
             )
 
         # Check if plate exists and is active
-        plate = await self.__session.get(AutoPlate, data.plate_id)
+        plate = await self._load_plate(data.plate_id)
         if not plate or not plate.is_active:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Cannot place bid for inactive plate",
             )
+        self._check_rules(plate, data.amount)
 
-        # Check if user already has a bid for this plate
-        query = select(Bid).where(
-            Bid.user_id == current_user.id, Bid.plate_id == data.plate_id
+        async with bid_session_for_plate(data.plate_id, self.__session) as bids:
+            placed, top = await self._settle(
+                bids, plate, current_user.id, data.amount
+            )
+            bid = placed[current_user.id]
+            await bids.commit()
+            if bids is not self.__session:
+                # The bid is stored on its shard first, plate totals follow
+                # on the primary (reconcile_plate_stats repairs any drift)
+                await self.__session.commit()
+            await bids.refresh(bid)
+        logger.info(
+            "Bid placed",
+            extra={
+                "plate_id": plate.id,
+                "user_id": current_user.id,
+                "amount": data.amount,
+                "price": plate.price,
+            },
         )
-        result = await self.__session.execute(query)
-        existing_bid = result.scalar_one_or_none()
-
-        if existing_bid:
-            # Update existing bid
-            existing_bid.amount = data.amount
-            existing_bid.updated_at = datetime.now()
-            bid = existing_bid
-        else:
-            # Create new bid
-            bid = Bid(**data.model_dump())
-        bid.user_id = current_user.id
-        self.__session.add(bid)
-
-        # Update plate price if new bid is higher
-        if plate.price < data.amount:
-            plate.price = data.amount
+        await self._announce(plate, top, placed)
+        return bid
+
+    async def create_bids(self, items: Sequence[BidCreate], current_user) -> List[dict]:
+        """
+        Place several bids at once. The plates are loaded with one query,
+        each bid is checked against its plate as left by the bids before it
+        and rejected ones are reported without failing the rest. Placed bids
+        are committed in one transaction per database, then every plate is
+        announced once with its final winning bid.
+        """
+        plate_ids = list({item.plate_id for item in items})
+        result = await self.__session.execute(
+            locked_plates_by_ids if lock_plates.get() else plates_by_ids,
+            {"plate_ids": plate_ids},
+        )
+        plates = {plate.id: plate for plate in result.scalars()}
+
+        results = []
+        tops: Dict[int, Optional[Bid]] = {}
+        bidders: Dict[int, set] = {}
+        async with AsyncExitStack() as stack:
+            shard_sessions: Dict[int, AsyncSession] = {}
+            for item in items:
+                plate = plates.get(item.plate_id)
+                if not plate or not plate.is_active:
+                    errors = [
+                        {
+                            "type": "inactive_plate",
+                            "msg": "Cannot place bid for inactive plate",
+                            "ctx": {},
+                        }
+                    ]
+                else:
+                    errors = rules_for(plate).check(
+                        plate.price, plate.bidder_count > 0, item.amount
+                    )
+                if errors:
+                    results.append(
+                        {
+                            "plate_id": item.plate_id,
+                            "status": "rejected",
+                            "errors": errors,
+                        }
+                    )
+                    continue
+
+                bids = self.__session
+                if bid_shards.enabled:
+                    shard = bid_shards.for_plate(plate.id)
+                    if shard not in shard_sessions:
+                        shard_sessions[shard] = await stack.enter_async_context(
+                            bid_shards.session(shard)
+                        )
+                    bids = shard_sessions[shard]
+                placed, top = await self._settle(
+                    bids, plate, current_user.id, item.amount
+                )
+                if top is not None or plate.id not in tops:
+                    tops[plate.id] = top
+                bidders.setdefault(plate.id, set()).update(placed)
+                # Flushed to report the bid as this item left it, a later
+                # item may raise it again
+                await bids.flush()
+                results.append(
+                    {
+                        "plate_id": plate.id,
+                        "status": "placed",
+                        "bid": BidSchema.model_validate(placed[current_user.id]),
+                    }
+                )
+
+            for bids in shard_sessions.values():
+                await bids.commit()
+            await self.__session.commit()
+
+        logger.info(
+            "Bid batch placed",
+            extra={
+                "user_id": current_user.id,
+                "placed": sum(r["status"] == "placed" for r in results),
+                "rejected": sum(r["status"] == "rejected" for r in results),
+            },
+        )
+        for plate_id, top in tops.items():
+            await self._announce(plates[plate_id], top, bidders[plate_id])
+        return results
+
+    async def _settle(
+        self,
+        bids: AsyncSession,
+        plate: AutoPlate,
+        user_id: int,
+        amount: Optional[Decimal] = None,
+    ) -> Tuple[Dict[int, Bid], Optional[Bid]]:
+        """
+        Apply a bid of `amount` by the user (or just their new proxy when
+        amount is None) together with every proxy bid it sets off. The war
+        is resolved in memory and only each bidder's final bid is written.
+        Returns the written bids (plus the user's own) by user, and the
+        winning bid if the top of the book changed.
+        """
+        rules = rules_for(plate)
+        price = to_minor(plate.price)
+        minimum = from_minor(rules.minimum(price, plate.bidder_count > 0))
+        # Proxies that cannot reach the next acceptable bid are out already
+        proxies = (
+            await bids.execute(
+                proxies_in_play, {"plate_id": plate.id, "minimum": minimum}
+            )
+        ).scalars().all()
+        bidder_ids = {user_id} | {proxy.user_id for proxy in proxies}
+        # The current leader holds the bid at the plate price
+        current = (
+            await bids.execute(
+                bids_in_play,
+                {
+                    "plate_id": plate.id,
+                    "user_ids": list(bidder_ids),
+                    "price": plate.price,
+                },
+            )
+        ).scalars().all()
+        existing = {bid.user_id: bid for bid in current}
+        leader = next((bid for bid in current if self._leads(plate, bid)), None)
+
+        bidders: Dict[int, Bidder] = {}
+        if leader is not None:
+            bidders[leader.user_id] = Bidder(leader.user_id, price, price, -1)
+        for proxy in proxies:
+            bid = existing.get(proxy.user_id)
+            floor = to_minor(bid.amount) if bid is not None else 0
+            seniority = -1 if proxy.user_id in bidders else proxy.id
+            bidders[proxy.user_id] = Bidder(
+                proxy.user_id, max(to_minor(proxy.max_amount), floor), floor, seniority
+            )
+        if amount is not None:
+            own = bidders.get(user_id)
+            bidders[user_id] = Bidder(
+                user_id,
+                max(to_minor(amount), own.limit if own else 0),
+                to_minor(amount),
+                own.seniority if own else float("inf"),
+            )
+
+        winner, final = resolve(bidders.values(), rules, price)
+        placed = {}
+        for bidder_id, minor in final.items():
+            bid = existing.get(bidder_id)
+            if bid is not None and to_minor(bid.amount) == minor:
+                continue
+            if bid is None:
+                bid = Bid(user_id=bidder_id, plate_id=plate.id)
+                plate.bidder_count = (plate.bidder_count or 0) + 1
+                bids.add(bid)
+            bid.amount = from_minor(minor)
+            plate.bid_count = (plate.bid_count or 0) + 1
+            placed[bidder_id] = bid
+        for proxy in proxies:
+            if proxy.user_id != winner:
+                # Outbid at its maximum
+                proxy.is_active = False
+
+        if winner is not None and final[winner] > price:
+            plate.price = from_minor(final[winner])
             plate.updated_at = datetime.now()
+        top = placed.get(winner)
+        if winner is not None:
+            leading = top if top is not None else existing[winner]
+            if leading.id is None:
+                await bids.flush()
+            plate.leading_bid_id = leading.id
+        if user_id not in placed and user_id in existing:
+            placed[user_id] = existing[user_id]
+        return placed, top
 
-        await self.__session.commit()
-        await self.__session.refresh(bid)
+    async def _announce(
+        self, plate: AutoPlate, top: Optional[Bid], bidder_ids: Iterable[int] = ()
+    ) -> None:
+        """
+        Publish the outcome of a settled bid: one broadcast with the
+        winning bid, however many proxies took part
+        """
+        plate_reads.forget(plate.id)
+        highest_bid_reads.forget(plate.id)
+        active_bid_views.forget_plate(plate.id)
+        for bidder_id in bidder_ids:
+            active_bid_views.forget_user(bidder_id)
+        if top is None:
+            return
+        bid_rates.record(plate.id)
+        await hot_auctions.record_bid(plate.id, plate.price)
         from app.websocket import manager
 
         # Broadcast new bid to all connected clients
         await manager.broadcast_to_plate(
-            bid.plate_id,
+            plate.id,
             {
                 "type": "new_bid",
                 "data": {
-                    "id": bid.id,
-                    "amount": bid.amount,
-                    "user_id": bid.user_id,
-                    "plate_id": bid.plate_id,
-                    "timestamp": bid.created_at.isoformat(),
+                    "id": top.id,
+                    "amount": float(top.amount),
+                    "user_id": top.user_id,
+                    "plate_id": top.plate_id,
+                    "timestamp": top.created_at.isoformat(),
                 },
             },
         )
 
-        return bid
+    async def _load_plate(self, plate_id: int) -> Optional[AutoPlate]:
+        """
+        The plate as stored now. Outside the plate's actor its row stays
+        locked until the bid is committed
+        """
+        return await self.__session.get(
+            AutoPlate,
+            plate_id,
+            populate_existing=True,
+            with_for_update=lock_plates.get() or None,
+        )
+
+    @staticmethod
+    def _leads(plate: AutoPlate, bid) -> bool:
+        """
+        Whether the bid is the plate's winning one. Ties at the price are
+        decided by the recorded leader, plates settled before it was
+        recorded fall back to the bid at the price
+        """
+        if plate.leading_bid_id is not None:
+            return bid.id == plate.leading_bid_id
+        return bool(plate.bidder_count) and bid.amount >= plate.price
+
+    @staticmethod
+    def _check_rules(plate: AutoPlate, amount) -> None:
+        """
+        Validate against the plate already loaded, no further queries
+        """
+        violations = rules_for(plate).check(plate.price, plate.bidder_count > 0, amount)
+        if violations:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST, detail=violations
+            )
+
+    async def set_proxy_bid(self, data: ProxyBidCreate, current_user) -> ProxyBid:
+        """
+        Register or raise the user's proxy bid on a plate, bidding for them
+        right away if they are not leading
+        """
+        plate = await self._load_plate(data.plate_id)
+        if not plate or not plate.is_active:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Cannot place bid for inactive plate",
+            )
+        self._check_rules(plate, data.max_amount)
+
+        async with bid_session_for_plate(data.plate_id, self.__session) as bids:
+            result = await bids.execute(
+                user_proxy, {"user_id": current_user.id, "plate_id": data.plate_id}
+            )
+            proxy = result.scalar_one_or_none()
+            if proxy is None:
+                proxy = ProxyBid(user_id=current_user.id, plate_id=data.plate_id)
+                bids.add(proxy)
+            proxy.max_amount = data.max_amount
+            proxy.is_active = True
+            await bids.flush()
+
+            placed, top = await self._settle(bids, plate, current_user.id)
+            await bids.commit()
+            if bids is not self.__session:
+                await self.__session.commit()
+        logger.info(
+            "Proxy bid set",
+            extra={
+                "plate_id": plate.id,
+                "user_id": current_user.id,
+                "max_amount": data.max_amount,
+                "price": plate.price,
+            },
+        )
+        await self._announce(plate, top, placed)
+        return proxy
+
+    async def get_proxy_bids_by_user(self, user_id: int) -> Sequence[ProxyBid]:
+        """
+        Get all proxy bids of a user, gathered from every shard concurrently
+        """
+        async def fetch(session: AsyncSession) -> Sequence[ProxyBid]:
+            result = await session.execute(proxy_bids_by_user, {"user_id": user_id})
+            return result.scalars().all()
+
+        results = await scatter_bids(self.__session, fetch)
+        return [proxy for shard_proxies in results for proxy in shard_proxies]
+
+    async def withdraw_proxy_bid(self, plate_id: int, current_user) -> bool:
+        """
+        Stop bidding on the user's behalf, bids already placed stay
+        """
+        async with bid_session_for_plate(plate_id, self.__session) as bids:
+            result = await bids.execute(
+                active_user_proxy, {"user_id": current_user.id, "plate_id": plate_id}
+            )
+            proxy = result.scalar_one_or_none()
+            if proxy is None:
+                return False
+            proxy.is_active = False
+            await bids.commit()
+        return True
 
     async def get_bid(self, bid_id: int) -> Optional[Bid]:
         """
         Get a bid by ID
         """
-        return await self.__session.get(Bid, bid_id)
+        async with bid_session_for_bid(bid_id, self.__session) as bids:
+            return await bids.get(Bid, bid_id)
 
     async def get_bids_by_user(self, user_id: int) -> Sequence[Bid]:
-        user = await self.__session.get(User, user_id)
-        bids = select(Bid).where(Bid.user_id == user_id)
-        result = await self.__session.execute(bids)
-        return result.scalars().all()
+        """
+        Get all bids of a user, gathered from every shard concurrently
+        """
+        async def fetch(session: AsyncSession) -> Sequence[Bid]:
+            result = await session.execute(bids_by_user, {"user_id": user_id})
+            return result.scalars().all()
+
+        results = await scatter_bids(self.__session, fetch)
+        return [bid for shard_bids in results for bid in shard_bids]
+
+    async def get_active_bids(self, user_id: int) -> List[dict]:
+        """
+        The user's bids on plates still open for bidding, each marked
+        leading or outbid, from the user's cached view when there is one
+        """
+        view = active_bid_views.get(user_id)
+        if view is not None:
+            return view
+        epoch = active_bid_views.begin()
+        if bid_shards.enabled:
+            view = await self._sharded_active_bids(user_id)
+        else:
+            result = await self.__session.execute(
+                active_bids, {"user_id": user_id, "now": datetime.now()}
+            )
+            view = [dict(row) for row in result.mappings()]
+        active_bid_views.put(user_id, epoch, view, (row["deadline"] for row in view))
+        return view
+
+    async def _sharded_active_bids(self, user_id: int) -> List[dict]:
+        """
+        Bids and plates live apart: the user's bids from every shard, then
+        their open plates from the primary in one IN query
+        """
+        async def fetch(session: AsyncSession):
+            return (await session.execute(active_bid_rows, {"user_id": user_id})).all()
+
+        results = await scatter_bids(self.__session, fetch)
+        bids = [bid for shard_bids in results for bid in shard_bids]
+        if not bids:
+            return []
+        result = await self.__session.execute(
+            open_plate_rows,
+            {
+                "plate_ids": list({bid.plate_id for bid in bids}),
+                "now": datetime.now(),
+            },
+        )
+        plates = {plate.id: plate for plate in result}
+        view = []
+        for bid in bids:
+            plate = plates.get(bid.plate_id)
+            if plate is None:
+                continue
+            view.append(
+                {
+                    "id": bid.id,
+                    "plate_id": bid.plate_id,
+                    "plate_number": plate.plate_number,
+                    "amount": bid.amount,
+                    "price": plate.price,
+                    "deadline": plate.deadline,
+                    "status": "leading" if self._leads(plate, bid) else "outbid",
+                    "created_at": bid.created_at,
+                }
+            )
+        view.sort(key=lambda row: (row["deadline"], row["plate_id"]))
+        return view
 
     async def get_bids_by_plate(self, plate_id: int) -> Sequence[Bid]:
         """
         Get all bids for a specific plate
         """
-        plate = await self.__session.get(AutoPlate, plate_id)
-        return plate.bids
+        async with bid_session_for_plate(plate_id, self.__session) as bids:
+            result = await bids.execute(bids_by_plate, {"plate_id": plate_id})
+            return result.scalars().all()
 
     async def update_bid(
             self, bid_id: int, data: BidUpdate, current_user
     ) -> Optional[Bid]:
         """
-        Update a bid
+        Raise a bid. The new amount is placed like a new bid by the bid's
+        owner: proxies answer it, counts and price follow and it is
+        broadcast.
         """
         if not current_user and not current_user.is_staff:
             raise HTTPException(
@@ -115,39 +504,83 @@ class BidController:
                 status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid data"
             )
 
-        bid = await self.get_bid(bid_id)
-        if not bid:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND, detail="Bid not found"
-            )
-        # Update plate price if new bid is higher
-        plate = await self.__session.get(AutoPlate, bid.plate_id)
-        if plate.price < data.amount:
-            plate.price = data.amount
-            plate.updated_at = datetime.now()
-        else:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Bid amount must be higher than current price",
-            )
+        async with bid_session_for_bid(bid_id, self.__session) as bids:
+            # Reloaded: the caller may have read them before its turn in
+            # the plate's actor
+            bid = await bids.get(Bid, bid_id, populate_existing=True)
+            if not bid:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND, detail="Bid not found"
+                )
+            if data.amount is None:
+                return bid
+            plate = await self._load_plate(bid.plate_id)
+            if lock_plates.get():
+                # Read again under the plate's lock
+                bid = await bids.get(Bid, bid_id, populate_existing=True)
+                if not bid:
+                    raise HTTPException(
+                        status_code=status.HTTP_404_NOT_FOUND, detail="Bid not found"
+                    )
+            if not plate or not plate.is_active:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Cannot place bid for inactive plate",
+                )
+            self._check_rules(plate, data.amount)
 
-        for field, value in data.model_dump(exclude_unset=True).items():
-            setattr(bid, field, value)
-        bid.updated_at = datetime.now()
-        await self.__session.commit()
-        await self.__session.refresh(bid)
+            # Same session, so _settle updates this very bid
+            placed, top = await self._settle(bids, plate, bid.user_id, data.amount)
+            bid.updated_at = datetime.now()
+            await bids.commit()
+            if bids is not self.__session:
+                await self.__session.commit()
+            await bids.refresh(bid)
+        await self._announce(plate, top, placed)
         return bid
 
     async def delete_bid(self, bid_id: int) -> bool:
         """
         Delete a bid
         """
-        bid = await self.get_bid(bid_id)
-        if not bid:
-            return False
+        async with bid_session_for_bid(bid_id, self.__session) as bids:
+            bid = await bids.get(Bid, bid_id, populate_existing=True)
+            if not bid:
+                return False
 
-        await self.__session.delete(bid)
-        await self.__session.commit()
+            plate = await self._load_plate(bid.plate_id)
+            if lock_plates.get():
+                # Read again under the plate's lock
+                bid = await bids.get(Bid, bid_id, populate_existing=True)
+                if not bid:
+                    return False
+            await bids.delete(bid)
+            repriced = False
+            if plate is not None:
+                leading = self._leads(plate, bid)
+                # bid_count keeps counting the withdrawn bid, it was placed
+                if plate.bidder_count:
+                    plate.bidder_count -= 1
+                if leading:
+                    # The leader withdrew: the price falls back to the best
+                    # remaining bid, or the start price without any
+                    result = await bids.execute(highest_bid, {"plate_id": plate.id})
+                    top = result.scalar_one_or_none()
+                    plate.leading_bid_id = top.id if top is not None else None
+                    price = top.amount if top is not None else plate.start_price
+                    if price is not None and price != plate.price:
+                        plate.price = price
+                        plate.updated_at = datetime.now()
+                        repriced = True
+
+            await bids.commit()
+            if bids is not self.__session:
+                await self.__session.commit()
+        plate_reads.forget(bid.plate_id)
+        highest_bid_reads.forget(bid.plate_id)
+        active_bid_views.forget_plate(bid.plate_id)
+        if repriced and plate.is_active:
+            await hot_auctions.set_price(plate.id, plate.price)
         return True
 
     async def get_highest_bid_for_plate(self, plate_id: int) -> Optional[Bid]:
@@ -160,6 +593,32 @@ class BidController:
                 status_code=status.HTTP_404_NOT_FOUND, detail="Plate not found"
             )
 
-        query = select(Bid).where(Bid.plate_id == plate_id).order_by(Bid.amount.desc())
-        result = await self.__session.execute(query)
-        return result.scalar_one_or_none()
+        async with bid_session_for_plate(plate_id, self.__session) as bids:
+            result = await bids.execute(highest_bid, {"plate_id": plate_id})
+            return result.scalar_one_or_none()
+
+    async def get_highest_bids_for_plates(
+        self, plate_ids: Sequence[int]
+    ) -> Dict[int, Bid]:
+        """
+        Get the highest bid of each plate with a single query per shard
+        """
+        if not plate_ids:
+            return {}
+        if bid_shards.enabled:
+            groups = bid_shards.group_by_shard(plate_ids)
+            results = await bid_shards.gather(
+                groups,
+                lambda shard, session: self._highest_bids(session, groups[shard]),
+            )
+            return {
+                plate_id: bid for result in results for plate_id, bid in result.items()
+            }
+        return await self._highest_bids(self.__session, plate_ids)
+
+    @staticmethod
+    async def _highest_bids(
+        session: AsyncSession, plate_ids: Sequence[int]
+    ) -> Dict[int, Bid]:
+        result = await session.execute(highest_bids, {"plate_ids": list(plate_ids)})
+        return {bid.plate_id: bid for bid in result.scalars()}
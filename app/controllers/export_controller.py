@@ -0,0 +1,205 @@
+import csv
+import io
+import json
+from datetime import datetime
+from decimal import Decimal
+from typing import AsyncIterator, List, Optional, Sequence
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.database import read_session_factory
+from app.models.bid import Bid
+from app.models.plate import AutoPlate
+from app.models.user import User
+from app.sharding import bid_shards
+
+EXPORT_FORMATS = ("csv", "ndjson", "columnar")
+EXPORT_MEDIA_TYPES = {
+    "csv": "text/csv",
+    "ndjson": "application/x-ndjson",
+    "columnar": "application/x-ndjson",
+}
+EXPORT_COLUMNS = (
+    "id",
+    "plate_id",
+    "plate_number",
+    "user_id",
+    "username",
+    "amount",
+    "is_active",
+    "created_at",
+)
+
+
+def _jsonable(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        # As a string: a float rounds large amounts off by cents
+        return str(value)
+    return value
+
+
+class BidExportController:
+    """
+    Streams bids in fixed-size batches from a server-side cursor, so memory
+    use does not depend on how many rows are exported. Uses its own replica
+    session because the response body outlives the request's dependencies.
+    """
+
+    def __init__(
+        self,
+        plate_id: Optional[int] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        batch_size: int = settings.EXPORT_BATCH_SIZE,
+    ):
+        self.plate_id = plate_id
+        self.since = since
+        self.until = until
+        self.batch_size = batch_size
+
+    def _query(self, joined: bool = True):
+        # Plain columns: no ORM identity map growing with the export
+        if joined:
+            query = (
+                select(
+                    Bid.id,
+                    Bid.plate_id,
+                    AutoPlate.plate_number,
+                    Bid.user_id,
+                    User.username,
+                    Bid.amount,
+                    Bid.is_active,
+                    Bid.created_at,
+                )
+                .join(AutoPlate, AutoPlate.id == Bid.plate_id)
+                .join(User, User.id == Bid.user_id)
+            )
+        else:
+            query = select(
+                Bid.id,
+                Bid.plate_id,
+                Bid.user_id,
+                Bid.amount,
+                Bid.is_active,
+                Bid.created_at,
+            )
+        query = query.order_by(Bid.id)
+        if self.plate_id is not None:
+            query = query.where(Bid.plate_id == self.plate_id)
+        if self.since is not None:
+            query = query.where(Bid.created_at >= self.since)
+        if self.until is not None:
+            query = query.where(Bid.created_at < self.until)
+        return query.execution_options(yield_per=self.batch_size)
+
+    async def batches(self) -> AsyncIterator[List[Sequence]]:
+        if bid_shards.enabled:
+            async for partition in self._sharded_batches():
+                yield partition
+            return
+        async with read_session_factory() as session:
+            result = await session.stream(self._query())
+            async for partition in result.partitions():
+                yield partition
+
+    async def _sharded_batches(self) -> AsyncIterator[List[Sequence]]:
+        """
+        Shard by shard, with plate numbers and usernames looked up on the
+        primary per batch since the join cannot cross databases
+        """
+        shards = (
+            [bid_shards.for_plate(self.plate_id)]
+            if self.plate_id is not None
+            else range(bid_shards.count)
+        )
+        async with read_session_factory() as lookup:
+            for shard in shards:
+                async with bid_shards.session(shard) as session:
+                    result = await session.stream(self._query(joined=False))
+                    async for partition in result.partitions():
+                        yield await self._with_names(lookup, partition)
+
+    @staticmethod
+    async def _with_names(
+        session: AsyncSession, partition: List[Sequence]
+    ) -> List[Sequence]:
+        plate_numbers = dict(
+            (
+                await session.execute(
+                    select(AutoPlate.id, AutoPlate.plate_number).where(
+                        AutoPlate.id.in_({row.plate_id for row in partition})
+                    )
+                )
+            ).all()
+        )
+        usernames = dict(
+            (
+                await session.execute(
+                    select(User.id, User.username).where(
+                        User.id.in_({row.user_id for row in partition})
+                    )
+                )
+            ).all()
+        )
+        return [
+            (
+                row.id,
+                row.plate_id,
+                plate_numbers.get(row.plate_id),
+                row.user_id,
+                usernames.get(row.user_id),
+                row.amount,
+                row.is_active,
+                row.created_at,
+            )
+            for row in partition
+        ]
+
+    async def export(self, fmt: str) -> AsyncIterator[bytes]:
+        """
+        Encoded export, one chunk per batch
+        """
+        encode = getattr(self, f"_encode_{fmt}")
+        if fmt == "csv":
+            yield (",".join(EXPORT_COLUMNS) + "\r\n").encode()
+        async for batch in self.batches():
+            yield encode(batch)
+
+    @staticmethod
+    def _encode_csv(batch: List[Sequence]) -> bytes:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerows(
+            [_jsonable(value) for value in row] for row in batch
+        )
+        return buffer.getvalue().encode()
+
+    @staticmethod
+    def _encode_ndjson(batch: List[Sequence]) -> bytes:
+        return "".join(
+            json.dumps(
+                {name: _jsonable(value) for name, value in zip(EXPORT_COLUMNS, row)}
+            )
+            + "\n"
+            for row in batch
+        ).encode()
+
+    @staticmethod
+    def _encode_columnar(batch: List[Sequence]) -> bytes:
+        """
+        One line per batch holding a list of values per column, the layout
+        of a Parquet/Arrow record batch without needing either library
+        """
+        columns = list(zip(*batch))
+        chunk = {
+            "rows": len(batch),
+            "columns": {
+                name: [_jsonable(value) for value in values]
+                for name, values in zip(EXPORT_COLUMNS, columns)
+            },
+        }
+        return (json.dumps(chunk) + "\n").encode()
@@ -0,0 +1,250 @@
+import csv
+import json
+import time
+from collections import deque
+from typing import AsyncIterable, AsyncIterator, Dict, List, Tuple
+
+from pydantic import ValidationError
+from sqlalchemy import insert, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.plate import AutoPlate
+from app.schemas.plate import PlateCreate
+
+IMPORT_FORMATS = ("csv", "ndjson")
+
+
+async def iter_lines(
+    chunks: AsyncIterable[bytes], keepends: bool = False
+) -> AsyncIterator[str]:
+    """
+    Split a byte stream into text lines, holding at most one partial line
+    """
+    pending = b""
+    async for chunk in chunks:
+        pending += chunk
+        *lines, pending = pending.split(b"\n")
+        for line in lines:
+            if keepends:
+                yield (line + b"\n").decode("utf-8-sig")
+            else:
+                yield line.rstrip(b"\r").decode("utf-8-sig")
+    if pending.strip():
+        yield pending.rstrip(b"\r").decode("utf-8-sig")
+
+
+async def iter_records(chunks: AsyncIterable[bytes]) -> AsyncIterator[Tuple[int, str]]:
+    """
+    Split a CSV byte stream into (first line number, text) of whole records,
+    line endings included, so quoted fields may span lines. Holds at most
+    one record, or the field size limit of an unterminated quote.
+    """
+    record, number, quotes = "", 0, 0
+    async for line in iter_lines(chunks, keepends=True):
+        number += 1
+        if not record:
+            first = number
+        record += line
+        # Quotes come in pairs, doubled ones included, outside quoted fields
+        quotes += line.count('"')
+        if quotes % 2 == 0 or len(record) > csv.field_size_limit():
+            yield first, record
+            record, quotes = "", 0
+    if record:
+        yield first, record
+
+
+class _Records:
+    """
+    Lines for csv.DictReader, handed over one whole record at a time
+    """
+
+    def __init__(self):
+        self.pending: deque = deque()
+
+    def __iter__(self):
+        return self
+
+    def __next__(self) -> str:
+        if not self.pending:
+            raise StopIteration
+        return self.pending.popleft()
+
+
+async def parse_rows(
+    chunks: AsyncIterable[bytes], fmt: str
+) -> AsyncIterator[Tuple[int, object]]:
+    """
+    Yield (line number, raw row) from a CSV (with header) or NDJSON stream.
+    Rows that cannot be parsed are yielded as the exception.
+    """
+    if fmt != "ndjson":
+        async for row in parse_csv(chunks):
+            yield row
+        return
+    number = 0
+    async for line in iter_lines(chunks):
+        number += 1
+        if not line.strip():
+            continue
+        try:
+            yield number, json.loads(line)
+        except ValueError as exc:
+            yield number, exc
+
+
+async def parse_csv(chunks: AsyncIterable[bytes]) -> AsyncIterator[Tuple[int, object]]:
+    """
+    parse_rows() for CSV, each record parsed by one csv.DictReader as it
+    arrives
+    """
+    records = _Records()
+    reader = csv.DictReader(records)
+    header = False
+    async for number, record in iter_records(chunks):
+        if not record.strip():
+            continue
+        records.pending.append(record)
+        try:
+            if not header:
+                reader.fieldnames = [name.strip() for name in reader.fieldnames]
+                header = True
+                continue
+            row = next(reader)
+        except csv.Error as exc:
+            records.pending.clear()
+            yield number, exc
+            continue
+        # Short rows get None for the missing columns, long ones their extra
+        # values under the None key
+        given = sum(value is not None for value in row.values()) - (None in row)
+        given += len(row.get(None, ()))
+        if given != len(reader.fieldnames):
+            yield number, ValueError(
+                f"expected {len(reader.fieldnames)} columns, got {given}"
+            )
+            continue
+        # Empty cells mean "not given" so schema defaults apply
+        yield number, {name: value for name, value in row.items() if value != ""}
+
+
+class PlateImportController:
+    """
+    Bulk plate creation from streamed rows: validated with PlateCreate and
+    inserted with one executemany per batch, invalid rows are reported and
+    skipped without failing the rest of the batch
+    """
+
+    def __init__(self, session: AsyncSession):
+        self.__session: AsyncSession = session
+
+    async def import_plates(
+        self,
+        rows: AsyncIterable[Tuple[int, object]],
+        user,
+        batch_size: int = settings.IMPORT_BATCH_SIZE,
+        on_batch=None,
+    ) -> dict:
+        """
+        Import plates, `on_batch(imported, failed, seconds)` is called after
+        each committed batch
+        """
+        started = time.perf_counter()
+        result = {"imported": 0, "failed": 0, "errors": []}
+        batch: List[Tuple[int, PlateCreate]] = []
+        # Read once: a rolled back batch expires the session's objects
+        user_id = user.id
+
+        async for number, raw in rows:
+            plate = self._validate(number, raw, result)
+            if plate is not None:
+                batch.append((number, plate))
+            if len(batch) >= batch_size:
+                await self._insert_batch(batch, user_id, result)
+                batch = []
+                if on_batch:
+                    on_batch(result["imported"], result["failed"], time.perf_counter() - started)
+        if batch:
+            await self._insert_batch(batch, user_id, result)
+            if on_batch:
+                on_batch(result["imported"], result["failed"], time.perf_counter() - started)
+
+        seconds = time.perf_counter() - started
+        result["seconds"] = round(seconds, 3)
+        result["rows_per_second"] = round(result["imported"] / seconds, 1) if seconds else 0.0
+        return result
+
+    def _validate(self, number: int, raw, result: dict):
+        if isinstance(raw, Exception):
+            self._reject(result, number, f"unparsable row: {raw}")
+            return None
+        try:
+            return PlateCreate.model_validate(raw)
+        except ValidationError as exc:
+            reason = "; ".join(
+                f"{'.'.join(map(str, error['loc']))}: {error['msg']}"
+                for error in exc.errors()
+            )
+            self._reject(result, number, reason)
+            return None
+
+    async def _insert_batch(
+        self, batch: List[Tuple[int, PlateCreate]], user_id: int, result: dict
+    ) -> None:
+        numbers = [plate.plate_number for _, plate in batch]
+        existing = set(
+            (
+                await self.__session.execute(
+                    select(AutoPlate.plate_number).where(
+                        AutoPlate.plate_number.in_(numbers)
+                    )
+                )
+            ).scalars()
+        )
+        values: Dict[str, Tuple[int, dict]] = {}
+        for number, plate in batch:
+            if plate.plate_number in existing or plate.plate_number in values:
+                self._reject(
+                    result, number, f"plate_number {plate.plate_number} already exists"
+                )
+                continue
+            values[plate.plate_number] = (
+                number,
+                {
+                    **plate.model_dump(),
+                    "start_price": plate.price,
+                    "created_by_id": user_id,
+                },
+            )
+        if not values:
+            return
+        try:
+            await self.__session.execute(
+                insert(AutoPlate), [row for _, row in values.values()]
+            )
+            await self.__session.commit()
+            result["imported"] += len(values)
+        except IntegrityError:
+            # E.g. a plate created meanwhile: find the offending rows one by
+            # one so the rest of the batch still goes in
+            await self.__session.rollback()
+            await self._insert_rows(list(values.values()), result)
+
+    async def _insert_rows(self, rows: List[Tuple[int, dict]], result: dict) -> None:
+        for number, row in rows:
+            try:
+                await self.__session.execute(insert(AutoPlate), row)
+                await self.__session.commit()
+                result["imported"] += 1
+            except IntegrityError as exc:
+                await self.__session.rollback()
+                self._reject(result, number, f"rejected by the database: {exc.orig}")
+
+    @staticmethod
+    def _reject(result: dict, number: int, reason: str) -> None:
+        result["failed"] += 1
+        # Keep the response bounded however many rows are bad
+        if len(result["errors"]) < settings.IMPORT_MAX_ERRORS:
+            result["errors"].append({"line": number, "error": reason})
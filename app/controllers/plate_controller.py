@@ -2,12 +2,41 @@ from typing import Optional, Sequence
 from fastapi import Depends, HTTPException, status
 
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import delete
 from datetime import datetime
 
-from app.database import get_session
+from app.core.active_bids import active_bid_views
+from app.core.leaderboard import hot_auctions
+from app.core.singleflight import highest_bid_reads, plate_reads
+from app.core.stats import bid_rates
+from app.database import read_session_factory
+from app.dependencies import get_session
+from app.models.bid import Bid
 from app.models.plate import AutoPlate
-from app.schemas.plate import PlateCreate, PlateUpdate
+from app.models.proxy_bid import ProxyBid
+from app.queries import active_plates_by_ids, highest_bid, plates_page
+from app.schemas.bid import Bid as BidSchema
+from app.schemas.plate import Plate as PlateSchema, PlateCreate, PlateUpdate
+from app.sharding import bid_session_for_plate
+
+
+# Coalesced reads outlive the caller that started them, whose request
+# session is closed when it disconnects, so they use sessions of their own
+# and hand every caller the same plain snapshot
+
+
+async def _read_plate(plate_id: int) -> Optional[PlateSchema]:
+    async with read_session_factory() as session:
+        plate = await session.get(AutoPlate, plate_id)
+        return PlateSchema.model_validate(plate) if plate else None
+
+
+async def _read_highest_bid(plate_id: int) -> Optional[BidSchema]:
+    async with read_session_factory() as session:
+        async with bid_session_for_plate(plate_id, session) as bids:
+            result = await bids.execute(highest_bid, {"plate_id": plate_id})
+            bid = result.scalar_one_or_none()
+            return BidSchema.model_validate(bid) if bid else None
 
 
 class PlateController:
@@ -20,6 +49,7 @@ class PlateController:
         """
         # with model_dump
         plate = AutoPlate(**data.model_dump())
+        plate.start_price = plate.price
         plate.created_by_id = user.id
         self.__session.add(plate)
         await self.__session.commit()
@@ -34,6 +64,16 @@ class PlateController:
             return None
         return await self.__session.get(AutoPlate, plate_id)
 
+    async def get_plate_coalesced(self, plate_id: int) -> Optional[PlateSchema]:
+        """
+        Get a snapshot of a plate, concurrent callers share one query
+        """
+        if self.__session.info.get("pinned"):
+            plate = await self.get_plate_by_id(plate_id)
+            return PlateSchema.model_validate(plate) if plate else None
+        await self._release_connection()
+        return await plate_reads.do(plate_id, _read_plate, plate_id)
+
     async def get_plate_by_number(self, plate_number: str) -> Optional[AutoPlate]:
         """
         Get a plate by plate number
@@ -46,12 +86,24 @@ class PlateController:
         """
         return await self.__session.get(AutoPlate, plate_id)
 
+    async def get_plates_by_ids(self, plate_ids: Sequence[int]) -> Sequence[AutoPlate]:
+        """
+        Get active plates by ID in the given order
+        """
+        if not plate_ids:
+            return []
+        result = await self.__session.execute(
+            active_plates_by_ids, {"plate_ids": list(plate_ids)}
+        )
+        plates = {plate.id: plate for plate in result.scalars()}
+        return [plates[plate_id] for plate_id in plate_ids if plate_id in plates]
+
     async def get_plates(self, skip: int = 0, limit: int = 100) -> Sequence[AutoPlate]:
         """
         Get all plates
         """
         plates = await self.__session.execute(
-            select(AutoPlate).offset(skip).limit(limit)
+            plates_page, {"skip": skip, "limit": limit}
         )
         return plates.scalars().all()
 
@@ -67,9 +119,17 @@ class PlateController:
 
         for field, value in data.model_dump(exclude_unset=True).items():
             setattr(plate, field, value)
+        if data.price is not None and not plate.bidder_count:
+            plate.start_price = plate.price
         plate.updated_at = datetime.now()
         await self.__session.commit()
         await self.__session.refresh(plate)
+        plate_reads.forget(plate.id)
+        active_bid_views.forget_plate(plate.id)
+        if not plate.is_active:
+            await hot_auctions.remove(plate.id)
+        else:
+            await hot_auctions.set_price(plate.id, plate.price)
         return plate
 
     async def delete_plate(self, plate_id: int) -> bool:
@@ -80,22 +140,60 @@ class PlateController:
         if not plate:
             return False
 
+        async with bid_session_for_plate(plate_id, self.__session) as bids:
+            await bids.execute(delete(ProxyBid).where(ProxyBid.plate_id == plate_id))
+            if bids is not self.__session:
+                # The cascade only reaches bids on the primary
+                await bids.execute(delete(Bid).where(Bid.plate_id == plate_id))
+                await bids.commit()
         await self.__session.delete(plate)
         await self.__session.commit()
+        plate_reads.forget(plate_id)
+        highest_bid_reads.forget(plate_id)
+        active_bid_views.forget_plate(plate_id)
+        bid_rates.discard(plate_id)
+        await hot_auctions.remove(plate_id)
         return True
 
+    async def get_plate_stats(self, plate_id: int) -> Optional[dict]:
+        """
+        Get bid statistics for a plate without scanning its bids
+        """
+        plate = await self.__session.get(AutoPlate, plate_id)
+        if not plate:
+            return None
+        return {
+            "plate_id": plate.id,
+            "price": plate.price,
+            "bid_count": plate.bid_count,
+            "bidder_count": plate.bidder_count,
+            "bids_last_minute": bid_rates.rate(plate.id),
+        }
+
     async def get_highest_bid_for_plate(self, plate_id: int):
         """
         Get the highest bid for a plate
         """
-        from sqlalchemy import select, desc
-        from app.models.bid import Bid
+        async with bid_session_for_plate(plate_id, self.__session) as bids:
+            result = await bids.execute(highest_bid, {"plate_id": plate_id})
+            return result.scalar_one_or_none()
 
-        # Fetch the highest bid directly with a proper query
-        result = await self.__session.execute(
-            select(Bid)
-            .where(Bid.plate_id == plate_id)
-            .order_by(desc(Bid.amount))
-            .limit(1)
-        )
-        return result.scalar_one_or_none()
+    async def get_highest_bid_coalesced(self, plate_id: int) -> Optional[BidSchema]:
+        """
+        Get a snapshot of the highest bid for a plate, concurrent callers
+        share one query
+        """
+        if self.__session.info.get("pinned"):
+            bid = await self.get_highest_bid_for_plate(plate_id)
+            return BidSchema.model_validate(bid) if bid else None
+        await self._release_connection()
+        return await highest_bid_reads.do(plate_id, _read_highest_bid, plate_id)
+
+    async def _release_connection(self) -> None:
+        """
+        Hand the request's pooled connection back before waiting on a
+        flight, which takes one of its own. Without a replica both come
+        from the same pool, and enough waiters holding theirs would starve
+        it. Read-only, so ending the transaction writes nothing.
+        """
+        await self.__session.commit()
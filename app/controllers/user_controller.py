@@ -2,13 +2,17 @@ from typing import Optional, Sequence
 from fastapi import Depends, HTTPException, status
 
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import delete, select
 from datetime import datetime
 
+from app.core.active_bids import active_bid_views
 from app.core.security import get_password_hash
-from app.database import get_session
+from app.dependencies import get_session
+from app.models.proxy_bid import ProxyBid
 from app.models.user import User
+from app.queries import user_by_email, user_by_username
 from app.schemas.user import UserCreate, UserUpdate
+from app.sharding import scatter_bids
 
 
 class UserController:
@@ -61,16 +65,14 @@ class UserController:
         """
         Get a user by email
         """
-        result = await self.__session.execute(select(User).where(User.email == email))
+        result = await self.__session.execute(user_by_email, {"email": email})
         return result.scalars().first()
 
     async def get_user_by_username(self, username: str) -> Optional[User]:
         """
         Get a user by username
         """
-        result = await self.__session.execute(
-            select(User).where(User.username == username)
-        )
+        result = await self.__session.execute(user_by_username, {"username": username})
         return result.scalars().first()
 
     async def list_users(self, skip: int = 0, limit: int = 100) -> Sequence[User]:
@@ -111,8 +113,16 @@ class UserController:
         if not user:
             return False
 
+        async def delete_proxies(session: AsyncSession) -> None:
+            await session.execute(delete(ProxyBid).where(ProxyBid.user_id == user_id))
+            if session is not self.__session:
+                await session.commit()
+
+        # Nobody may keep bidding on behalf of a deleted user
+        await scatter_bids(self.__session, delete_proxies)
         await self.__session.delete(user)
         await self.__session.commit()
+        active_bid_views.forget_user(user_id)
         return True
 
     async def activate_user(self, user_id: int) -> Optional[User]:
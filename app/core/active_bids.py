@@ -0,0 +1,112 @@
+import time
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from app.core.config import settings
+
+
+class ActiveBidViews:
+    """
+    Per-user cache of "my active bids". A view is dropped on any bid event
+    on one of its plates or by its user, and kept at most `ttl` seconds and
+    never past the earliest deadline it lists, so ended auctions drop out
+    on time and views of other workers' plates catch up.
+    """
+
+    def __init__(self, ttl: float, max_views: int):
+        self.ttl = ttl
+        self.max_views = max_views
+        # user_id -> (expires at, view, plate ids in the view)
+        self._views: Dict[int, Tuple[float, List[dict], Tuple[int, ...]]] = {}
+        # plate_id -> users whose cached view lists the plate
+        self._watchers: Dict[int, Set[int]] = {}
+        # Bumped by every invalidation, see put()
+        self._epoch = 0
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0
+
+    def begin(self) -> int:
+        """
+        Call before querying a view, and pass the result to put()
+        """
+        return self._epoch
+
+    def get(self, user_id: int) -> Optional[List[dict]]:
+        entry = self._views.get(user_id)
+        if entry is None or entry[0] <= time.monotonic():
+            self.misses += 1
+            return None
+        self.hits += 1
+        return entry[1]
+
+    def put(
+        self,
+        user_id: int,
+        epoch: int,
+        view: List[dict],
+        deadlines: Iterable[datetime] = (),
+    ) -> None:
+        """
+        Cache a view queried since begin() returned `epoch`. It is dropped
+        if anything was invalidated meanwhile, the query may have missed it.
+        """
+        if not self.enabled or epoch != self._epoch:
+            return
+        ttl = self.ttl
+        deadlines = list(deadlines)
+        if deadlines:
+            ttl = min(ttl, (min(deadlines) - datetime.now()).total_seconds())
+        if ttl <= 0:
+            return
+        self._drop(user_id)
+        if len(self._views) >= self.max_views:
+            # Oldest first
+            self._drop(next(iter(self._views)))
+        plate_ids = tuple({row["plate_id"] for row in view})
+        self._views[user_id] = (time.monotonic() + ttl, view, plate_ids)
+        for plate_id in plate_ids:
+            self._watchers.setdefault(plate_id, set()).add(user_id)
+
+    def forget_plate(self, plate_id: int) -> None:
+        """
+        A bid on the plate, or the plate itself, changed
+        """
+        self._epoch += 1
+        for user_id in self._watchers.pop(plate_id, ()):
+            self._drop(user_id)
+
+    def forget_user(self, user_id: int) -> None:
+        """
+        The user bid on a plate their view may not list yet
+        """
+        self._epoch += 1
+        self._drop(user_id)
+
+    def _drop(self, user_id: int) -> None:
+        entry = self._views.pop(user_id, None)
+        if entry is None:
+            return
+        for plate_id in entry[2]:
+            watchers = self._watchers.get(plate_id)
+            if watchers is not None:
+                watchers.discard(user_id)
+                if not watchers:
+                    del self._watchers[plate_id]
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "views": len(self._views),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+active_bid_views = ActiveBidViews(
+    settings.ACTIVE_BIDS_CACHE_SECONDS, settings.ACTIVE_BIDS_CACHE_SIZE
+)
@@ -0,0 +1,196 @@
+import asyncio
+import bisect
+import contextvars
+import hashlib
+from contextvars import ContextVar
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional, Tuple, TypeVar
+
+from app.core.config import settings
+
+T = TypeVar("T")
+
+# Set while a command runs outside its plate's actor, on plates another
+# worker owns: BidController then locks the plate row, so those bids still
+# wait for each other
+lock_plates: ContextVar[bool] = ContextVar("lock_plates", default=False)
+
+
+class HashRing:
+    """
+    Consistent hashing of keys to nodes: adding or removing a node only
+    moves the keys of that node
+    """
+
+    def __init__(self, nodes: Iterable[str], replicas: int = 100):
+        self.nodes = list(nodes)
+        self._ring: List[Tuple[int, str]] = sorted(
+            (self._hash(f"{node}#{replica}"), node)
+            for node in self.nodes
+            for replica in range(replicas)
+        )
+        self._points = [point for point, _ in self._ring]
+
+    @staticmethod
+    def _hash(key: str) -> int:
+        return int.from_bytes(hashlib.md5(key.encode()).digest()[:8], "big")
+
+    def node_for(self, key) -> str:
+        index = bisect.bisect(self._points, self._hash(str(key))) % len(self._points)
+        return self._ring[index][1]
+
+
+class PlateActor:
+    """
+    Single writer for one plate: runs its bid commands one at a time in
+    arrival order, and stops after `idle_timeout` seconds without work
+    """
+
+    def __init__(self, plate_id: int, idle_timeout: float, on_stop: Callable):
+        self.plate_id = plate_id
+        self.idle_timeout = idle_timeout
+        self.queue: asyncio.Queue = asyncio.Queue()
+        self._on_stop = on_stop
+        # Outside the context of the request that happened to start it
+        self.task = contextvars.Context().run(asyncio.create_task, self._run())
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                command, future, context = await asyncio.wait_for(
+                    self.queue.get(), self.idle_timeout
+                )
+            except asyncio.TimeoutError:
+                # wait_for() yields while it cancels the get(), a command
+                # may have been queued meanwhile
+                if not self.queue.empty():
+                    continue
+                # No await between the check and deregistering, so nothing
+                # can be queued on an actor that is going away
+                self._on_stop(self)
+                return
+            if future.cancelled():
+                # The caller gave up before its turn
+                continue
+            try:
+                if context is None:
+                    result = await command()
+                else:
+                    # In the caller's context, so request-scoped context
+                    # variables follow the command into the actor
+                    result = await context.run(asyncio.ensure_future, command())
+            except Exception as exc:
+                if not future.done():
+                    future.set_exception(exc)
+            else:
+                if not future.done():
+                    future.set_result(result)
+
+
+class PlateActors:
+    """
+    Routes bid commands to the actor of their plate when this worker owns
+    the plate on the hash ring of PLATE_ACTOR_NODES, and runs them directly
+    otherwise, with `lock_plates` set so they lock the plate row instead
+    """
+
+    def __init__(self, node: str, nodes: Iterable[str], idle_timeout: float):
+        self.node = node
+        nodes = [n.strip() for n in nodes if n.strip()]
+        self.ring: Optional[HashRing] = HashRing(nodes) if nodes else None
+        self.idle_timeout = idle_timeout
+        self._actors: Dict[int, PlateActor] = {}
+        self.serialized = 0
+        self.direct = 0
+
+    def owns(self, plate_id: int) -> bool:
+        return self.ring is None or self.ring.node_for(plate_id) == self.node
+
+    async def run(self, plate_id: int, command: Callable[[], Awaitable[T]]) -> T:
+        """
+        Run `command()` in order with every other command for the plate
+        """
+        if not settings.PLATE_ACTORS_ENABLED or not self.owns(plate_id):
+            self.direct += 1
+            return await self._locked(command)
+
+        actor = self._actors.get(plate_id)
+        if actor is None:
+            actor = self._actors[plate_id] = PlateActor(
+                plate_id, self.idle_timeout, self._stopped
+            )
+        future = asyncio.get_running_loop().create_future()
+        actor.queue.put_nowait((command, future, contextvars.copy_context()))
+        self.serialized += 1
+        return await future
+
+    async def run_many(
+        self, plate_ids: Iterable[int], command: Callable[[], Awaitable[T]]
+    ) -> T:
+        """
+        Run `command()` once while holding the actor of every given plate,
+        so no other command for those plates runs in between. Actors are
+        taken in plate_id order, which keeps two overlapping calls from
+        waiting on each other.
+        """
+        loop = asyncio.get_running_loop()
+        releases: List[asyncio.Future] = []
+        direct = False
+        try:
+            for plate_id in sorted(set(plate_ids)):
+                if not settings.PLATE_ACTORS_ENABLED or not self.owns(plate_id):
+                    self.direct += 1
+                    direct = True
+                    continue
+                acquired = loop.create_future()
+                release = loop.create_future()
+                releases.append(release)
+
+                async def hold(acquired=acquired, release=release):
+                    if not acquired.done():
+                        acquired.set_result(None)
+                    # Released below even if the caller gave up before
+                    # its turn came
+                    await release
+
+                actor = self._actors.get(plate_id)
+                if actor is None:
+                    actor = self._actors[plate_id] = PlateActor(
+                        plate_id, self.idle_timeout, self._stopped
+                    )
+                actor.queue.put_nowait((hold, loop.create_future(), None))
+                self.serialized += 1
+                await acquired
+            if direct:
+                return await self._locked(command)
+            return await command()
+        finally:
+            for release in releases:
+                release.set_result(None)
+
+    @staticmethod
+    async def _locked(command: Callable[[], Awaitable[T]]) -> T:
+        token = lock_plates.set(True)
+        try:
+            return await command()
+        finally:
+            lock_plates.reset(token)
+
+    def _stopped(self, actor: PlateActor) -> None:
+        if self._actors.get(actor.plate_id) is actor:
+            del self._actors[actor.plate_id]
+
+    def stats(self) -> dict:
+        return {
+            "node": self.node or None,
+            "active": len(self._actors),
+            "queued": sum(actor.queue.qsize() for actor in self._actors.values()),
+            "serialized": self.serialized,
+            "direct": self.direct,
+        }
+
+
+plate_actors = PlateActors(
+    settings.PLATE_ACTOR_NODE,
+    settings.PLATE_ACTOR_NODES.split(","),
+    settings.PLATE_ACTOR_IDLE_SECONDS,
+)
@@ -0,0 +1,109 @@
+import bisect
+from decimal import Decimal, InvalidOperation
+from functools import lru_cache
+from typing import List, Optional, Tuple
+
+from app.core.config import settings
+from app.core.money import from_minor, to_minor
+
+
+def parse_tiers(spec: str) -> Tuple[Tuple[int, int], ...]:
+    """
+    "<from price>:<increment>,..." to sorted (from, increment) minor units,
+    e.g. "0:1,1000:10" is an increment of 1 below 1000 and 10 from 1000 up
+    """
+    tiers = {}
+    for tier in spec.split(","):
+        if not tier.strip():
+            continue
+        try:
+            start, increment = (Decimal(part) for part in tier.split(":"))
+        except (ValueError, InvalidOperation):
+            raise ValueError(f"invalid increment tier {tier.strip()!r}")
+        if start < 0 or increment <= 0:
+            raise ValueError(f"invalid increment tier {tier.strip()!r}")
+        tiers[to_minor(start)] = to_minor(increment)
+    if 0 not in tiers:
+        # Below the first listed tier the base increment applies
+        tiers[0] = to_minor(settings.MIN_BID_INCREMENT)
+    return tuple(sorted(tiers.items()))
+
+
+class BidRules:
+    """
+    Bid validation rules of one plate, compiled to integer minor units so
+    that checking a bid is a few comparisons against the loaded plate
+    """
+
+    def __init__(
+        self,
+        reserve_price: Optional[Decimal],
+        max_bid: Optional[Decimal],
+        increment_tiers: Optional[str],
+    ):
+        self.reserve = None if reserve_price is None else to_minor(reserve_price)
+        self.cap = None if max_bid is None else to_minor(max_bid)
+        tiers = parse_tiers(increment_tiers or settings.BID_INCREMENT_TIERS)
+        self.thresholds = [start for start, _ in tiers]
+        self.increments = [increment for _, increment in tiers]
+
+    def increment(self, price: int) -> int:
+        return self.increments[bisect.bisect(self.thresholds, price) - 1]
+
+    def minimum(self, price: int, has_bids: bool) -> int:
+        """
+        Lowest acceptable bid in minor units: the starting price for the
+        first bid, the current price plus its tier's increment after that
+        """
+        return price + self.increment(price) if has_bids else price
+
+    def check(self, price: Decimal, has_bids: bool, amount: Decimal) -> List[dict]:
+        """
+        Every rule the bid breaks, shaped like FastAPI validation errors
+        """
+        violations = []
+        amount_minor = to_minor(amount)
+        minimum = self.minimum(to_minor(price), has_bids)
+        if amount_minor < minimum:
+            violations.append(
+                {
+                    "type": "min_increment" if has_bids else "below_start_price",
+                    "msg": f"Bid amount must be at least {from_minor(minimum)}",
+                    "ctx": {"minimum": float(from_minor(minimum))},
+                }
+            )
+        if self.reserve is not None and amount_minor < self.reserve:
+            # The reserve itself stays undisclosed
+            violations.append(
+                {
+                    "type": "below_reserve",
+                    "msg": "Bid amount is below the reserve price",
+                    "ctx": {},
+                }
+            )
+        if self.cap is not None and amount_minor > self.cap:
+            violations.append(
+                {
+                    "type": "above_max_bid",
+                    "msg": f"Bid amount must not exceed {from_minor(self.cap)}",
+                    "ctx": {"maximum": float(from_minor(self.cap))},
+                }
+            )
+        return violations
+
+
+@lru_cache(maxsize=4096)
+def compile_rules(
+    reserve_price: Optional[Decimal],
+    max_bid: Optional[Decimal],
+    increment_tiers: Optional[str],
+) -> BidRules:
+    return BidRules(reserve_price, max_bid, increment_tiers)
+
+
+def rules_for(plate) -> BidRules:
+    """
+    Compiled rules of a plate, shared by every plate with the same rules
+    and recompiled only when they change
+    """
+    return compile_rules(plate.reserve_price, plate.max_bid, plate.increment_tiers)
@@ -1,13 +1,28 @@
 # app/core/celery_app.py
 from celery import Celery
+from celery.signals import (
+    before_task_publish,
+    setup_logging,
+    task_postrun,
+    task_prerun,
+    worker_process_init,
+    worker_process_shutdown,
+)
+
 from app.core.config import settings
+from app.core.logging import configure_logging, request_id_var
+from app.core.worker_loop import worker_loop
 
 # Initialize Celery app
 celery_app = Celery(
     "app",
     broker=settings.REDIS_URL,
     backend=settings.REDIS_URL,
-    include=["app.tasks.notification_tasks", "app.tasks.user_tasks"]  # Include both task modules
+    include=[
+        "app.tasks.notification_tasks",
+        "app.tasks.user_tasks",
+        "app.tasks.plate_tasks",
+    ],
 )
 
 # Optional Celery configurations
@@ -20,6 +35,50 @@ celery_app.conf.update(
     task_track_started=True,
 )
 
+
+@setup_logging.connect
+def setup_worker_logging(**kwargs):
+    """Use the app's queued logging instead of Celery's own handlers"""
+    configure_logging()
+
+
+@worker_process_init.connect
+def start_worker_loop(**kwargs):
+    """Give each forked worker process its own event loop and connections"""
+    configure_logging()
+    worker_loop.start()
+
+
+@worker_process_shutdown.connect
+def stop_worker_loop(**kwargs):
+    worker_loop.stop()
+
+
+@before_task_publish.connect
+def attach_request_id(headers=None, **kwargs):
+    """Tasks carry the id of the request that enqueued them"""
+    request_id = request_id_var.get()
+    if request_id is not None and headers is not None:
+        headers.setdefault("request_id", request_id)
+
+
+# Task id -> token of the request id set for it
+_request_id_tokens = {}
+
+
+@task_prerun.connect
+def bind_request_id(task_id=None, task=None, **kwargs):
+    request_id = getattr(task.request, "request_id", None) or task_id
+    _request_id_tokens[task_id] = request_id_var.set(request_id)
+
+
+@task_postrun.connect
+def unbind_request_id(task_id=None, **kwargs):
+    token = _request_id_tokens.pop(task_id, None)
+    if token is not None:
+        request_id_var.reset(token)
+
+
 # This allows you to call tasks directly from your app code
 def get_celery_app() -> Celery:
     return celery_app
\ No newline at end of file
@@ -1,7 +1,12 @@
 # app/core/celery_beat.py
 from app.core.celery_app import celery_app
 from celery.schedules import crontab
+from app.core.config import settings
 
 # Define periodic tasks
 celery_app.conf.beat_schedule = {
+    "reconcile-plate-stats": {
+        "task": "reconcile_plate_stats",
+        "schedule": crontab(minute=f"*/{settings.PLATE_STATS_RECONCILE_MINUTES}"),
+    },
 }
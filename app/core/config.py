@@ -1,4 +1,6 @@
 import os
+from decimal import Decimal
+
 from pydantic_settings import BaseSettings
 from pydantic import field_validator
 from dotenv import load_dotenv
@@ -21,16 +23,118 @@ class Settings(BaseSettings):
     CELERY_BROKER_URL: str = os.getenv("CELERY_BROKER_URL", REDIS_URL)
     CELERY_RESULT_BACKEND: str = os.getenv("CELERY_RESULT_BACKEND", REDIS_URL)
 
+    # Auction statistics settings
+    PLATE_STATS_RECONCILE_MINUTES: int = 5
+
+    # Hot auctions leaderboard settings ("memory" or "redis")
+    HOT_AUCTIONS_BACKEND: str = os.getenv("HOT_AUCTIONS_BACKEND", "memory")
+    HOT_AUCTIONS_SIZE: int = 50
+    HOT_AUCTIONS_HALF_LIFE_SECONDS: int = 600
+
+    # Websocket settings
+    WS_HISTORY_SIZE: int = 100  # events kept per plate for resuming clients
+    WS_MAX_SUBSCRIPTIONS: int = 200  # plates per multiplexed connection
+    SSE_HEARTBEAT_SECONDS: int = 15
+    WS_MESSAGE_RATE: float = 5.0  # client messages per second per connection
+    WS_MESSAGE_BURST: int = 20
+    NOTIFICATION_COALESCE_SECONDS: float = 5.0
+    # Sessions held at once by all long-lived connections (websockets, event
+    # streams) of a worker, however many are open
+    WS_DB_CONCURRENCY: int = 4
+
+    # Rate limiting, "<requests>/<seconds>" per key, empty to disable a key
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_BACKEND: str = os.getenv("RATE_LIMIT_BACKEND", "memory")
+    RATE_LIMIT_FORWARDED_HEADER: str = ""  # e.g. X-Forwarded-For behind a proxy
+    RATE_LIMIT_BIDS_PER_IP: str = "60/10"
+    RATE_LIMIT_BIDS_PER_USER: str = "20/10"
+    RATE_LIMIT_BIDS_PER_PLATE: str = "200/1"
+    RATE_LIMIT_BID_BATCHES_PER_IP: str = "20/10"
+    RATE_LIMIT_BID_BATCHES_PER_USER: str = "5/10"
+    RATE_LIMIT_LOGIN_PER_IP: str = "20/60"
+    RATE_LIMIT_LOGIN_PER_USER: str = "5/60"
+
+    # Per-plate bid actors. With several workers, list their names in
+    # PLATE_ACTOR_NODES and give each its own PLATE_ACTOR_NODE: a worker
+    # serializes the plates it owns on the hash ring, the rest run directly
+    PLATE_ACTORS_ENABLED: bool = True
+    PLATE_ACTOR_NODE: str = os.getenv("PLATE_ACTOR_NODE", "")
+    PLATE_ACTOR_NODES: str = os.getenv("PLATE_ACTOR_NODES", "")
+    PLATE_ACTOR_IDLE_SECONDS: float = 60.0
+
+    # Bulk plate import
+    IMPORT_BATCH_SIZE: int = 1000
+    IMPORT_MAX_ERRORS: int = 100  # rejected rows listed in the result
+
+    # Bids accepted by one POST /bids/batch
+    BID_BATCH_MAX_SIZE: int = 100
+
+    # Bid export, rows fetched per server-side cursor batch
+    EXPORT_BATCH_SIZE: int = 5000
+
+    # Money is stored as integer minor units (tiyin), 10**MONEY_DECIMAL_PLACES
+    # per unit. A bid must beat the current price by the increment of its
+    # price tier, "<from price>:<increment>,..." (plates may override the
+    # tiers); below the first tier MIN_BID_INCREMENT applies
+    MONEY_DECIMAL_PLACES: int = 2
+    MIN_BID_INCREMENT: Decimal = Decimal("0.01")
+    BID_INCREMENT_TIERS: str = os.getenv("BID_INCREMENT_TIERS", "")
+
+    # Share one query between concurrent identical reads
+    SINGLE_FLIGHT_ENABLED: bool = True
+
+    # Per-user cache of GET /bids/active, 0 to disable. Bid events drop the
+    # views of this worker, the TTL bounds staleness from other workers
+    ACTIVE_BIDS_CACHE_SECONDS: float = 30.0
+    ACTIVE_BIDS_CACHE_SIZE: int = 10000
+
+    # Request profiling, switched on and off at runtime via /admin/profiling:
+    # share of requests sampled, sampler period in CPU milliseconds, and
+    # bounds on what is kept in memory
+    PROFILING_SAMPLE_RATE: float = 0.01
+    PROFILING_INTERVAL_MS: float = 5.0
+    PROFILING_KEEP_REQUESTS: int = 100
+    PROFILING_MAX_STATEMENTS: int = 200  # per request
+    PROFILING_MAX_STACKS: int = 10000  # distinct stacks per route
+    PROFILING_CPROFILE_LINES: int = 40
+
+    # Idempotency-Key replay cache ("memory" or "redis")
+    IDEMPOTENCY_BACKEND: str = os.getenv("IDEMPOTENCY_BACKEND", "memory")
+    IDEMPOTENCY_TTL_SECONDS: int = 24 * 60 * 60
+    IDEMPOTENCY_WAIT_SECONDS: float = 10.0  # how long duplicates wait for the first call
+    IDEMPOTENCY_MAX_KEYS: int = 10000  # stored responses per worker, memory backend
 
     # JWT Authentication settings
     SECRET_KEY: str = os.getenv("SECRET_KEY", "supersecretkey123")
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30 * 24 * 60  # 30 days
 
+    # Logging, written out by a background thread: "json" lines or "text"
+    LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
+    LOG_FORMAT: str = os.getenv("LOG_FORMAT", "json")
+    LOG_QUEUE_SIZE: int = 10000  # records beyond this are dropped, not waited for
+    # Share of records kept below WARNING, "<logger prefix>=<rate>,..."
+    LOG_SAMPLE_RATES: str = os.getenv(
+        "LOG_SAMPLE_RATES", "app.controllers.bid_controller=0.1"
+    )
+
     # Database settings
+    # Log every SQL statement at INFO through the logging queue
+    DATABASE_ECHO: bool = False
     DATABASE_URL: str = os.getenv(
         "DATABASE_URL", "sqlite+aiosqlite:///./auto_plate_bidding.db"
     )
+    # Optional read replica for GET routes and websocket snapshots
+    DATABASE_READ_URL: str = os.getenv("DATABASE_READ_URL", "")
+    # Keep a caller's reads on the primary this long after its own write
+    READ_YOUR_WRITES_SECONDS: float = 5.0
+    # Comma-separated databases holding bids, partitioned by plate_id
+    BID_SHARD_URLS: str = os.getenv("BID_SHARD_URLS", "")
+    # Compiled SQL kept per engine, keyed by statement structure
+    DATABASE_QUERY_CACHE_SIZE: int = 1200
+    # Server-side prepared statements kept per asyncpg connection; 0 behind
+    # a transaction-pooling pgbouncer, which cannot keep them
+    DATABASE_PREPARED_STATEMENT_CACHE_SIZE: int = 500
 
     @classmethod
     @field_validator("DATABASE_URL")
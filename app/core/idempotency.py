@@ -0,0 +1,256 @@
+import asyncio
+import base64
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, Optional, Tuple
+
+from app.core.config import settings
+
+# Responses that must not be replayed, the client should simply retry
+NOT_STORED_STATUSES = {409, 429}
+
+
+class MemoryIdempotencyStore:
+    """
+    Responses by idempotency key for one worker, with TTL, the least
+    recently used dropped beyond `max_keys`. Duplicates that arrive while
+    the first request is still running wait for its result.
+    """
+
+    def __init__(self, ttl: int, max_keys: int):
+        self.ttl = ttl
+        self.max_keys = max_keys
+        # key -> (expires at, response), least recently used first
+        self._responses: "OrderedDict[str, Tuple[float, dict]]" = OrderedDict()
+        self._in_flight: Dict[str, asyncio.Future] = {}
+
+    async def begin(self, key: str, fingerprint: str, wait: float) -> Tuple[str, Optional[dict]]:
+        """
+        Returns ("proceed", None) for the first request, ("replay", response)
+        for duplicates, ("mismatch", None) when the key was used for a
+        different request and ("conflict", None) when the first request
+        did not produce a storable response in time
+        """
+        self._expire(key)
+        if key not in self._responses and key in self._in_flight:
+            try:
+                await asyncio.wait_for(asyncio.shield(self._in_flight[key]), wait)
+            except asyncio.TimeoutError:
+                return "conflict", None
+
+        if key in self._responses:
+            self._responses.move_to_end(key)
+            response = self._responses[key][1]
+            if response["fingerprint"] != fingerprint:
+                return "mismatch", None
+            return "replay", response
+        if key in self._in_flight:
+            # The first request finished without a storable response
+            return "conflict", None
+
+        self._in_flight[key] = asyncio.get_running_loop().create_future()
+        return "proceed", None
+
+    async def complete(self, key: str, response: Optional[dict]) -> None:
+        if response is not None:
+            self._responses[key] = (time.monotonic() + self.ttl, response)
+            self._responses.move_to_end(key)
+            while len(self._responses) > self.max_keys:
+                self._responses.popitem(last=False)
+        future = self._in_flight.pop(key, None)
+        if future is not None and not future.done():
+            future.set_result(None)
+
+    def _expire(self, key: str) -> None:
+        """
+        Drop `key` and the least recently used responses if expired. Use
+        reorders keys, so others may outlive their TTL until looked up or
+        evicted.
+        """
+        now = time.monotonic()
+        entry = self._responses.get(key)
+        if entry is not None and entry[0] <= now:
+            del self._responses[key]
+        while self._responses:
+            oldest = next(iter(self._responses))
+            if self._responses[oldest][0] > now:
+                break
+            del self._responses[oldest]
+
+
+class RedisIdempotencyStore:
+    """
+    Responses by idempotency key in Redis, shared by every worker. The first
+    request claims the key with SET NX, duplicates poll until it completes.
+    """
+
+    POLL_INTERVAL = 0.05
+
+    def __init__(self, url: str, ttl: int, prefix: str = "idempotency"):
+        from redis import asyncio as aioredis
+
+        self.ttl = ttl
+        self.prefix = prefix
+        self.redis = aioredis.from_url(url)
+
+    async def begin(self, key: str, fingerprint: str, wait: float) -> Tuple[str, Optional[dict]]:
+        name = f"{self.prefix}:{key}"
+        pending = json.dumps({"state": "pending", "fingerprint": fingerprint})
+        if await self.redis.set(name, pending, nx=True, ex=max(int(wait) * 2, 1)):
+            return "proceed", None
+
+        deadline = time.monotonic() + wait
+        while True:
+            raw = await self.redis.get(name)
+            entry = json.loads(raw) if raw else None
+            if entry is None:
+                # The first request gave up on the key
+                return "conflict", None
+            if entry["fingerprint"] != fingerprint:
+                return "mismatch", None
+            if entry["state"] == "done":
+                entry["body"] = base64.b64decode(entry["body"])
+                return "replay", entry
+            if time.monotonic() > deadline:
+                return "conflict", None
+            await asyncio.sleep(self.POLL_INTERVAL)
+
+    async def complete(self, key: str, response: Optional[dict]) -> None:
+        name = f"{self.prefix}:{key}"
+        if response is None:
+            await self.redis.delete(name)
+            return
+        entry = {
+            **response,
+            "state": "done",
+            "body": base64.b64encode(response["body"]).decode(),
+        }
+        await self.redis.set(name, json.dumps(entry), ex=self.ttl)
+
+
+class IdempotencyMiddleware:
+    """
+    Honors the Idempotency-Key header on selected POST endpoints: the first
+    response per (caller, key) is stored and retries get it replayed without
+    running the endpoint again, so no queries, commits or broadcasts repeat
+    """
+
+    def __init__(self, app, paths: Optional[Iterable[str]] = None, store=None):
+        self.app = app
+        self.paths = set(
+            paths
+            or (
+                f"{settings.API_PREFIX}/bids/",
+                f"{settings.API_PREFIX}/bids/batch",
+                f"{settings.API_PREFIX}/bids/proxy",
+            )
+        )
+        if store is None:
+            store = (
+                RedisIdempotencyStore(settings.REDIS_URL, settings.IDEMPOTENCY_TTL_SECONDS)
+                if settings.IDEMPOTENCY_BACKEND == "redis"
+                else MemoryIdempotencyStore(
+                    settings.IDEMPOTENCY_TTL_SECONDS, settings.IDEMPOTENCY_MAX_KEYS
+                )
+            )
+        self.store = store
+
+    async def __call__(self, scope, receive, send):
+        if (
+            scope["type"] != "http"
+            or scope["method"] != "POST"
+            or scope["path"] not in self.paths
+        ):
+            return await self.app(scope, receive, send)
+        headers = dict(scope["headers"])
+        idempotency_key = headers.get(b"idempotency-key")
+        if not idempotency_key:
+            return await self.app(scope, receive, send)
+
+        # Keys are scoped to the caller so clients cannot collide
+        caller = hashlib.sha256(headers.get(b"authorization", b"")).hexdigest()
+        key = f"{scope['path']}:{caller}:{idempotency_key.decode(errors='replace')}"
+        body, receive = await self._read_body(receive)
+        fingerprint = hashlib.sha256(body).hexdigest()
+
+        outcome, response = await self.store.begin(
+            key, fingerprint, settings.IDEMPOTENCY_WAIT_SECONDS
+        )
+        if outcome == "replay":
+            return await self._send_response(send, response, replayed=True)
+        if outcome == "mismatch":
+            return await self._send_error(
+                send, 422, "Idempotency-Key was used for a different request"
+            )
+        if outcome == "conflict":
+            return await self._send_error(
+                send, 409, "A request with this Idempotency-Key is still in progress"
+            )
+
+        captured = {"status": 500, "headers": [], "body": b""}
+
+        async def capture(message):
+            if message["type"] == "http.response.start":
+                captured["status"] = message["status"]
+                captured["headers"] = [
+                    [name.decode("latin-1"), value.decode("latin-1")]
+                    for name, value in message.get("headers", [])
+                ]
+            elif message["type"] == "http.response.body":
+                captured["body"] += message.get("body", b"")
+            await send(message)
+
+        stored = None
+        try:
+            await self.app(scope, receive, capture)
+            if captured["status"] < 500 and captured["status"] not in NOT_STORED_STATUSES:
+                stored = {**captured, "fingerprint": fingerprint}
+        finally:
+            await self.store.complete(key, stored)
+
+    @staticmethod
+    async def _read_body(receive):
+        body = b""
+        more_body = True
+        while more_body:
+            message = await receive()
+            if message["type"] != "http.request":
+                break
+            body += message.get("body", b"")
+            more_body = message.get("more_body", False)
+        replayed = False
+
+        async def replay():
+            nonlocal replayed
+            if not replayed:
+                replayed = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            return await receive()
+
+        return body, replay
+
+    @staticmethod
+    async def _send_response(send, response: dict, replayed: bool = False):
+        headers = [
+            (name.encode("latin-1"), value.encode("latin-1"))
+            for name, value in response["headers"]
+        ]
+        if replayed:
+            headers.append((b"idempotent-replayed", b"true"))
+        await send(
+            {"type": "http.response.start", "status": response["status"], "headers": headers}
+        )
+        await send({"type": "http.response.body", "body": response["body"]})
+
+    @classmethod
+    async def _send_error(cls, send, status: int, detail: str):
+        await cls._send_response(
+            send,
+            {
+                "status": status,
+                "headers": [["content-type", "application/json"]],
+                "body": json.dumps({"detail": detail}).encode(),
+            },
+        )
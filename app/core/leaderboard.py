@@ -0,0 +1,229 @@
+import heapq
+import logging
+import time
+from typing import Dict, List, Optional, Tuple
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Rescale decayed scores well before float precision suffers (2 ** 64)
+REBASE_AFTER_HALF_LIVES = 64
+
+
+class TopK:
+    """
+    Member scores with an exactly maintained top-K list.
+
+    Scores normally only grow (decayed activity weights, rising prices), so a
+    member outside the top K can only enter it through its own update and the
+    list is kept in O(K) per update.  Decreases and removals of a top member
+    fall back to a full rebuild.
+    """
+
+    def __init__(self, k: int):
+        self.k = k
+        self._scores: Dict[int, float] = {}
+        self._top: List[Tuple[float, int]] = []
+        self._members: set = set()
+
+    def __len__(self):
+        return len(self._scores)
+
+    def __contains__(self, member: int) -> bool:
+        return member in self._scores
+
+    def incr(self, member: int, amount: float) -> float:
+        score = self._scores.get(member, 0.0) + amount
+        self.set(member, score)
+        return score
+
+    def set(self, member: int, score: float) -> None:
+        previous = self._scores.get(member)
+        self._scores[member] = score
+        if member in self._members:
+            if previous is not None and score < previous:
+                self._rebuild()
+                return
+            self._top = [(s, m) for s, m in self._top if m != member]
+        elif len(self._top) >= self.k and score <= self._top[-1][0]:
+            return
+        self._top.append((score, member))
+        self._top.sort(reverse=True)
+        if len(self._top) > self.k:
+            _, dropped = self._top.pop()
+            self._members.discard(dropped)
+        self._members.add(member)
+
+    def remove(self, member: int) -> None:
+        if self._scores.pop(member, None) is not None and member in self._members:
+            self._rebuild()
+
+    def scale(self, factor: float) -> None:
+        self._scores = {m: s * factor for m, s in self._scores.items()}
+        self._top = [(s * factor, m) for s, m in self._top]
+
+    def top(self, n: int) -> List[Tuple[int, float]]:
+        return [(m, s) for s, m in self._top[:n]]
+
+    def _rebuild(self) -> None:
+        largest = heapq.nlargest(self.k, self._scores.items(), key=lambda i: i[1])
+        self._top = [(s, m) for m, s in largest]
+        self._members = {m for _, m in self._top}
+
+
+class MemoryBackend:
+    """
+    Leaderboards kept in the current process
+    """
+
+    def __init__(self, size: int, half_life: float):
+        self.half_life = half_life
+        self.epoch = time.time()
+        self.activity = TopK(size)
+        self.price = TopK(size)
+
+    async def record_bid(self, plate_id: int, price: float, now: float) -> None:
+        if now - self.epoch > REBASE_AFTER_HALF_LIVES * self.half_life:
+            self.activity.scale(2 ** (-(now - self.epoch) / self.half_life))
+            self.epoch = now
+        self.activity.incr(plate_id, 2 ** ((now - self.epoch) / self.half_life))
+        self.price.set(plate_id, price)
+
+    async def set_price(self, plate_id: int, price: float) -> None:
+        if plate_id in self.price:
+            self.price.set(plate_id, price)
+
+    async def remove(self, plate_id: int) -> None:
+        self.activity.remove(plate_id)
+        self.price.remove(plate_id)
+
+    async def top(self, by: str, limit: int) -> Tuple[List[Tuple[int, float]], float]:
+        board = self.activity if by == "activity" else self.price
+        return board.top(limit), self.epoch
+
+
+class RedisBackend:
+    """
+    Leaderboards in Redis sorted sets so that all workers share them
+    """
+
+    # KEYS: activity, price, epoch
+    # ARGV: plate_id, price, now, half_life, rebase_after, size
+    # Activity keeps a margin below the cut-off, prices only what is served
+    RECORD_BID_SCRIPT = """
+    local epoch = tonumber(redis.call('GET', KEYS[3]))
+    local now = tonumber(ARGV[3])
+    local half_life = tonumber(ARGV[4])
+    if not epoch then
+        epoch = now
+        redis.call('SET', KEYS[3], epoch)
+    elseif now - epoch > tonumber(ARGV[5]) then
+        local factor = 2 ^ (-(now - epoch) / half_life)
+        redis.call('ZUNIONSTORE', KEYS[1], 1, KEYS[1], 'WEIGHTS', factor)
+        epoch = now
+        redis.call('SET', KEYS[3], epoch)
+    end
+    redis.call('ZINCRBY', KEYS[1], 2 ^ ((now - epoch) / half_life), ARGV[1])
+    redis.call('ZADD', KEYS[2], ARGV[2], ARGV[1])
+    redis.call('ZREMRANGEBYRANK', KEYS[1], 0, -tonumber(ARGV[6]) * 4 - 1)
+    redis.call('ZREMRANGEBYRANK', KEYS[2], 0, -tonumber(ARGV[6]) - 1)
+    return 1
+    """
+
+    def __init__(self, url: str, size: int, half_life: float, prefix: str = "hot"):
+        from redis import asyncio as aioredis
+
+        self.half_life = half_life
+        self.size = size
+        self.redis = aioredis.from_url(url)
+        self.keys = [f"{prefix}:activity", f"{prefix}:price", f"{prefix}:epoch"]
+        self._record_bid = self.redis.register_script(self.RECORD_BID_SCRIPT)
+
+    async def record_bid(self, plate_id: int, price: float, now: float) -> None:
+        await self._record_bid(
+            keys=self.keys,
+            args=[
+                plate_id,
+                price,
+                now,
+                self.half_life,
+                REBASE_AFTER_HALF_LIVES * self.half_life,
+                self.size,
+            ],
+        )
+
+    async def set_price(self, plate_id: int, price: float) -> None:
+        await self.redis.zadd(self.keys[1], {plate_id: price}, xx=True)
+
+    async def remove(self, plate_id: int) -> None:
+        async with self.redis.pipeline() as pipe:
+            pipe.zrem(self.keys[0], plate_id)
+            pipe.zrem(self.keys[1], plate_id)
+            await pipe.execute()
+
+    async def top(self, by: str, limit: int) -> Tuple[List[Tuple[int, float]], float]:
+        key = self.keys[0] if by == "activity" else self.keys[1]
+        async with self.redis.pipeline() as pipe:
+            pipe.zrevrange(key, 0, limit - 1, withscores=True)
+            pipe.get(self.keys[2])
+            members, epoch = await pipe.execute()
+        return [(int(m), s) for m, s in members], float(epoch or time.time())
+
+
+class HotAuctions:
+    """
+    Continuously maintained "hot auctions" leaderboards, by recent bid
+    activity (exponentially decayed) and by current price
+    """
+
+    def __init__(self, backend, size: int, half_life: float):
+        self.backend = backend
+        self.size = size
+        self.half_life = half_life
+
+    @classmethod
+    def from_settings(cls) -> "HotAuctions":
+        size = settings.HOT_AUCTIONS_SIZE
+        half_life = settings.HOT_AUCTIONS_HALF_LIFE_SECONDS
+        if settings.HOT_AUCTIONS_BACKEND == "redis":
+            backend = RedisBackend(settings.REDIS_URL, size, half_life)
+        else:
+            backend = MemoryBackend(size, half_life)
+        return cls(backend, size, half_life)
+
+    async def record_bid(self, plate_id: int, price: float) -> None:
+        try:
+            await self.backend.record_bid(plate_id, float(price), time.time())
+        except Exception as e:
+            # The leaderboard is best effort and must never fail a bid
+            logger.error("Error updating hot auctions: %s", e)
+
+    async def set_price(self, plate_id: int, price: float) -> None:
+        try:
+            await self.backend.set_price(plate_id, float(price))
+        except Exception as e:
+            logger.error("Error updating hot auctions: %s", e)
+
+    async def remove(self, plate_id: int) -> None:
+        try:
+            await self.backend.remove(plate_id)
+        except Exception as e:
+            logger.error("Error updating hot auctions: %s", e)
+
+    async def top(
+        self, by: str = "activity", limit: Optional[int] = None
+    ) -> List[Tuple[int, float]]:
+        """
+        Get up to `limit` (plate_id, score) pairs, best first
+        """
+        limit = min(limit or self.size, self.size)
+        entries, epoch = await self.backend.top(by, limit)
+        if by != "activity":
+            return entries
+        # Stored activity is weighted relative to the epoch, bring it to now
+        decay = 2 ** (-(time.time() - epoch) / self.half_life)
+        return [(plate_id, score * decay) for plate_id, score in entries]
+
+
+hot_auctions = HotAuctions.from_settings()
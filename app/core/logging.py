@@ -0,0 +1,226 @@
+import atexit
+import copy
+import json
+import logging
+import os
+import queue
+import random
+import re
+import sys
+import uuid
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Optional
+
+from app.core.config import settings
+
+# Id of the request (or the task it enqueued) being handled. Plate actors
+# and the Celery worker loop run code in their caller's context, so it
+# follows the work there.
+request_id_var: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
+
+REQUEST_ID_HEADER = b"x-request-id"
+# Ids taken from clients are echoed into logs, so only short, plain ones
+_VALID_REQUEST_ID = re.compile(rb"^[A-Za-z0-9._-]{1,64}$")
+
+# Attributes every LogRecord has; anything else came in through `extra`
+_RECORD_ATTRIBUTES = set(vars(logging.makeLogRecord({}))) | {"message", "asctime"}
+
+
+def parse_rates(spec: str) -> Dict[str, float]:
+    """
+    "<logger prefix>=<share kept>,...", e.g. "app.controllers=0.1"
+    """
+    rates = {}
+    for item in spec.split(","):
+        if item.strip():
+            name, rate = item.split("=")
+            rates[name.strip()] = float(rate)
+    return rates
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    One JSON object per line: time, level, logger, message, request id and
+    the fields passed as `extra`
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES and value is not None:
+                entry[key] = value
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry["exception"] = record.exc_text
+        return json.dumps(entry, default=str)
+
+
+class ContextFilter(logging.Filter):
+    """
+    Stamps the request id on records in the thread that logs them; the
+    listener thread writing them out has no request context
+    """
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = request_id_var.get()
+        return True
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Keeps a share of the records of high-volume loggers, by logger name
+    prefix. Warnings and errors are always kept. Kept records carry the
+    rate so counts can be scaled back up.
+    """
+
+    def __init__(self, rates: Dict[str, float]):
+        super().__init__()
+        # Longest prefix first, so the most specific rate wins
+        self.rates = sorted(rates.items(), key=lambda item: -len(item[0]))
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING or not self.rates:
+            return True
+        for prefix, rate in self.rates:
+            if record.name == prefix or record.name.startswith(prefix + "."):
+                if random.random() >= rate:
+                    return False
+                record.sample_rate = rate
+                return True
+        return True
+
+
+class DroppingQueueHandler(QueueHandler):
+    """
+    Never blocks the caller: when the listener falls behind, records beyond
+    the queue size are counted and dropped
+    """
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """
+        Resolve the message and traceback here, where the arguments and
+        exception are still valid, but leave formatting to the listener
+        """
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+_listener: Optional[QueueListener] = None
+_handler: Optional[DroppingQueueHandler] = None
+_pid: Optional[int] = None
+
+
+def configure_logging() -> None:
+    """
+    Route all logging through a bounded queue to a listener thread that
+    formats and writes it, so the event loop never waits on stdout. Safe to
+    call again, and again after a fork: a forked child gets its own
+    listener, the parent's thread does not exist there.
+    """
+    global _listener, _handler, _pid
+    if _pid == os.getpid():
+        return
+
+    stream = logging.StreamHandler(sys.stdout)
+    stream.setFormatter(
+        JsonFormatter()
+        if settings.LOG_FORMAT == "json"
+        else logging.Formatter(
+            "%(asctime)s %(levelname)s %(name)s [%(request_id)s] %(message)s"
+        )
+    )
+    handler = DroppingQueueHandler(queue.Queue(settings.LOG_QUEUE_SIZE))
+    handler.addFilter(SamplingFilter(parse_rates(settings.LOG_SAMPLE_RATES)))
+    handler.addFilter(ContextFilter())
+
+    root = logging.getLogger()
+    if _handler is not None:
+        root.removeHandler(_handler)
+    root.addHandler(handler)
+    root.setLevel(settings.LOG_LEVEL)
+    # Server loggers come with their own synchronous handlers
+    for name in ("uvicorn", "uvicorn.error", "uvicorn.access"):
+        logging.getLogger(name).handlers = []
+        logging.getLogger(name).propagate = True
+    # SQL statements go through the queue too, instead of echo's own
+    # stdout handler
+    logging.getLogger("sqlalchemy.engine").setLevel(
+        logging.INFO if settings.DATABASE_ECHO else logging.WARNING
+    )
+
+    listener = QueueListener(handler.queue, stream, respect_handler_level=True)
+    listener.start()
+    if _pid is None:
+        atexit.register(stop_logging)
+    _listener, _handler, _pid = listener, handler, os.getpid()
+
+
+def stop_logging() -> None:
+    """
+    Write out what is still queued
+    """
+    global _listener
+    if _listener is not None and _pid == os.getpid():
+        _listener.stop()
+        _listener = None
+
+
+def dropped_records() -> int:
+    return _handler.dropped if _handler is not None else 0
+
+
+class RequestIdMiddleware:
+    """
+    Gives every request an id, the client's X-Request-ID when it sends a
+    valid one, and returns it in the response header. Logs written while
+    handling the request, and tasks it enqueues, carry it.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] not in ("http", "websocket"):
+            return await self.app(scope, receive, send)
+        request_id = None
+        for name, value in scope["headers"]:
+            if name == REQUEST_ID_HEADER:
+                if _VALID_REQUEST_ID.match(value):
+                    request_id = value.decode()
+                break
+        request_id = request_id or uuid.uuid4().hex
+        header = (REQUEST_ID_HEADER, request_id.encode())
+
+        async def send_with_id(message):
+            if message["type"] == "http.response.start":
+                message["headers"] = [*message.get("headers", []), header]
+            await send(message)
+
+        token = request_id_var.set(request_id)
+        try:
+            await self.app(scope, receive, send_with_id)
+        finally:
+            request_id_var.reset(token)
@@ -0,0 +1,49 @@
+from decimal import ROUND_HALF_EVEN, Decimal
+from typing import Annotated, Optional, Union
+
+from pydantic import Field, PlainSerializer
+from sqlalchemy import BigInteger
+from sqlalchemy.types import TypeDecorator
+
+from app.core.config import settings
+
+PLACES = settings.MONEY_DECIMAL_PLACES
+MINOR_PER_UNIT = 10**PLACES
+
+
+def to_minor(amount: Union[Decimal, int, float]) -> int:
+    """
+    Amount in units to integer minor units, e.g. Decimal("12.34") -> 1234
+    """
+    if isinstance(amount, float):
+        amount = Decimal(repr(amount))
+    return int(
+        Decimal(amount).scaleb(PLACES).to_integral_value(rounding=ROUND_HALF_EVEN)
+    )
+
+
+def from_minor(minor: int) -> Decimal:
+    return Decimal(minor).scaleb(-PLACES)
+
+
+class MoneyType(TypeDecorator):
+    """
+    Money column: BIGINT minor units in the database, Decimal in Python
+    """
+
+    impl = BigInteger
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect) -> Optional[int]:
+        return None if value is None else to_minor(value)
+
+    def process_result_value(self, value, dialect) -> Optional[Decimal]:
+        return None if value is None else from_minor(value)
+
+
+# Exact Decimal in request and response models, a plain JSON number on the wire
+Money = Annotated[
+    Decimal,
+    Field(max_digits=18, decimal_places=PLACES),
+    PlainSerializer(float, return_type=float, when_used="json"),
+]
@@ -0,0 +1,302 @@
+import cProfile
+import io
+import pstats
+import random
+import secrets
+import signal
+import threading
+import time
+from collections import Counter, deque
+from contextvars import ContextVar
+from typing import Deque, Dict, List, Optional
+
+from sqlalchemy import event
+
+from app.core.config import settings
+
+# The request being profiled, read by the sampler and the SQL hooks. Plate
+# actors run commands in their caller's context, so it follows bids there.
+_current: ContextVar[Optional["ProfiledRequest"]] = ContextVar(
+    "profiled_request", default=None
+)
+
+PROFILE_HEADER = b"x-profile"
+MAX_STACK_DEPTH = 128
+# Samples taken while no profiled request was running: what else kept the
+# event loop busy meanwhile
+OTHER_ROUTE = "(other)"
+
+
+def collapse(frame) -> str:
+    """
+    A stack in collapsed format, root first: "module:function;..."
+    """
+    names = []
+    while frame is not None and len(names) < MAX_STACK_DEPTH:
+        code = frame.f_code
+        names.append(
+            f"{frame.f_globals.get('__name__', '?')}:"
+            f"{getattr(code, 'co_qualname', code.co_name)}"
+        )
+        frame = frame.f_back
+    return ";".join(reversed(names))
+
+
+class ProfiledRequest:
+    def __init__(self, method: str, path: str, mode: str):
+        self.method = method
+        self.path = path
+        # "sample", "cprofile", or "sql" (statements only) where the sampler
+        # is unavailable
+        self.mode = mode
+        self.route: Optional[str] = None
+        self.status: Optional[int] = None
+        self.started = time.time()
+        self.duration_ms = 0.0
+        self.samples: Counter = Counter()
+        self.statements: List[dict] = []
+        self.dropped_statements = 0
+        self.cprofile: Optional[str] = None
+
+    def record_statement(self, statement: str, ms: float) -> None:
+        if len(self.statements) < settings.PROFILING_MAX_STATEMENTS:
+            self.statements.append({"sql": statement, "ms": round(ms, 3)})
+        else:
+            self.dropped_statements += 1
+
+    def summary(self) -> dict:
+        return {
+            "method": self.method,
+            "path": self.path,
+            "route": self.route,
+            "mode": self.mode,
+            "status": self.status,
+            "started": self.started,
+            "duration_ms": round(self.duration_ms, 3),
+            "samples": sum(self.samples.values()),
+            "sql_ms": round(sum(s["ms"] for s in self.statements), 3),
+            "statements": self.statements,
+            "dropped_statements": self.dropped_statements,
+            "cprofile": self.cprofile,
+        }
+
+
+class Profiler:
+    """
+    Request profiler of this worker, switched on and off at runtime. While
+    off nothing is hooked: no SQLAlchemy listener, no timer, and the
+    middleware hands requests straight on.
+
+    When on, a share of requests (`sample_rate`) is profiled by a SIGPROF
+    sampler that records the interrupted stack every `interval` seconds of
+    CPU time, and requests carrying `X-Profile: <token>` are run under
+    cProfile. Both collect the SQL statements of the request with their
+    timings. Sampled stacks are kept per route in collapsed format for
+    flame graphs.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.sample_rate = settings.PROFILING_SAMPLE_RATE
+        self.interval = settings.PROFILING_INTERVAL_MS / 1000
+        self.token: Optional[str] = None
+        self.stacks: Dict[str, Counter] = {}
+        self.requests: Deque[dict] = deque(maxlen=settings.PROFILING_KEEP_REQUESTS)
+        self._engines: list = []
+        self._sampling = 0  # sampled requests in flight
+        self._previous_handler = None
+        self._cprofile_running = False
+
+    @property
+    def can_sample(self) -> bool:
+        # Signal handlers run on the main thread, where uvicorn runs the loop
+        return (
+            hasattr(signal, "setitimer")
+            and threading.current_thread() is threading.main_thread()
+        )
+
+    def enable(
+        self, sample_rate: Optional[float] = None, interval_ms: Optional[float] = None
+    ) -> None:
+        if sample_rate is not None:
+            self.sample_rate = sample_rate
+        if interval_ms is not None:
+            self.interval = interval_ms / 1000
+        if self.enabled:
+            return
+        from app.core.worker_loop import worker_engines
+
+        self._engines = [engine.sync_engine for engine in worker_engines()]
+        for engine in self._engines:
+            event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+            event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+        self.token = secrets.token_urlsafe(16)
+        self.enabled = True
+
+    def disable(self) -> None:
+        """
+        Unhook everything. Requests still in flight finish their profile.
+        """
+        if not self.enabled:
+            return
+        self.enabled = False
+        self.token = None
+        for engine in self._engines:
+            event.remove(engine, "before_cursor_execute", _before_cursor_execute)
+            event.remove(engine, "after_cursor_execute", _after_cursor_execute)
+        self._engines = []
+
+    def clear(self) -> None:
+        self.stacks.clear()
+        self.requests.clear()
+
+    def mode_for(self, scope) -> Optional[str]:
+        """
+        How to profile a request, if at all
+        """
+        if self.token is not None and not self._cprofile_running:
+            for name, value in scope["headers"]:
+                if name == PROFILE_HEADER:
+                    if secrets.compare_digest(value, self.token.encode()):
+                        return "cprofile"
+                    break
+        if self.sample_rate > 0 and random.random() < self.sample_rate:
+            return "sample" if self.can_sample else "sql"
+        return None
+
+    def begin(self, request: ProfiledRequest) -> Optional[cProfile.Profile]:
+        if request.mode == "cprofile":
+            # One thread, one cProfile: it sees every task the loop runs
+            # during the request
+            self._cprofile_running = True
+            profile = cProfile.Profile()
+            profile.enable()
+            return profile
+        if request.mode == "sample":
+            self._sampling += 1
+            if self._sampling == 1:
+                self._previous_handler = signal.signal(signal.SIGPROF, self._sample)
+                signal.setitimer(signal.ITIMER_PROF, self.interval, self.interval)
+        return None
+
+    def end(
+        self, request: ProfiledRequest, profile: Optional[cProfile.Profile]
+    ) -> None:
+        if profile is not None:
+            profile.disable()
+            self._cprofile_running = False
+            out = io.StringIO()
+            pstats.Stats(profile, stream=out).sort_stats("cumulative").print_stats(
+                settings.PROFILING_CPROFILE_LINES
+            )
+            request.cprofile = out.getvalue()
+        if request.mode == "sample":
+            self._sampling -= 1
+            if self._sampling == 0:
+                signal.setitimer(signal.ITIMER_PROF, 0)
+                previous = self._previous_handler
+                # A SIGPROF still in flight must not kill the worker
+                if previous in (None, signal.SIG_DFL):
+                    previous = signal.SIG_IGN
+                signal.signal(signal.SIGPROF, previous)
+            self._merge(request.route, request.samples)
+        self.requests.append(request.summary())
+
+    def _sample(self, signum, frame) -> None:
+        request = _current.get()
+        stack = collapse(frame)
+        if request is not None:
+            request.samples[stack] += 1
+        else:
+            self._merge(OTHER_ROUTE, {stack: 1})
+
+    def _merge(self, route: str, samples) -> None:
+        stacks = self.stacks.setdefault(route, Counter())
+        # list(): the sampler may add stacks from its signal handler
+        for stack, count in list(samples.items()):
+            # Bounded: stacks not seen before are dropped once full
+            if stack in stacks or len(stacks) < settings.PROFILING_MAX_STACKS:
+                stacks[stack] += count
+
+    def collapsed(self, route: Optional[str] = None) -> str:
+        """
+        Sampled stacks as "<route>;<frames> <count>" lines, the input of
+        flamegraph.pl and speedscope
+        """
+        lines = []
+        for name, stacks in list(self.stacks.items()):
+            if route is not None and name != route:
+                continue
+            for stack, count in list(stacks.items()):
+                lines.append(f"{name};{stack} {count}")
+        return "\n".join(lines) + ("\n" if lines else "")
+
+    def status(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "sample_rate": self.sample_rate,
+            "interval_ms": self.interval * 1000,
+            "sampler_available": self.can_sample,
+            "routes": {
+                route: sum(stacks.values())
+                for route, stacks in list(self.stacks.items())
+            },
+            "requests": len(self.requests),
+        }
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current.get() is not None:
+        conn.info.setdefault("profiling_started", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    request = _current.get()
+    started = conn.info.get("profiling_started")
+    if request is not None and started:
+        request.record_statement(
+            statement, (time.perf_counter() - started.pop()) * 1000
+        )
+
+
+class ProfilingMiddleware:
+    """
+    Profiles requests picked by the profiler. While profiling is off this
+    is a single attribute check per request.
+    """
+
+    def __init__(self, app, profiler: Optional[Profiler] = None):
+        self.app = app
+        self.profiler = profiler or request_profiler
+
+    async def __call__(self, scope, receive, send):
+        profiler = self.profiler
+        if not profiler.enabled or scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        mode = profiler.mode_for(scope)
+        if mode is None:
+            return await self.app(scope, receive, send)
+
+        request = ProfiledRequest(scope["method"], scope["path"], mode)
+
+        async def send_status(message):
+            if message["type"] == "http.response.start":
+                request.status = message["status"]
+            await send(message)
+
+        token = _current.set(request)
+        started = time.perf_counter()
+        profile = profiler.begin(request)
+        try:
+            await self.app(scope, receive, send_status)
+        finally:
+            request.duration_ms = (time.perf_counter() - started) * 1000
+            # Set by the router on the shared scope; unmatched paths are
+            # pooled so random URLs cannot grow the stacks without bound
+            route = scope.get("route")
+            request.route = f"{request.method} {getattr(route, 'path', '(unmatched)')}"
+            _current.reset(token)
+            profiler.end(request, profile)
+
+
+request_profiler = Profiler()
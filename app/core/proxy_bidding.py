@@ -0,0 +1,43 @@
+from typing import Dict, Iterable, NamedTuple, Optional, Tuple
+
+from app.core.bid_rules import BidRules
+
+
+class Bidder(NamedTuple):
+    """
+    One side of a proxy war, amounts in minor units
+    """
+
+    user_id: int
+    limit: int  # the most this bidder goes to: proxy maximum or own bid
+    floor: int  # what the bidder already bid, kept even when outbid
+    seniority: float  # earlier proxies and bids win ties
+
+
+def resolve(
+    bidders: Iterable[Bidder], rules: BidRules, start_price: int
+) -> Tuple[Optional[int], Dict[int, int]]:
+    """
+    Play out the bidding war between proxies in one pass instead of bid by
+    bid: the highest limit wins at the runner-up's limit plus one increment
+    (second price), capped at its own limit. Losers end at their limit, as
+    if each had bid up to it. Returns the winner and every bidder's final
+    bid.
+    """
+    ranked = sorted(bidders, key=lambda bidder: (-bidder.limit, bidder.seniority))
+    if not ranked:
+        return None, {}
+    winner = ranked[0]
+    if len(ranked) > 1:
+        runner_up = ranked[1].limit
+        price = min(winner.limit, runner_up + rules.increment(runner_up))
+    else:
+        price = start_price
+    price = max(price, winner.floor)
+    if rules.reserve is not None and price < rules.reserve <= winner.limit:
+        # A proxy that can meet the reserve bids straight up to it
+        price = rules.reserve
+
+    final = {bidder.user_id: bidder.limit for bidder in ranked[1:]}
+    final[winner.user_id] = price
+    return winner.user_id, final
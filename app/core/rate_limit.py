@@ -0,0 +1,415 @@
+import base64
+import hashlib
+import hmac
+import json
+import math
+import time
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs
+
+from jose import JWTError, jwt
+
+from app.core.config import settings
+
+# Bodies larger than this are never buffered to extract a key
+MAX_INSPECTED_BODY = 64 * 1024
+
+# Token algorithms checked here directly, a fraction of the cost of a
+# full jwt.decode()
+_HMAC_DIGESTS = {
+    "HS256": hashlib.sha256,
+    "HS384": hashlib.sha384,
+    "HS512": hashlib.sha512,
+}
+
+
+def parse_rate(rate: str) -> Tuple[int, int]:
+    """
+    Parse "<requests>/<seconds>", e.g. "20/10"
+    """
+    limit, window = rate.split("/")
+    return int(limit), int(window)
+
+
+class MemoryRateLimiter:
+    """
+    Sliding-window counters for a single worker: the previous fixed window is
+    weighted by how much of it still overlaps the sliding window
+    """
+
+    def __init__(self):
+        # key -> [window seconds, window index, count in current window,
+        # count in previous]
+        self._windows: Dict[str, List[int]] = {}
+        self._hits = 0
+
+    async def hit(self, key: str, limit: int, window: int) -> Tuple[bool, int]:
+        """
+        Count a request, returns (allowed, seconds until retry)
+        """
+        now = time.time()
+        index = int(now // window)
+        entry = self._windows.get(key)
+        if entry is None:
+            entry = self._windows[key] = [window, index, 0, 0]
+        elif entry[1] != index:
+            entry[3] = entry[2] if entry[1] == index - 1 else 0
+            entry[2] = 0
+            entry[1] = index
+
+        elapsed = now / window - index
+        estimate = entry[3] * (1 - elapsed) + entry[2]
+        self._maybe_prune(now)
+        if estimate >= limit:
+            return False, max(1, math.ceil((1 - elapsed) * window))
+        entry[2] += 1
+        return True, 0
+
+    def _maybe_prune(self, now: float) -> None:
+        self._hits += 1
+        if self._hits % 10_000:
+            return
+        # Drop keys that have been quiet for two full windows of their own
+        # length; limits with different windows share the dict
+        self._windows = {
+            key: entry
+            for key, entry in self._windows.items()
+            if entry[1] >= int(now // entry[0]) - 1
+        }
+
+
+class RedisRateLimiter:
+    """
+    The same sliding-window counters in Redis, shared by every worker. Each
+    check is a single atomic Lua script call.
+    """
+
+    # KEYS: current window key, previous window key
+    # ARGV: limit, window seconds, elapsed fraction of the current window
+    HIT_SCRIPT = """
+    local current = tonumber(redis.call('GET', KEYS[1]) or '0')
+    local previous = tonumber(redis.call('GET', KEYS[2]) or '0')
+    local elapsed = tonumber(ARGV[3])
+    if previous * (1 - elapsed) + current >= tonumber(ARGV[1]) then
+        return 0
+    end
+    redis.call('INCR', KEYS[1])
+    redis.call('EXPIRE', KEYS[1], tonumber(ARGV[2]) * 2)
+    return 1
+    """
+
+    def __init__(self, url: str, prefix: str = "ratelimit"):
+        from redis import asyncio as aioredis
+
+        self.prefix = prefix
+        self.redis = aioredis.from_url(url)
+        self._hit = self.redis.register_script(self.HIT_SCRIPT)
+
+    async def hit(self, key: str, limit: int, window: int) -> Tuple[bool, int]:
+        now = time.time()
+        index = int(now // window)
+        elapsed = now / window - index
+        allowed = await self._hit(
+            keys=[
+                f"{self.prefix}:{key}:{window}:{index}",
+                f"{self.prefix}:{key}:{window}:{index - 1}",
+            ],
+            args=[limit, window, elapsed],
+        )
+        if allowed:
+            return True, 0
+        return False, max(1, math.ceil((1 - elapsed) * window))
+
+
+class RateLimitRule:
+    """
+    Limits for one endpoint, by scope: "ip", "user" and/or "plate". The user
+    comes from the bearer token, or from the form field `user_field` for
+    endpoints called before authentication.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        method: str,
+        path: str,
+        limits: Dict[str, str],
+        user_field: Optional[str] = None,
+    ):
+        self.name = name
+        self.method = method
+        self.path = path
+        self.limits = {scope: parse_rate(rate) for scope, rate in limits.items() if rate}
+        self.user_field = user_field
+
+    @property
+    def needs_body(self) -> bool:
+        return "plate" in self.limits or (
+            "user" in self.limits and self.user_field is not None
+        )
+
+
+def default_rules() -> List[RateLimitRule]:
+    return [
+        RateLimitRule(
+            "bids",
+            "POST",
+            f"{settings.API_PREFIX}/bids/",
+            {
+                "ip": settings.RATE_LIMIT_BIDS_PER_IP,
+                "user": settings.RATE_LIMIT_BIDS_PER_USER,
+                "plate": settings.RATE_LIMIT_BIDS_PER_PLATE,
+            },
+        ),
+        # Registering a proxy can place bids right away
+        RateLimitRule(
+            "proxy_bids",
+            "POST",
+            f"{settings.API_PREFIX}/bids/proxy",
+            {
+                "ip": settings.RATE_LIMIT_BIDS_PER_IP,
+                "user": settings.RATE_LIMIT_BIDS_PER_USER,
+                "plate": settings.RATE_LIMIT_BIDS_PER_PLATE,
+            },
+        ),
+        # One call places many bids: fewer calls per user, and every plate
+        # in the batch counts against its plate limit
+        RateLimitRule(
+            "bid_batches",
+            "POST",
+            f"{settings.API_PREFIX}/bids/batch",
+            {
+                "ip": settings.RATE_LIMIT_BID_BATCHES_PER_IP,
+                "user": settings.RATE_LIMIT_BID_BATCHES_PER_USER,
+                "plate": settings.RATE_LIMIT_BIDS_PER_PLATE,
+            },
+        ),
+        RateLimitRule(
+            "login",
+            "POST",
+            f"{settings.API_PREFIX}/auth/login",
+            {
+                "ip": settings.RATE_LIMIT_LOGIN_PER_IP,
+                "user": settings.RATE_LIMIT_LOGIN_PER_USER,
+            },
+            user_field="username",
+        ),
+    ]
+
+
+_limiter = None
+
+
+def shared_limiter():
+    """
+    The limiter of this worker, shared by the middleware and websocket bids
+    so both spend the same budgets
+    """
+    global _limiter
+    if _limiter is None:
+        _limiter = (
+            RedisRateLimiter(settings.REDIS_URL)
+            if settings.RATE_LIMIT_BACKEND == "redis"
+            else MemoryRateLimiter()
+        )
+    return _limiter
+
+
+async def hit_rule(limiter, rule: RateLimitRule, keys) -> int:
+    """
+    Count a call against each (scope, value) of `rule`, returns the seconds
+    until retry, 0 when allowed
+    """
+    retry_after = 0
+    for scope_name, value in keys:
+        limit, window = rule.limits[scope_name]
+        allowed, wait = await limiter.hit(
+            f"{rule.name}:{scope_name}:{value}", limit, window
+        )
+        if not allowed:
+            retry_after = max(retry_after, wait)
+    return retry_after
+
+
+def client_ip(scope, headers: Dict[bytes, bytes]) -> str:
+    if settings.RATE_LIMIT_FORWARDED_HEADER:
+        forwarded = headers.get(settings.RATE_LIMIT_FORWARDED_HEADER.lower().encode())
+        if forwarded:
+            return forwarded.split(b",")[0].strip().decode()
+    client = scope.get("client")
+    return client[0] if client else "unknown"
+
+
+_websocket_bid_rule: Optional[RateLimitRule] = None
+
+
+async def limit_websocket_bid(scope, user: str, plate_id: int) -> int:
+    """
+    Apply the POST /bids/ limits to a bid placed over a websocket, which the
+    middleware never sees. Returns the seconds until retry, 0 when allowed.
+    """
+    global _websocket_bid_rule
+    if not settings.RATE_LIMIT_ENABLED:
+        return 0
+    if _websocket_bid_rule is None:
+        _websocket_bid_rule = next(
+            rule for rule in default_rules() if rule.name == "bids"
+        )
+    rule = _websocket_bid_rule
+    keys = [
+        ("ip", client_ip(scope, dict(scope["headers"]))),
+        ("user", user),
+        ("plate", plate_id),
+    ]
+    return await hit_rule(
+        shared_limiter(), rule, [key for key in keys if key[0] in rule.limits]
+    )
+
+
+def token_subject(headers: Dict[bytes, bytes]) -> Optional[str]:
+    """
+    The `sub` claim of a valid bearer token. The signature is checked (an
+    HMAC, microseconds) so a forged token cannot spend another user's
+    budget.
+    """
+    authorization = headers.get(b"authorization", b"")
+    if not authorization.lower().startswith(b"bearer "):
+        return None
+    token = authorization[7:]
+    digest = _HMAC_DIGESTS.get(settings.ALGORITHM)
+    try:
+        if digest is None:
+            claims = jwt.decode(
+                token.decode(), settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
+            )
+        else:
+            signing_input, _, signature = token.rpartition(b".")
+            header, _, payload = signing_input.partition(b".")
+            if json.loads(_b64decode(header)).get("alg") != settings.ALGORITHM:
+                return None
+            expected = hmac.new(
+                settings.SECRET_KEY.encode(), signing_input, digest
+            ).digest()
+            if not hmac.compare_digest(expected, _b64decode(signature)):
+                return None
+            claims = json.loads(_b64decode(payload))
+            exp = claims.get("exp")
+            if isinstance(exp, (int, float)) and exp < time.time():
+                return None
+    except (JWTError, ValueError, AttributeError):
+        return None
+    subject = claims.get("sub")
+    return subject if isinstance(subject, str) else None
+
+
+def _b64decode(part: bytes) -> bytes:
+    return base64.urlsafe_b64decode(part + b"=" * (-len(part) % 4))
+
+
+class RateLimitMiddleware:
+    """
+    Rejects over-limit calls with 429 before routing, so no database query
+    or password hashing is done for them
+    """
+
+    def __init__(self, app, limiter=None, rules: Optional[List[RateLimitRule]] = None):
+        self.app = app
+        self.limiter = shared_limiter() if limiter is None else limiter
+        rules = default_rules() if rules is None else rules
+        self.rules = {(rule.method, rule.path): rule for rule in rules}
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        rule = self.rules.get((scope["method"], scope["path"]))
+        if rule is None:
+            return await self.app(scope, receive, send)
+
+        headers = dict(scope["headers"])
+        body = None
+        if rule.needs_body:
+            body, receive = await self._buffer_body(receive)
+
+        retry_after = await hit_rule(
+            self.limiter, rule, self._keys(rule, scope, headers, body)
+        )
+        if retry_after:
+            return await self._reject(send, retry_after)
+        await self.app(scope, receive, send)
+
+    def _keys(self, rule: RateLimitRule, scope, headers, body):
+        if "ip" in rule.limits:
+            yield "ip", client_ip(scope, headers)
+        if "user" in rule.limits:
+            if rule.user_field:
+                form = parse_qs(body.decode(errors="ignore")) if body else {}
+                user = form.get(rule.user_field, [None])[0]
+                if user:
+                    yield "user", user
+            else:
+                # Without a valid token the user limit applies per address
+                user = token_subject(headers)
+                yield "user", user or f"ip:{client_ip(scope, headers)}"
+        if "plate" in rule.limits and body:
+            for plate_id in self._plate_ids(body):
+                yield "plate", plate_id
+
+    @staticmethod
+    def _plate_ids(body: bytes) -> List:
+        """
+        plate_id of a bid body, or the distinct plate_ids of a batch of bids
+        """
+        try:
+            payload = json.loads(body)
+        except ValueError:
+            return []
+        items = payload if isinstance(payload, list) else [payload]
+        plate_ids = []
+        for item in items:
+            plate_id = item.get("plate_id") if isinstance(item, dict) else None
+            if plate_id is not None and plate_id not in plate_ids:
+                plate_ids.append(plate_id)
+        return plate_ids
+
+    @staticmethod
+    async def _buffer_body(receive):
+        """
+        Read the request body and return it with a receive callable that
+        replays it to the application
+        """
+        messages = []
+        body = b""
+        while True:
+            message = await receive()
+            messages.append(message)
+            if message["type"] != "http.request":
+                break
+            body += message.get("body", b"")
+            if not message.get("more_body") or len(body) > MAX_INSPECTED_BODY:
+                break
+
+        async def replay():
+            if messages:
+                return messages.pop(0)
+            return await receive()
+
+        return (body if len(body) <= MAX_INSPECTED_BODY else None), replay
+
+    @staticmethod
+    async def _reject(send, retry_after: int):
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 429,
+                "headers": [
+                    (b"content-type", b"application/json"),
+                    (b"retry-after", str(retry_after).encode()),
+                ],
+            }
+        )
+        await send(
+            {
+                "type": "http.response.body",
+                "body": b'{"detail":"Too many requests"}',
+            }
+        )
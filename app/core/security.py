@@ -1,5 +1,3 @@
-from sqlalchemy import select
-
 from fastapi import Depends, HTTPException, status, WebSocket
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
@@ -10,8 +8,10 @@ from pydantic import ValidationError, BaseModel
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import get_session
+from app.database import shared_session
+from app.dependencies import get_session
 from app.models.user import User
+from app.queries import user_by_id, user_by_username
 from app.schemas.token import TokenData
 from app.core.config import settings
 
@@ -41,7 +41,7 @@ def get_password_hash(password: str) -> str:
 async def authenticate_user(
     username: str, password: str, session: AsyncSession
 ) -> Union[User, None]:
-    user = await session.execute(select(User).where(User.username == username))
+    user = await session.execute(user_by_username, {"username": username})
     user = user.scalars().first()
     if not user:
         return None
@@ -85,7 +85,7 @@ async def get_current_user(
         raise credentials_exception
 
     user = await session.execute(
-        select(User).where(User.username == token_data.username)
+        user_by_username, {"username": token_data.username}
     )
     user = user.scalars().first()
     if user is None:
@@ -112,15 +112,17 @@ async def get_user_by_id(session: AsyncSession, user_id: int) -> Optional[User]:
     """
     Get a user by ID
     """
-    result = await session.execute(select(User).where(User.id == user_id))
+    result = await session.execute(user_by_id, {"user_id": user_id})
     return result.scalars().first()
 
 
 # Fix the WebSocket authentication function
-async def get_current_user_ws(
-    websocket: WebSocket,
-    session: AsyncSession = Depends(get_session),
-) -> Optional[User]:
+async def get_current_user_ws(websocket: WebSocket) -> Optional[User]:
+    """
+    Authenticate a websocket from its `token` query parameter. The lookup
+    uses a short-scoped session so nothing stays checked out for the
+    lifetime of the socket.
+    """
     try:
         token = websocket.query_params.get("token")
         if not token:
@@ -134,8 +136,11 @@ async def get_current_user_ws(
             return None
 
         # Get user by username instead of ID
-        result = await session.execute(select(User).where(User.username == username))
-        user = result.scalars().first()
+        async with shared_session() as session:
+            result = await session.execute(
+                user_by_username, {"username": username}
+            )
+            user = result.scalars().first()
 
         if not user:
             # Optional: Close connection for invalid users
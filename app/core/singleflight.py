@@ -0,0 +1,68 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+from app.core.config import settings
+
+
+class SingleFlight:
+    """
+    Collapses concurrent calls with the same key into one: the first caller
+    runs the function, the others wait for and share its result (or error).
+    Nothing is cached once the call completes. The function may outlive the
+    first caller, so it must not use anything that caller owns, such as its
+    request session.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.enabled = settings.SINGLE_FLIGHT_ENABLED
+        self._in_flight: Dict[Hashable, asyncio.Task] = {}
+        self.calls = 0
+        self.executions = 0
+
+    async def do(self, key: Hashable, func: Callable[..., Awaitable[Any]], *args) -> Any:
+        self.calls += 1
+        if not self.enabled:
+            self.executions += 1
+            return await func(*args)
+
+        task = self._in_flight.get(key)
+        if task is None:
+            self.executions += 1
+            # Run as a task so a cancelled first caller does not fail the rest
+            task = asyncio.ensure_future(func(*args))
+            self._in_flight[key] = task
+            task.add_done_callback(lambda done: self._finished(key, done))
+        return await asyncio.shield(task)
+
+    def forget(self, key: Hashable) -> None:
+        """
+        Let callers after a write start a fresh call instead of joining one
+        that may have read the old state
+        """
+        self._in_flight.pop(key, None)
+
+    def _finished(self, key: Hashable, task: asyncio.Task) -> None:
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+        if not task.cancelled():
+            # Mark the exception retrieved when nobody is left waiting
+            task.exception()
+
+    def stats(self) -> dict:
+        shared = self.calls - self.executions
+        return {
+            "calls": self.calls,
+            "executions": self.executions,
+            "shared": shared,
+            "coalescing_ratio": round(shared / self.calls, 4) if self.calls else 0.0,
+            "in_flight": len(self._in_flight),
+        }
+
+
+plate_reads = SingleFlight("plate")
+highest_bid_reads = SingleFlight("highest_bid")
+
+
+def single_flight_stats() -> Dict[str, dict]:
+    return {flight.name: flight.stats() for flight in (plate_reads, highest_bid_reads)}
@@ -0,0 +1,60 @@
+import time
+from typing import Dict, List
+
+
+class SlidingWindowCounter:
+    """
+    Counts events over the last `window` seconds using one bucket per second,
+    so memory and read cost stay fixed no matter how many events arrive
+    """
+
+    def __init__(self, window: int = 60):
+        self.window = window
+        self._counts: List[int] = [0] * window
+        self._seconds: List[int] = [0] * window
+
+    def add(self, now: float = None) -> None:
+        second = int(time.time() if now is None else now)
+        index = second % self.window
+        if self._seconds[index] != second:
+            # The bucket belongs to an older window, reuse it
+            self._seconds[index] = second
+            self._counts[index] = 0
+        self._counts[index] += 1
+
+    def count(self, now: float = None) -> int:
+        second = int(time.time() if now is None else now)
+        oldest = second - self.window
+        return sum(
+            count
+            for count, stamp in zip(self._counts, self._seconds)
+            if stamp > oldest
+        )
+
+
+class BidRateTracker:
+    """
+    In-memory per-plate bid velocity ("bids in the last minute")
+    """
+
+    def __init__(self, window: int = 60):
+        self.window = window
+        self._counters: Dict[int, SlidingWindowCounter] = {}
+
+    def record(self, plate_id: int) -> None:
+        counter = self._counters.get(plate_id)
+        if counter is None:
+            counter = self._counters[plate_id] = SlidingWindowCounter(self.window)
+        counter.add()
+
+    def rate(self, plate_id: int) -> int:
+        counter = self._counters.get(plate_id)
+        if counter is None:
+            return 0
+        return counter.count()
+
+    def discard(self, plate_id: int) -> None:
+        self._counters.pop(plate_id, None)
+
+
+bid_rates = BidRateTracker()
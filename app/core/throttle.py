@@ -0,0 +1,76 @@
+import asyncio
+import time
+from typing import Callable, Dict, Hashable, Tuple
+
+from app.core.config import settings
+
+
+class TokenBucket:
+    """
+    Allows `rate` events per second on average with bursts up to `capacity`
+    """
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+
+    def consume(self, tokens: int = 1) -> bool:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens < tokens:
+            return False
+        self.tokens -= tokens
+        return True
+
+
+class TaskCoalescer:
+    """
+    Runs a call at most once per key per `window` seconds. The first call in a
+    quiet period runs immediately; calls arriving inside the window are folded
+    into one trailing call that runs with the latest arguments.
+    """
+
+    def __init__(self, window: float):
+        self.window = window
+        self._last_run: Dict[Hashable, float] = {}
+        self._pending: Dict[Hashable, Tuple[Callable, tuple]] = {}
+
+    def submit(self, key: Hashable, func: Callable, *args) -> bool:
+        """
+        Run or schedule `func(*args)`, returns True when it ran immediately
+        """
+        if key in self._pending:
+            self._pending[key] = (func, args)
+            return False
+
+        now = time.monotonic()
+        last_run = self._last_run.get(key)
+        if last_run is None or now - last_run >= self.window:
+            self._run(key, func, args, now)
+            return True
+
+        self._pending[key] = (func, args)
+        asyncio.get_running_loop().call_later(
+            self.window - (now - last_run), self._flush, key
+        )
+        return False
+
+    def _flush(self, key: Hashable) -> None:
+        func, args = self._pending.pop(key)
+        self._run(key, func, args, time.monotonic())
+
+    def _run(self, key: Hashable, func: Callable, args: tuple, now: float) -> None:
+        if len(self._last_run) > 10_000:
+            # Forget keys that are quiet again so the map stays small
+            self._last_run = {
+                k: t for k, t in self._last_run.items() if now - t < self.window
+            }
+        self._last_run[key] = now
+        func(*args)
+
+
+# At most one bid notification task per (user, plate) per window
+notification_coalescer = TaskCoalescer(settings.NOTIFICATION_COALESCE_SECONDS)
@@ -0,0 +1,79 @@
+import asyncio
+import os
+import threading
+from typing import Coroutine, List, Optional, TypeVar
+
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.database import engine, read_engine
+from app.sharding import bid_shards
+
+T = TypeVar("T")
+
+
+def worker_engines() -> List[AsyncEngine]:
+    engines = [engine] + ([read_engine] if read_engine is not engine else [])
+    return engines + bid_shards.engines
+
+
+class WorkerLoop:
+    """
+    One long-lived event loop per worker process, running in a background
+    thread, that Celery tasks submit their coroutines to. Pooled database
+    connections are bound to the loop that opened them, so tasks must not
+    each spin up their own loop with asyncio.run().
+    """
+
+    def __init__(self):
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._pid: Optional[int] = None
+        self._lock = threading.Lock()
+
+    def start(self) -> None:
+        """
+        Start the loop for this process. After a fork the parent's loop
+        thread does not exist here and inherited pool connections belong
+        to the parent, so both are dropped and recreated.
+        """
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            for worker_engine in worker_engines():
+                worker_engine.sync_engine.dispose(close=False)
+            self._loop = asyncio.new_event_loop()
+            self._thread = threading.Thread(
+                target=self._loop.run_forever, name="worker-loop", daemon=True
+            )
+            self._thread.start()
+            self._pid = os.getpid()
+
+    def run(self, coro: Coroutine[None, None, T]) -> T:
+        """
+        Run `coro` on the worker loop and block until it finishes
+        """
+        if self._pid != os.getpid():
+            # Eager mode and the solo pool never send worker_process_init
+            self.start()
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result()
+
+    def stop(self) -> None:
+        """
+        Close pooled connections on the loop that opened them, then stop it
+        """
+        with self._lock:
+            if self._pid != os.getpid():
+                return
+
+            async def dispose():
+                for worker_engine in worker_engines():
+                    await worker_engine.dispose()
+
+            asyncio.run_coroutine_threadsafe(dispose(), self._loop).result()
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join()
+            self._loop.close()
+            self._loop = self._thread = self._pid = None
+
+
+worker_loop = WorkerLoop()
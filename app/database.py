@@ -1,29 +1,124 @@
+import asyncio
 import os
-from typing import AsyncGenerator
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncGenerator, Dict, Optional
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
-from sqlalchemy.orm import declarative_base
+from sqlalchemy.orm import Session, declarative_base
+
+from app.core.config import settings
 
 # Get database URL from environment variable
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite+aiosqlite:///./auto_plate_bidding.db")
 
-engine = create_async_engine(
-    DATABASE_URL,
-    echo=True,
-)
+
+def engine_options(url: str) -> dict:
+    """
+    create_async_engine() arguments shared by the primary, the replica and
+    the bid shards
+    """
+    # echo=True would attach its own synchronous stdout handler; statements
+    # are logged through the queue instead when DATABASE_ECHO is set
+    options = {"echo": False, "query_cache_size": settings.DATABASE_QUERY_CACHE_SIZE}
+    if make_url(url).get_driver_name() == "asyncpg":
+        # Each connection prepares a statement once per SQL text and then
+        # only sends parameters
+        options["connect_args"] = {
+            "prepared_statement_cache_size": (
+                settings.DATABASE_PREPARED_STATEMENT_CACHE_SIZE
+            )
+        }
+    return options
+
+
+engine = create_async_engine(DATABASE_URL, **engine_options(DATABASE_URL))
+
+
+class PrimarySession(Session):
+    """
+    Session bound to the primary, marks its caller for read-your-writes
+    once it commits a write
+    """
+
+
+@event.listens_for(PrimarySession, "after_flush")
+def _flag_write(session, flush_context):
+    session.info["wrote"] = True
+
+
+@event.listens_for(PrimarySession, "after_commit")
+def _pin_writer(session):
+    if session.info.pop("wrote", False) and session.info.get("caller"):
+        read_your_writes.pin(session.info["caller"])
+
 
 async_session_factory = async_sessionmaker(
     engine,
     expire_on_commit=False,
     class_=AsyncSession,
+    sync_session_class=PrimarySession,
+)
+
+# Reads that tolerate replication lag go to the replica when one is
+# configured, otherwise to the primary
+read_engine = (
+    create_async_engine(
+        settings.DATABASE_READ_URL, **engine_options(settings.DATABASE_READ_URL)
+    )
+    if settings.DATABASE_READ_URL
+    else engine
 )
 
+read_session_factory = async_sessionmaker(
+    read_engine,
+    expire_on_commit=False,
+    class_=AsyncSession,
+)
+
+
+class ReadYourWrites:
+    """
+    Callers that wrote within the last `window` seconds, whose reads are
+    routed to the primary until the replica has caught up. Per worker.
+    """
+
+    def __init__(self, window: float):
+        self.window = window
+        self._pinned: Dict[str, float] = {}
+
+    def pin(self, caller: str) -> None:
+        now = time.monotonic()
+        if len(self._pinned) > 10_000:
+            self._pinned = {k: t for k, t in self._pinned.items() if t > now}
+        self._pinned[caller] = now + self.window
+
+    def is_pinned(self, caller: Optional[str]) -> bool:
+        expires = self._pinned.get(caller) if caller else None
+        return expires is not None and expires > time.monotonic()
+
+
+read_your_writes = ReadYourWrites(settings.READ_YOUR_WRITES_SECONDS)
+
 # Create a Base class with metadata
 Base = declarative_base()
 
 
-async def get_session() -> AsyncGenerator[AsyncSession, None]:
-    async with async_session_factory() as session:
-        try:
+# Long-lived connections (websockets, event streams) borrow sessions through
+# this semaphore so that however many are open, they never hold more than a
+# fixed share of the pool
+shared_session_slots = asyncio.Semaphore(settings.WS_DB_CONCURRENCY)
+
+
+@asynccontextmanager
+async def shared_session(readonly: bool = False) -> AsyncGenerator[AsyncSession, None]:
+    """
+    Short-scoped session for long-lived connection handlers, bounded by
+    WS_DB_CONCURRENCY and closed as soon as the block exits. `readonly`
+    sessions use the replica.
+    """
+    factory = read_session_factory if readonly else async_session_factory
+    async with shared_session_slots:
+        async with factory() as session:
             yield session
-        finally:
-            await session.close()
@@ -0,0 +1,59 @@
+import hashlib
+from typing import AsyncGenerator, Optional
+
+from fastapi import Depends
+from fastapi.requests import HTTPConnection
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# Kept apart from app.database so that Celery workers and the CLI, which
+# only need engines and sessions, never import FastAPI
+from app.database import (
+    async_session_factory,
+    engine,
+    read_engine,
+    read_session_factory,
+    read_your_writes,
+)
+
+
+def caller_key(connection: HTTPConnection) -> Optional[str]:
+    """
+    Identify the caller by its credentials, without a database lookup
+    """
+    authorization = connection.headers.get("authorization")
+    if not authorization:
+        return None
+    return hashlib.sha256(authorization.encode()).hexdigest()
+
+
+async def get_session(
+    connection: HTTPConnection,
+) -> AsyncGenerator[AsyncSession, None]:
+    async with async_session_factory() as session:
+        session.info["caller"] = caller_key(connection)
+        try:
+            yield session
+        finally:
+            await session.close()
+
+
+async def get_read_session(
+    connection: HTTPConnection,
+    primary: AsyncSession = Depends(get_session),
+) -> AsyncGenerator[AsyncSession, None]:
+    """
+    Session for GET routes: the replica, or the primary for callers that
+    wrote within READ_YOUR_WRITES_SECONDS
+    """
+    if read_engine is engine or read_your_writes.is_pinned(caller_key(connection)):
+        # Reuse the request's primary session (e.g. the one that loaded the
+        # current user) rather than holding a second pooled connection.
+        # Pinned sessions must not share results with replica readers.
+        primary.info["pinned"] = read_engine is not engine
+        yield primary
+        return
+    async with read_session_factory() as session:
+        try:
+            yield session
+        finally:
+            await session.close()
@@ -1,13 +1,15 @@
 from sqlalchemy import (
+    BigInteger,
     Column,
     Integer,
     ForeignKey,
     DateTime,
-    Float,
+    Index,
     UniqueConstraint,
     Boolean,
 )
 from sqlalchemy.orm import relationship
+from app.core.money import MoneyType
 from app.database import Base
 from datetime import datetime
 
@@ -15,8 +17,11 @@ from datetime import datetime
 class Bid(Base):
     __tablename__ = "bids"
 
-    id = Column(Integer, primary_key=True, index=True)
-    amount = Column(Float(precision=2))
+    # 64-bit: shards allocate ids from [shard << 40, (shard + 1) << 40)
+    id = Column(
+        BigInteger().with_variant(Integer, "sqlite"), primary_key=True, index=True
+    )
+    amount = Column(MoneyType)
     user_id = Column(Integer, ForeignKey("users.id"))
     plate_id = Column(Integer, ForeignKey("auto_plates.id"))
     created_at = Column(DateTime, default=datetime.now)
@@ -24,7 +29,11 @@ class Bid(Base):
     user = relationship("User", back_populates="bids")
     plate = relationship("AutoPlate", back_populates="bids")
 
-    __table_args__ = (UniqueConstraint("user_id", "plate_id", name="uq_user_plate"),)
+    __table_args__ = (
+        UniqueConstraint("user_id", "plate_id", name="uq_user_plate"),
+        # Top of book: highest bid per plate
+        Index("ix_bids_plate_id_amount", "plate_id", "amount"),
+    )
 
     def __repr__(self):
         return f"<Bid {self.id}>"
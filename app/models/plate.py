@@ -1,14 +1,16 @@
 from sqlalchemy import (
     Column,
+    BigInteger,
     Integer,
     String,
     ForeignKey,
     DateTime,
+    Index,
     Text,
     Boolean,
-    Float,
 )
 from sqlalchemy.orm import relationship
+from app.core.money import MoneyType
 from app.database import Base
 from datetime import datetime
 
@@ -19,16 +21,37 @@ class AutoPlate(Base):
     id = Column(Integer, primary_key=True, index=True)
     plate_number = Column(String(10), unique=True, index=True)
     description = Column(Text)
-    price = Column(Float(precision=2))
+    price = Column(MoneyType)
+    # Price set by staff, restored once every bid is withdrawn. Unknown
+    # (NULL) for plates that had bids before it was recorded
+    start_price = Column(MoneyType, nullable=True)
+    # Bid rules, see app.core.bid_rules
+    reserve_price = Column(MoneyType, nullable=True)
+    max_bid = Column(MoneyType, nullable=True)
+    increment_tiers = Column(String(200), nullable=True)
     deadline = Column(DateTime)
     created_by_id = Column(Integer, ForeignKey("users.id"))
     is_active = Column(Boolean, default=True)
+    # Maintained incrementally by BidController, corrected by reconcile_plate_stats:
+    # bid_count counts every bid ever placed, raises included, and is never
+    # lowered; bidder_count counts the standing bids, one per bidder
+    bid_count = Column(Integer, default=0, server_default="0", nullable=False)
+    bidder_count = Column(Integer, default=0, server_default="0", nullable=False)
+    # The winning bid, which ties at the price cannot tell. No foreign key,
+    # the bid may live on a shard. NULL for plates settled before it was
+    # recorded
+    leading_bid_id = Column(BigInteger, nullable=True)
     created_at = Column(DateTime, default=datetime.now)
     updated_at = Column(DateTime, default=datetime.now, onupdate=datetime.now)
 
     created_by = relationship("User", back_populates="plates_created")
     bids = relationship("Bid", back_populates="plate", cascade="all, delete")
 
+    __table_args__ = (
+        # Plates open for bidding, in deadline order
+        Index("ix_auto_plates_is_active_deadline", "is_active", "deadline"),
+    )
+
     def __repr__(self):
         return f"<AutoPlate {self.plate_number}>"
 
@@ -0,0 +1,38 @@
+from sqlalchemy import (
+    Column,
+    Integer,
+    ForeignKey,
+    DateTime,
+    UniqueConstraint,
+    Boolean,
+)
+from app.core.money import MoneyType
+from app.database import Base
+from datetime import datetime
+
+
+class ProxyBid(Base):
+    """
+    "Bid up to max_amount for me": BidController bids on the user's behalf
+    whenever someone outbids them, until max_amount is reached
+    """
+
+    __tablename__ = "proxy_bids"
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"))
+    plate_id = Column(
+        Integer, ForeignKey("auto_plates.id", ondelete="CASCADE"), index=True
+    )
+    max_amount = Column(MoneyType, nullable=False)
+    # Cleared once outbid beyond max_amount, or withdrawn
+    is_active = Column(Boolean, default=True)
+    created_at = Column(DateTime, default=datetime.now)
+    updated_at = Column(DateTime, default=datetime.now, onupdate=datetime.now)
+
+    __table_args__ = (
+        UniqueConstraint("user_id", "plate_id", name="uq_proxy_user_plate"),
+    )
+
+    def __repr__(self):
+        return f"<ProxyBid {self.id}>"
@@ -40,6 +40,3 @@ class User(Base):
             "email": self.email,
             "is_staff": self.is_staff,
         }
-
-    def get_active_bids(self):
-        return [bid for bid in self.bids if bid.plate.is_bidding_active()]
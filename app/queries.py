@@ -0,0 +1,136 @@
+from sqlalchemy import bindparam, case, func, or_, select
+from sqlalchemy.orm import aliased
+
+from app.models.bid import Bid
+from app.models.plate import AutoPlate
+from app.models.proxy_bid import ProxyBid
+from app.models.user import User
+
+# Statements run on every request or bid, built once at import. Each takes
+# its values as bound parameters, e.g.
+# `session.execute(user_by_username, {"username": name})`, so a request
+# neither rebuilds the construct nor recomputes its cache key: the statement
+# memoizes the key and the engine keeps its compiled SQL. On asyncpg the SQL
+# is also prepared once per connection, see engine_options().
+
+# Users
+
+user_by_username = select(User).where(User.username == bindparam("username"))
+user_by_email = select(User).where(User.email == bindparam("email"))
+user_by_id = select(User).where(User.id == bindparam("user_id"))
+
+# Plates
+
+plates_by_ids = select(AutoPlate).where(
+    AutoPlate.id.in_(bindparam("plate_ids", expanding=True))
+)
+active_plates_by_ids = plates_by_ids.where(AutoPlate.is_active.is_(True))
+# Locked in id order, so two batches wait on each other instead of deadlocking
+locked_plates_by_ids = plates_by_ids.order_by(AutoPlate.id).with_for_update()
+plates_page = select(AutoPlate).offset(bindparam("skip")).limit(bindparam("limit"))
+# Open plates as listed in a user's active bids
+open_plate_rows = select(
+    AutoPlate.id,
+    AutoPlate.plate_number,
+    AutoPlate.price,
+    AutoPlate.deadline,
+    AutoPlate.bidder_count,
+    AutoPlate.leading_bid_id,
+).where(
+    AutoPlate.id.in_(bindparam("plate_ids", expanding=True)),
+    AutoPlate.is_active.is_(True),
+    AutoPlate.deadline > bindparam("now"),
+)
+
+# Bids
+
+bids_by_plate = select(Bid).where(Bid.plate_id == bindparam("plate_id"))
+bids_by_user = select(Bid).where(Bid.user_id == bindparam("user_id")).order_by(Bid.id)
+highest_bid = (
+    select(Bid)
+    .where(Bid.plate_id == bindparam("plate_id"))
+    # Equal bids: the earlier one stands
+    .order_by(Bid.amount.desc(), Bid.id)
+    .limit(1)
+)
+_ranked = (
+    select(
+        Bid,
+        func.row_number()
+        .over(partition_by=Bid.plate_id, order_by=(Bid.amount.desc(), Bid.id))
+        .label("rank"),
+    )
+    .where(Bid.plate_id.in_(bindparam("plate_ids", expanding=True)))
+    .subquery()
+)
+# The highest bid of each of `plate_ids`
+highest_bids = select(aliased(Bid, _ranked)).where(_ranked.c.rank == 1)
+# Bids a new bid on a plate competes with: those of `user_ids`, the
+# bidder and the proxies in play, and the leader's, which is at the price
+bids_in_play = (
+    select(Bid)
+    .where(
+        Bid.plate_id == bindparam("plate_id"),
+        or_(
+            Bid.user_id.in_(bindparam("user_ids", expanding=True)),
+            Bid.amount == bindparam("price"),
+        ),
+    )
+    .order_by(Bid.id)
+)
+# A user's open-plate bids, marked leading or outbid
+active_bids = (
+    select(
+        Bid.id,
+        Bid.plate_id,
+        AutoPlate.plate_number,
+        Bid.amount,
+        AutoPlate.price,
+        AutoPlate.deadline,
+        # As BidController._leads: the recorded winning bid, or the bid at
+        # the price on plates settled before it was recorded
+        case(
+            (
+                AutoPlate.leading_bid_id.is_not(None),
+                case((Bid.id == AutoPlate.leading_bid_id, "leading"), else_="outbid"),
+            ),
+            (Bid.amount >= AutoPlate.price, "leading"),
+            else_="outbid",
+        ).label("status"),
+        Bid.created_at,
+    )
+    .join(AutoPlate, AutoPlate.id == Bid.plate_id)
+    .where(
+        Bid.user_id == bindparam("user_id"),
+        AutoPlate.is_active.is_(True),
+        AutoPlate.deadline > bindparam("now"),
+    )
+    .order_by(AutoPlate.deadline, Bid.plate_id)
+)
+# The same from a bid shard, where plates are not
+active_bid_rows = select(Bid.id, Bid.plate_id, Bid.amount, Bid.created_at).where(
+    Bid.user_id == bindparam("user_id")
+)
+
+# Proxy bids
+
+# Proxies still able to reach `minimum` on a plate, oldest first
+proxies_in_play = (
+    select(ProxyBid)
+    .where(
+        ProxyBid.plate_id == bindparam("plate_id"),
+        ProxyBid.is_active.is_(True),
+        ProxyBid.max_amount >= bindparam("minimum"),
+    )
+    .order_by(ProxyBid.id)
+)
+user_proxy = select(ProxyBid).where(
+    ProxyBid.user_id == bindparam("user_id"),
+    ProxyBid.plate_id == bindparam("plate_id"),
+)
+active_user_proxy = user_proxy.where(ProxyBid.is_active.is_(True))
+proxy_bids_by_user = (
+    select(ProxyBid)
+    .where(ProxyBid.user_id == bindparam("user_id"))
+    .order_by(ProxyBid.id)
+)
@@ -1,12 +1,14 @@
-from typing import Optional, Any
+from typing import Any, List, Literal, Optional
 from pydantic import BaseModel, Field
 from datetime import datetime
 
+from app.core.money import Money
+
 
 class BidBase(BaseModel):
     """Base schema with common bid attributes"""
 
-    amount: float = Field(..., description="Amount of the bid", gt=0)
+    amount: Money = Field(..., description="Amount of the bid", gt=0)
     is_active: bool = Field(True, description="Whether the bid is currently active")
 
 
@@ -17,7 +19,7 @@ class BidCreate(BidBase):
 class BidUpdate(BaseModel):
     """Schema for updating bid information"""
 
-    amount: Optional[float] = Field(None, description="Amount of the bid", gt=0)
+    amount: Optional[Money] = Field(None, description="Amount of the bid", gt=0)
 
 
 class BidInDBBase(BidBase):
@@ -48,3 +50,52 @@ class BidWithDetails(Bid):
 
     plate: Any
     user: Any
+
+
+class ActiveBid(BaseModel):
+    """Schema for one of the user's bids on a plate still open for bidding"""
+
+    id: int
+    plate_id: int
+    plate_number: str
+    amount: Money = Field(..., description="The user's bid")
+    price: Money = Field(..., description="Current highest bid on the plate")
+    deadline: datetime
+    status: Literal["leading", "outbid"]
+    created_at: datetime
+
+
+class BidBatchResult(BaseModel):
+    """Schema for the outcome of one bid of a batch, in request order"""
+
+    plate_id: int
+    status: Literal["placed", "rejected"]
+    bid: Optional[Bid] = Field(None, description="The user's bid once placed")
+    errors: Optional[List[Any]] = Field(
+        None, description="Why the bid was rejected, as for POST /bids/"
+    )
+
+
+class ProxyBidCreate(BaseModel):
+    """Schema for registering a proxy bid ("bid up to max_amount for me")"""
+
+    plate_id: int
+    max_amount: Money = Field(
+        ..., description="Highest amount to bid on the user's behalf", gt=0
+    )
+
+
+class ProxyBid(BaseModel):
+    """Schema for a user's proxy bid on a plate"""
+
+    id: int
+    plate_id: int
+    max_amount: Money
+    is_active: bool = Field(
+        ..., description="False once outbid beyond max_amount or withdrawn"
+    )
+    created_at: datetime
+    updated_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
@@ -1,31 +1,57 @@
 from typing import Optional, List, Any
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator
 from datetime import datetime
 
+from app.core.bid_rules import parse_tiers
+from app.core.money import Money
+
 
 class PlateBase(BaseModel):
     """Base schema with common plate attributes"""
 
     description: Optional[str] = Field(None, description="Description of the plate")
-    price: float = Field(..., description="Price of the plate", gt=0)
+    price: Money = Field(..., description="Price of the plate", gt=0)
     is_active: bool = Field(
         True, description="Whether the plate is currently available"
     )
 
 
-class PlateCreate(PlateBase):
+class PlateRules(BaseModel):
+    """Bid rules of a plate"""
+
+    reserve_price: Optional[Money] = Field(
+        None, description="Lowest bid the plate sells for, never disclosed", gt=0
+    )
+    max_bid: Optional[Money] = Field(
+        None, description="Highest bid accepted for the plate", gt=0
+    )
+    increment_tiers: Optional[str] = Field(
+        None,
+        description='Minimum increment by price tier, "<from price>:<increment>,..."',
+        examples=["0:1,1000:10,10000:100"],
+    )
+
+    @field_validator("increment_tiers")
+    @classmethod
+    def validate_increment_tiers(cls, v: Optional[str]) -> Optional[str]:
+        if v is not None:
+            parse_tiers(v)
+        return v
+
+
+class PlateCreate(PlateRules, PlateBase):
     """Schema for creating a new plate"""
 
     plate_number: str
     deadline: datetime
 
 
-class PlateUpdate(BaseModel):
+class PlateUpdate(PlateRules):
     """Schema for updating plate information"""
 
     name: Optional[str] = Field(None, description="Name of the plate")
     description: Optional[str] = Field(None, description="Description of the plate")
-    price: Optional[float] = Field(None, description="Price of the plate", gt=0)
+    price: Optional[Money] = Field(None, description="Price of the plate", gt=0)
     is_active: Optional[bool] = Field(
         None, description="Whether the plate is currently available"
     )
@@ -46,6 +72,49 @@ class Plate(PlateInDBBase):
     """Schema for public plate data (returned to clients)"""
 
     plate_number: str
+    max_bid: Optional[Money] = None
+    increment_tiers: Optional[str] = None
+    bid_count: int = Field(0, description="Number of bids placed on the plate")
+    bidder_count: int = Field(0, description="Number of distinct bidders")
+
+
+class HotPlate(Plate):
+    """Schema for a plate on the hot auctions leaderboard"""
+
+    score: float = Field(
+        ..., description="Decayed bid activity or current price, depending on `by`"
+    )
+
+
+class PlateStats(BaseModel):
+    """Schema for live bidding statistics of a plate"""
+
+    plate_id: int
+    price: Money
+    bid_count: int
+    bidder_count: int
+    bids_last_minute: int = Field(
+        ..., description="Bids placed on this plate during the last 60 seconds"
+    )
+
+
+class PlateImportError(BaseModel):
+    """Schema for a row rejected by a bulk import"""
+
+    line: int
+    error: str
+
+
+class PlateImportResult(BaseModel):
+    """Schema for the outcome of a bulk plate import"""
+
+    imported: int
+    failed: int
+    errors: List[PlateImportError] = Field(
+        ..., description="First rejected rows, up to IMPORT_MAX_ERRORS"
+    )
+    seconds: float
+    rows_per_second: float
 
 
 class PlateInDB(PlateInDBBase):
@@ -0,0 +1,52 @@
+from typing import Dict, List, Optional
+from pydantic import BaseModel, Field
+
+
+class ProfilingUpdate(BaseModel):
+    """Schema for switching request profiling on or off"""
+
+    enabled: bool
+    sample_rate: Optional[float] = Field(
+        None, ge=0, le=1, description="Share of requests profiled by the sampler"
+    )
+    interval_ms: Optional[float] = Field(
+        None, gt=0, le=1000, description="Sampler period in CPU milliseconds"
+    )
+
+
+class ProfilingStatus(BaseModel):
+    """Schema for the profiler state of the worker that answered"""
+
+    enabled: bool
+    sample_rate: float
+    interval_ms: float
+    sampler_available: bool
+    routes: Dict[str, int] = Field(..., description="Samples collected per route")
+    requests: int = Field(..., description="Profiled requests kept")
+    token: Optional[str] = Field(
+        None, description="X-Profile header value that runs a request under cProfile"
+    )
+
+
+class ProfiledStatement(BaseModel):
+    """Schema for one SQL statement of a profiled request"""
+
+    sql: str
+    ms: float
+
+
+class ProfiledRequest(BaseModel):
+    """Schema for a profiled request"""
+
+    method: str
+    path: str
+    route: Optional[str] = None
+    mode: str
+    status: Optional[int] = None
+    started: float
+    duration_ms: float
+    samples: int
+    sql_ms: float
+    statements: List[ProfiledStatement]
+    dropped_statements: int
+    cprofile: Optional[str] = Field(None, description="cProfile report, slowest first")
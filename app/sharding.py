@@ -0,0 +1,119 @@
+import asyncio
+from contextlib import asynccontextmanager
+from typing import AsyncGenerator, Awaitable, Callable, Dict, Iterable, List, TypeVar
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.core.config import settings
+from app.database import engine_options
+
+T = TypeVar("T")
+
+# Each shard allocates bid ids from its own range [shard << 40, (shard + 1) << 40),
+# so a bid id alone tells which shard holds it
+SHARD_ID_BITS = 40
+
+
+class BidShards:
+    """
+    Bids partitioned by plate_id over BID_SHARD_URLS (plate_id % shard
+    count). Users, plates and everything else stay on the primary. With no
+    URLs configured bids stay on the primary too and callers keep using
+    their own session.
+    """
+
+    def __init__(self, urls: Iterable[str]):
+        self.urls = [url.strip() for url in urls if url.strip()]
+        self.engines = [
+            create_async_engine(url, **engine_options(url)) for url in self.urls
+        ]
+        self.factories = [
+            async_sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
+            for engine in self.engines
+        ]
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.urls)
+
+    @property
+    def count(self) -> int:
+        return len(self.urls)
+
+    def for_plate(self, plate_id: int) -> int:
+        return plate_id % self.count
+
+    def for_bid(self, bid_id: int) -> int:
+        return bid_id >> SHARD_ID_BITS
+
+    def group_by_shard(self, plate_ids: Iterable[int]) -> Dict[int, List[int]]:
+        groups: Dict[int, List[int]] = {}
+        for plate_id in plate_ids:
+            groups.setdefault(self.for_plate(plate_id), []).append(plate_id)
+        return groups
+
+    @asynccontextmanager
+    async def session(self, shard: int) -> AsyncGenerator[AsyncSession, None]:
+        async with self.factories[shard]() as session:
+            yield session
+
+    async def gather(
+        self, shards: Iterable[int], func: Callable[[int, AsyncSession], Awaitable[T]]
+    ) -> List[T]:
+        """
+        Run `func(shard, session)` on the given shards concurrently, each
+        with its own session
+        """
+
+        async def run(shard: int) -> T:
+            async with self.session(shard) as session:
+                return await func(shard, session)
+
+        return await asyncio.gather(*(run(shard) for shard in shards))
+
+
+bid_shards = BidShards(settings.BID_SHARD_URLS.split(","))
+
+
+@asynccontextmanager
+async def bid_session_for_plate(
+    plate_id: int, session: AsyncSession
+) -> AsyncGenerator[AsyncSession, None]:
+    """
+    Session holding the bids of a plate: `session` itself when unsharded
+    """
+    if not bid_shards.enabled:
+        yield session
+        return
+    async with bid_shards.session(bid_shards.for_plate(plate_id)) as shard_session:
+        yield shard_session
+
+
+@asynccontextmanager
+async def bid_session_for_bid(
+    bid_id: int, session: AsyncSession
+) -> AsyncGenerator[AsyncSession, None]:
+    """
+    Session holding a bid, by the shard encoded in its id. Unknown shards
+    get an empty session so lookups simply find nothing.
+    """
+    if not bid_shards.enabled:
+        yield session
+        return
+    shard = min(bid_shards.for_bid(bid_id), bid_shards.count - 1)
+    async with bid_shards.session(shard) as shard_session:
+        yield shard_session
+
+
+async def scatter_bids(
+    session: AsyncSession, func: Callable[[AsyncSession], Awaitable[T]]
+) -> List[T]:
+    """
+    Run `func(session)` against every place bids live and return the
+    results: `session` when unsharded, all shards concurrently otherwise
+    """
+    if not bid_shards.enabled:
+        return [await func(session)]
+    return await bid_shards.gather(
+        range(bid_shards.count), lambda shard, shard_session: func(shard_session)
+    )
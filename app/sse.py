@@ -0,0 +1,49 @@
+import asyncio
+import json
+from typing import AsyncGenerator, List, Optional
+
+from app.core.config import settings
+
+
+def sse_message(event: dict) -> str:
+    """
+    Format a broadcast event as a Server-Sent Events message
+    """
+    return (
+        f"id: {event['seq']}\n"
+        f"event: {event['type']}\n"
+        f"data: {json.dumps(event, default=str)}\n\n"
+    )
+
+
+async def plate_event_stream(
+    plate_id: int,
+    queue: asyncio.Queue,
+    initial: List[dict],
+    heartbeat: Optional[float] = None,
+) -> AsyncGenerator[str, None]:
+    """
+    Stream the initial events, then everything broadcast to the plate,
+    with comment heartbeats so proxies keep idle streams open
+    """
+    from app.websocket import manager
+
+    heartbeat = heartbeat or settings.SSE_HEARTBEAT_SECONDS
+    try:
+        # Tell EventSource clients how long to wait before reconnecting
+        yield "retry: 3000\n\n"
+        for event in initial:
+            yield sse_message(event)
+        while True:
+            try:
+                event = await asyncio.wait_for(queue.get(), timeout=heartbeat)
+            except asyncio.TimeoutError:
+                yield ": heartbeat\n\n"
+                continue
+            if event is None:
+                # Fell behind, end the stream so the client resumes with
+                # Last-Event-ID or gets a fresh snapshot
+                return
+            yield sse_message(event)
+    finally:
+        manager.remove_listener(plate_id, queue)
@@ -2,6 +2,7 @@
 from sqlalchemy import select
 
 from app.core.celery_app import celery_app
+from app.core.worker_loop import worker_loop
 from app.database import async_session_factory
 from app.models.user import User
 from app.models.plate import AutoPlate
@@ -17,14 +18,11 @@ def send_bid_notification(plate_id: int, user_id: int, amount: float):
     Note: Celery tasks should be synchronous, so we handle the async operations differently
     """
     try:
-        import asyncio
-        from sqlalchemy import select
+        # Run the async notification logic on the worker's event loop
+        return worker_loop.run(_send_notification_async(plate_id, user_id, amount))
 
-        # Run the async notification logic in a new event loop
-        return asyncio.run(_send_notification_async(plate_id, user_id, amount))
-
-    except Exception as e:
-        logger.error(f"Error sending bid notification: {str(e)}")
+    except Exception:
+        logger.exception("Error sending bid notification")
         return False
 
 
@@ -43,7 +41,10 @@ async def _send_notification_async(plate_id: int, user_id: int, amount: float) -
             user = user_result.scalar_one_or_none()
 
             if not plate or not user:
-                logger.error(f"Could not find plate (id={plate_id}) or user (id={user_id})")
+                logger.error(
+                    "Could not find plate or user",
+                    extra={"plate_id": plate_id, "user_id": user_id},
+                )
                 return False
 
             # Here you would implement actual notification logic
@@ -57,7 +58,7 @@ async def _send_notification_async(plate_id: int, user_id: int, amount: float) -
                 "plate_id": plate_id
             }
 
-            logger.info(f"Notification sent: {notification_content}")
+            logger.info("Notification sent", extra={"notification": notification_content})
             # Here you would send through your notification service
             # e.g., I want to send a push notification to the user using Websocket
 
@@ -65,6 +66,6 @@ async def _send_notification_async(plate_id: int, user_id: int, amount: float) -
 
             return True
 
-        except Exception as e:
-            logger.error(f"Error in async notification process: {str(e)}")
+        except Exception:
+            logger.exception("Error in async notification process")
             return False
@@ -0,0 +1,97 @@
+# app/tasks/plate_tasks.py
+import logging
+
+from sqlalchemy import case, func, or_, select, update
+
+from app.core.celery_app import celery_app
+from app.core.worker_loop import worker_loop
+from app.database import async_session_factory
+from app.models.bid import Bid
+from app.models.plate import AutoPlate
+from app.sharding import bid_shards
+
+logger = logging.getLogger(__name__)
+
+
+@celery_app.task(name="reconcile_plate_stats")
+def reconcile_plate_stats():
+    """
+    Periodic task that corrects drift in the incrementally maintained
+    bid_count/bidder_count columns of auto_plates
+    """
+    try:
+        return worker_loop.run(_reconcile_plate_stats_async())
+    except Exception:
+        logger.exception("Error reconciling plate stats")
+        return False
+
+
+async def _reconcile_plate_stats_async() -> int:
+    """Recount bidders per plate in a single UPDATE and return the corrected rows"""
+    if bid_shards.enabled:
+        return await _reconcile_sharded_plate_stats()
+    bidders = (
+        select(func.count(Bid.id))
+        .where(Bid.plate_id == AutoPlate.id)
+        .scalar_subquery()
+    )
+    query = (
+        update(AutoPlate)
+        .where(or_(AutoPlate.bidder_count != bidders, AutoPlate.bid_count < bidders))
+        .values(
+            bidder_count=bidders,
+            # bid_count also counts replaced bids, so it can only be raised
+            bid_count=case(
+                (AutoPlate.bid_count < bidders, bidders), else_=AutoPlate.bid_count
+            ),
+        )
+        .execution_options(synchronize_session=False)
+    )
+    async with async_session_factory() as session:
+        result = await session.execute(query)
+        await session.commit()
+
+    if result.rowcount:
+        logger.info("Reconciled bid stats for %d plates", result.rowcount)
+    return result.rowcount
+
+
+async def _reconcile_sharded_plate_stats() -> int:
+    """
+    Same correction when bids live on shards: bidder counts are gathered
+    from every shard and only the plates that drifted are updated
+    """
+
+    async def count_bidders(shard, session):
+        result = await session.execute(
+            select(Bid.plate_id, func.count(Bid.id)).group_by(Bid.plate_id)
+        )
+        return result.all()
+
+    bidders = {
+        plate_id: count
+        for rows in await bid_shards.gather(range(bid_shards.count), count_bidders)
+        for plate_id, count in rows
+    }
+    async with async_session_factory() as session:
+        plates = await session.execute(
+            select(AutoPlate.id, AutoPlate.bid_count, AutoPlate.bidder_count)
+        )
+        corrections = [
+            {
+                "id": plate_id,
+                "bidder_count": bidders.get(plate_id, 0),
+                "bid_count": max(bid_count, bidders.get(plate_id, 0)),
+            }
+            for plate_id, bid_count, bidder_count in plates
+            if bidder_count != bidders.get(plate_id, 0)
+            or bid_count < bidders.get(plate_id, 0)
+        ]
+        if corrections:
+            # ORM bulk UPDATE by primary key, one executemany
+            await session.execute(update(AutoPlate), corrections)
+            await session.commit()
+
+    if corrections:
+        logger.info("Reconciled bid stats for %d plates", len(corrections))
+    return len(corrections)
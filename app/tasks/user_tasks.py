@@ -1,6 +1,5 @@
 # app/tasks/user_tasks.py
 from app.core.celery_app import celery_app
-from app.database import get_session
 from app.models.user import User
 from sqlalchemy import select
 import logging
@@ -1,74 +1,441 @@
-from fastapi import APIRouter, WebSocket, WebSocketDisconnect, Depends
-from sqlalchemy.ext.asyncio import AsyncSession
-from typing import Dict, List
+import asyncio
+import json
+import logging
+from collections import deque
+from typing import Deque, Dict, List, Optional, Set
 
-from app.database import get_session
+from fastapi import APIRouter, HTTPException, WebSocket, WebSocketDisconnect, Depends
+from pydantic import ValidationError
+from starlette.concurrency import run_in_threadpool
+
+from app.core.actors import plate_actors
+from app.core.config import settings
+from app.core.rate_limit import limit_websocket_bid
+from app.core.throttle import TokenBucket, notification_coalescer
+from app.database import shared_session
 from app.core.security import get_current_user_ws
 from app.controllers.bid_controller import BidController
+from app.models.bid import Bid
+from app.schemas.bid import BidCreate
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
 
 # Store active connections for different auction plates
 class ConnectionManager:
-    def __init__(self):
-        # Map of plate_id -> list of connected websockets
-        self.active_connections: Dict[int, List[WebSocket]] = {}
+    def __init__(self, history_size: int = settings.WS_HISTORY_SIZE):
+        # Map of plate_id -> connected websockets watching the plate
+        self.active_connections: Dict[int, Set[WebSocket]] = {}
+        # Map of plate_id -> queues of non-websocket listeners (SSE streams)
+        self.listeners: Dict[int, Set[asyncio.Queue]] = {}
+        # Map of websocket -> plate_ids it is subscribed to
+        self.subscriptions: Dict[WebSocket, Set[int]] = {}
+        # Map of plate_id -> sequence number of the last broadcast event
+        self.sequences: Dict[int, int] = {}
+        # Map of plate_id -> ring buffer of the most recent events
+        self.history: Dict[int, Deque[dict]] = {}
+        self.history_size = history_size
 
-    async def connect(self, websocket: WebSocket, plate_id: int):
+    async def connect(self, websocket: WebSocket, plate_id: Optional[int] = None):
         await websocket.accept()
-        if plate_id not in self.active_connections:
-            self.active_connections[plate_id] = []
-        self.active_connections[plate_id].append(websocket)
+        self.subscriptions.setdefault(websocket, set())
+        if plate_id is not None:
+            self.subscribe(websocket, plate_id)
 
-    def disconnect(self, websocket: WebSocket, plate_id: int):
+    def subscribe(self, websocket: WebSocket, plate_id: int):
+        self.active_connections.setdefault(plate_id, set()).add(websocket)
+        self.subscriptions.setdefault(websocket, set()).add(plate_id)
+
+    def unsubscribe(self, websocket: WebSocket, plate_id: int):
         if plate_id in self.active_connections:
-            if websocket in self.active_connections[plate_id]:
-                self.active_connections[plate_id].remove(websocket)
+            self.active_connections[plate_id].discard(websocket)
             if not self.active_connections[plate_id]:
                 del self.active_connections[plate_id]
+        if websocket in self.subscriptions:
+            self.subscriptions[websocket].discard(plate_id)
+
+    def disconnect(self, websocket: WebSocket, plate_id: Optional[int] = None):
+        """
+        Remove a websocket from one plate, or from every plate when no
+        plate_id is given
+        """
+        if plate_id is not None:
+            self.unsubscribe(websocket, plate_id)
+            return
+        for subscribed in self.subscriptions.pop(websocket, set()):
+            if subscribed in self.active_connections:
+                self.active_connections[subscribed].discard(websocket)
+                if not self.active_connections[subscribed]:
+                    del self.active_connections[subscribed]
+
+    def add_listener(self, plate_id: int) -> asyncio.Queue:
+        """
+        Register a queue that receives every event broadcast to the plate.
+        A None item means the listener fell behind and must resynchronize.
+        """
+        queue = asyncio.Queue(maxsize=self.history_size)
+        self.listeners.setdefault(plate_id, set()).add(queue)
+        return queue
+
+    def remove_listener(self, plate_id: int, queue: asyncio.Queue):
+        if plate_id in self.listeners:
+            self.listeners[plate_id].discard(queue)
+            if not self.listeners[plate_id]:
+                del self.listeners[plate_id]
+
+    def current_sequence(self, plate_id: int) -> int:
+        return self.sequences.get(plate_id, 0)
+
+    def events_since(self, plate_id: int, since: int) -> Optional[List[dict]]:
+        """
+        Get the events a client missed after `since`, or None when they are
+        no longer buffered and the client needs a fresh snapshot
+        """
+        current = self.current_sequence(plate_id)
+        if since > current:
+            # Sequence from before a restart or from another worker
+            return None
+        if since == current:
+            return []
+        buffer = self.history.get(plate_id)
+        if not buffer or buffer[0]["seq"] > since + 1:
+            return None
+        return [event for event in buffer if event["seq"] > since]
 
     async def broadcast_to_plate(self, plate_id: int, message: dict):
+        seq = self.current_sequence(plate_id) + 1
+        self.sequences[plate_id] = seq
+        message = {**message, "plate_id": plate_id, "seq": seq}
+        if plate_id not in self.history:
+            self.history[plate_id] = deque(maxlen=self.history_size)
+        self.history[plate_id].append(message)
+
         if plate_id in self.active_connections:
-            for connection in self.active_connections[plate_id]:
-                await connection.send_json(message)
+            for connection in list(self.active_connections[plate_id]):
+                try:
+                    await connection.send_json(message)
+                except Exception:
+                    # Drop sockets that went away without a clean close
+                    self.disconnect(connection)
+
+        for queue in list(self.listeners.get(plate_id, ())):
+            try:
+                queue.put_nowait(message)
+            except asyncio.QueueFull:
+                # Never block the broadcast on a slow reader
+                self.remove_listener(plate_id, queue)
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait(None)
 
 
 manager = ConnectionManager()
 
 
+def highest_bid_message(plate_id: int, seq: int, bid: Optional[Bid]) -> dict:
+    """
+    Build the snapshot sent to clients that cannot resume from `since`
+    """
+    return {
+        "type": "highest_bid",
+        "plate_id": plate_id,
+        "seq": seq,
+        "data": {
+            "amount": float(bid.amount),
+            "user_id": bid.user_id,
+            "timestamp": bid.created_at.isoformat(),
+        }
+        if bid
+        else None,
+    }
+
+
 @router.websocket("/ws/plates/{plate_id}/bids")
 async def websocket_endpoint(
     websocket: WebSocket,
     plate_id: int,
-    db: AsyncSession = Depends(get_session),
+    since: Optional[int] = None,
     user=Depends(get_current_user_ws),
 ):
     await manager.connect(websocket, plate_id)
     try:
-        # Send current highest bid when connecting
-        bid_controller = BidController(db)
-        highest_bid = await bid_controller.get_highest_bid_for_plate(plate_id)
-        if highest_bid:
+        # Reconnecting clients only get the events they missed
+        missed = manager.events_since(plate_id, since) if since is not None else None
+        if missed is not None:
+            for event in missed:
+                await websocket.send_json(event)
+        else:
+            # Events broadcast while the snapshot is loaded arrive live and
+            # carry a higher seq, so clients can discard older duplicates
+            seq = manager.current_sequence(plate_id)
+            # Send current highest bid when connecting, the session is
+            # released before the receive loop starts
+            async with shared_session(readonly=True) as session:
+                bid_controller = BidController(session)
+                highest_bid = await bid_controller.get_highest_bid_for_plate(plate_id)
+            await websocket.send_json(highest_bid_message(plate_id, seq, highest_bid))
+
+        await receive_client_messages(websocket, user, default_plate_id=plate_id)
+    except WebSocketDisconnect:
+        pass
+    finally:
+        # Whatever ended the connection, e.g. an unknown plate's snapshot
+        manager.disconnect(websocket)
+
+
+async def subscribe_plates(
+    websocket: WebSocket,
+    plate_ids: List[int],
+    since: Dict[int, int],
+):
+    """
+    Subscribe a websocket to plates and bring it up to date: buffered deltas
+    where the client can resume, one batched snapshot query for the rest
+    """
+    snapshot_ids = []
+    seqs = {}
+    for plate_id in plate_ids:
+        manager.subscribe(websocket, plate_id)
+        missed = (
+            manager.events_since(plate_id, since[plate_id])
+            if plate_id in since
+            else None
+        )
+        if missed is None:
+            snapshot_ids.append(plate_id)
+            seqs[plate_id] = manager.current_sequence(plate_id)
+            continue
+        for event in missed:
+            await websocket.send_json(event)
+
+    if snapshot_ids:
+        async with shared_session(readonly=True) as session:
+            bid_controller = BidController(session)
+            highest_bids = await bid_controller.get_highest_bids_for_plates(
+                snapshot_ids
+            )
+        for plate_id in snapshot_ids:
             await websocket.send_json(
-                {
-                    "type": "highest_bid",
-                    "data": {
-                        "amount": highest_bid.amount,
-                        "user_id": highest_bid.user_id,
-                        "timestamp": highest_bid.created_at.isoformat(),
-                    },
-                }
+                highest_bid_message(
+                    plate_id, seqs[plate_id], highest_bids.get(plate_id)
+                )
+            )
+
+
+# Notifications being published, referenced until done
+_publishing: Set[asyncio.Task] = set()
+
+
+def enqueue_bid_notification(plate_id: int, user_id: int, amount: float):
+    """
+    Queue the notification task without waiting for the broker: publishing
+    blocks while it connects, so it runs in the thread pool
+    """
+    task = asyncio.ensure_future(
+        run_in_threadpool(publish_bid_notification, plate_id, user_id, amount)
+    )
+    _publishing.add(task)
+    task.add_done_callback(_publishing.discard)
+
+
+# One connection attempt, no retries: with the broker down a notification
+# is dropped rather than holding a pool thread for its retry schedule
+NOTIFICATION_BROKER_OPTIONS = {"max_retries": 0, "socket_connect_timeout": 1}
+
+
+def publish_bid_notification(plate_id: int, user_id: int, amount: float):
+    from app.core.celery_app import celery_app
+    from app.tasks.notification_tasks import send_bid_notification
+
+    try:
+        with celery_app.connection_for_write(
+            transport_options=NOTIFICATION_BROKER_OPTIONS
+        ) as connection:
+            # Nobody reads the result, and subscribing to it would retry
+            # against the result backend too
+            send_bid_notification.apply_async(
+                (plate_id, user_id, amount),
+                connection=connection,
+                retry=False,
+                ignore_result=True,
             )
+    except Exception:
+        logger.exception("Error enqueueing bid notification")
 
-        while True:
-            # Wait for any messages from the client
-            data = await websocket.receive_text()
-            # You can process client messages here if needed
 
-            from app.tasks.notification_tasks import send_bid_notification
-            send_bid_notification.delay(plate_id, user.id, highest_bid.amount)
+async def place_bid(
+    websocket: WebSocket, user, message: dict, default_plate_id: Optional[int]
+):
+    """
+    Place a bid through the same BidController path as POST /bids/
+    """
+    if not user:
+        await websocket.send_json({"type": "error", "detail": "Not authenticated"})
+        return
+    try:
+        bid_in = BidCreate(
+            plate_id=message.get("plate_id", default_plate_id),
+            amount=message.get("amount"),
+        )
+    except ValidationError as e:
+        await websocket.send_json(
+            {
+                "type": "error",
+                "detail": e.errors(
+                    include_url=False, include_context=False, include_input=False
+                ),
+            }
+        )
+        return
+
+    # Same per-user and per-plate budgets as POST /bids/
+    retry_after = await limit_websocket_bid(
+        websocket.scope, user.username, bid_in.plate_id
+    )
+    if retry_after:
+        await websocket.send_json(
+            {
+                "type": "error",
+                "detail": "Too many requests",
+                "retry_after": retry_after,
+            }
+        )
+        return
+
+    async def place():
+        # Takes one of the few shared session slots only once the bid's turn
+        # comes, not while it queues behind the plate's other bids
+        async with shared_session() as session:
+            return await BidController(session).create_bid(bid_in, user)
+
+    try:
+        bid = await plate_actors.run(bid_in.plate_id, place)
+    except HTTPException as e:
+        await websocket.send_json({"type": "error", "detail": e.detail})
+        return
+    except Exception:
+        # A failed bid must not take the connection down with it
+        logger.exception("Error placing websocket bid")
+        await websocket.send_json({"type": "error", "detail": "Could not place bid"})
+        return
+
+    await websocket.send_json(
+        {
+            "type": "bid_accepted",
+            "data": {
+                "id": bid.id,
+                "plate_id": bid.plate_id,
+                "amount": float(bid.amount),
+            },
+        }
+    )
+    notification_coalescer.submit(
+        (user.id, bid.plate_id),
+        enqueue_bid_notification,
+        bid.plate_id,
+        user.id,
+        float(bid.amount),
+    )
+
+
+async def handle_client_message(
+    websocket: WebSocket, user, data: str, default_plate_id: Optional[int] = None
+):
+    """
+    Dispatch one client message:
+    {"action": "ping"},
+    {"action": "place_bid", "plate_id": ..., "amount": ...},
+    {"action": "subscribe", "plate_ids": [...], "since": {"<plate_id>": seq}},
+    {"action": "unsubscribe", "plate_ids": [...]}
+    """
+    try:
+        message = json.loads(data)
+        action = message["action"]
+    except (KeyError, TypeError, ValueError):
+        await websocket.send_json({"type": "error", "detail": "Invalid message"})
+        return
+
+    if action == "ping":
+        await websocket.send_json({"type": "pong"})
+        return
+    if action == "place_bid":
+        await place_bid(websocket, user, message, default_plate_id)
+        return
+    if action not in ("subscribe", "unsubscribe"):
+        await websocket.send_json(
+            {"type": "error", "detail": f"Unknown action: {action}"}
+        )
+        return
+
+    try:
+        plate_ids = [int(plate_id) for plate_id in message["plate_ids"]]
+        since = {
+            int(plate_id): int(seq)
+            for plate_id, seq in (message.get("since") or {}).items()
+        }
+    except (KeyError, TypeError, ValueError, AttributeError):
+        await websocket.send_json({"type": "error", "detail": "Invalid message"})
+        return
+
+    if action == "subscribe":
+        subscribed = manager.subscriptions.get(websocket, set())
+        if len(subscribed | set(plate_ids)) > settings.WS_MAX_SUBSCRIPTIONS:
+            await websocket.send_json(
+                {"type": "error", "detail": "Too many subscriptions"}
+            )
+            return
+        await subscribe_plates(websocket, plate_ids, since)
+    else:
+        for plate_id in plate_ids:
+            manager.unsubscribe(websocket, plate_id)
+
+
+async def receive_client_messages(
+    websocket: WebSocket, user, default_plate_id: Optional[int] = None
+):
+    """
+    Receive loop shared by the websocket endpoints, rate limited per
+    connection with a token bucket
+    """
+    bucket = TokenBucket(settings.WS_MESSAGE_RATE, settings.WS_MESSAGE_BURST)
+    while True:
+        data = await websocket.receive_text()
+        if not bucket.consume():
+            await websocket.send_json(
+                {"type": "error", "detail": "Rate limit exceeded"}
+            )
+            continue
+        await handle_client_message(websocket, user, data, default_plate_id)
+
+
+@router.websocket("/ws")
+async def multiplexed_websocket_endpoint(
+    websocket: WebSocket,
+    user=Depends(get_current_user_ws),
+):
+    """
+    One connection for many plates, see handle_client_message for the
+    message protocol
+    """
+    await manager.connect(websocket)
+    try:
+        await receive_client_messages(websocket, user)
     except WebSocketDisconnect:
-        manager.disconnect(websocket, plate_id)
-# send_push_notification(user_id, plate_id, highest_bid.amount)
+        pass
+    finally:
+        manager.disconnect(websocket)
+
+
 async def send_push_notification(user_id: int, plate_id: int, amount: float):
+    """
+    Push a bid notification to everyone watching the plate
+    """
+    await manager.broadcast_to_plate(
+        plate_id,
+        {
+            "type": "notification",
+            "data": {"user_id": user_id, "plate_id": plate_id, "amount": amount},
+        },
+    )
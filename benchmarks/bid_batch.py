@@ -0,0 +1,128 @@
+"""
+Placing N bids with one POST /bids/batch versus N sequential POST /bids/.
+
+Creates fresh plates per round in a scratch SQLite database and places one
+bid on each of them in-process, once call by call and once as a single
+batch, then reports the wall time, SQL statements and commits of both. Fails
+if the batch is not at least MIN_SPEEDUP times faster.
+
+    python -m benchmarks.bid_batch --bids 50 --rounds 5
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+MIN_SPEEDUP = 2.5
+
+
+async def create_plates(count: int, prefix: str):
+    from app.database import async_session_factory
+    from app.models.plate import AutoPlate
+
+    async with async_session_factory() as session:
+        plates = [
+            AutoPlate(
+                plate_number=f"{prefix}{i:05d}",
+                price=100,
+                deadline=datetime.now() + timedelta(days=1),
+                created_by_id=1,
+            )
+            for i in range(count)
+        ]
+        session.add_all(plates)
+        await session.commit()
+        return [plate.id for plate in plates]
+
+
+async def run(args):
+    import httpx
+    from sqlalchemy import event
+
+    os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{tempfile.mkdtemp()}/batch.db"
+    sys.path.insert(0, ROOT)
+    from app.core.config import settings
+
+    # N sequential bids from one user would hit the per-user limit
+    settings.RATE_LIMIT_ENABLED = False
+    from benchmarks.sse_vs_websocket import prepare_database
+    from app.database import engine
+
+    _, token = await prepare_database()
+    from main import app
+
+    counters = {"statements": 0, "commits": 0}
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def count_statement(*_):
+        counters["statements"] += 1
+
+    @event.listens_for(engine.sync_engine, "commit")
+    def count_commit(*_):
+        counters["commits"] += 1
+
+    results = {"sequential": [], "batch": []}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        headers = {"Authorization": f"Bearer {token}"}
+        for round_ in range(args.rounds):
+            for mode in ("sequential", "batch"):
+                plate_ids = await create_plates(
+                    args.bids, f"{mode[0].upper()}{round_}"
+                )
+                items = [
+                    {"plate_id": plate_id, "amount": 200} for plate_id in plate_ids
+                ]
+                counters.update(statements=0, commits=0)
+                started = time.perf_counter()
+                if mode == "sequential":
+                    for item in items:
+                        response = await client.post(
+                            "/api/v1/bids/", json=item, headers=headers
+                        )
+                        assert response.status_code == 201, response.text
+                else:
+                    response = await client.post(
+                        "/api/v1/bids/batch", json=items, headers=headers
+                    )
+                    assert response.status_code == 200, response.text
+                    assert all(r["status"] == "placed" for r in response.json())
+                elapsed = time.perf_counter() - started
+                results[mode].append(
+                    (elapsed, counters["statements"], counters["commits"])
+                )
+
+    print(f"{args.bids} bids, median of {args.rounds} rounds")
+    print(f"{'mode':<11} {'wall ms':>8} {'bids/s':>8} {'queries':>8} {'commits':>8}")
+    medians = {}
+    for mode, rounds in results.items():
+        wall = statistics.median(elapsed for elapsed, _, _ in rounds)
+        medians[mode] = wall
+        _, statements, commits = rounds[-1]
+        print(
+            f"{mode:<11} {wall * 1000:>8.1f} {args.bids / wall:>8.0f}"
+            f" {statements:>8} {commits:>8}"
+        )
+    speedup = medians["sequential"] / medians["batch"]
+    if speedup < MIN_SPEEDUP:
+        print(f"FAIL: batch only {speedup:.1f}x faster, expected {MIN_SPEEDUP}x")
+        sys.exit(1)
+    print(f"OK: batch {speedup:.1f}x faster than sequential calls")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--bids", type=int, default=50)
+    parser.add_argument("--rounds", type=int, default=5)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
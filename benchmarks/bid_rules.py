@@ -0,0 +1,71 @@
+"""
+Cost of validating a bid against a plate's compiled rules.
+
+Times rules_for(plate).check() on in-memory plates with reserve prices, max
+bid caps and tiered increments, the same work BidController does per bid
+after loading the plate, and fails if a check exceeds the budget.
+
+    python -m benchmarks.bid_rules --bids 200000
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from decimal import Decimal
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+BUDGET_US = 10.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--bids", type=int, default=200_000)
+    parser.add_argument("--plates", type=int, default=1000)
+    args = parser.parse_args()
+
+    from app.core.bid_rules import compile_rules, rules_for
+    from app.models.bid import Bid  # noqa: F401
+    from app.models.plate import AutoPlate
+    from app.models.user import User  # noqa: F401
+
+    random.seed(0)
+    tiers = [None, "0:1,1000:10,10000:100", "0:5,50000:500"]
+    plates = [
+        AutoPlate(
+            id=i,
+            price=Decimal(random.randint(100, 100_000)),
+            bid_count=random.randint(0, 3),
+            reserve_price=Decimal(random.randint(100, 200_000)) if i % 2 else None,
+            max_bid=Decimal(500_000) if i % 3 else None,
+            increment_tiers=tiers[i % len(tiers)],
+        )
+        for i in range(args.plates)
+    ]
+    # Mostly valid bids a little above the current price
+    bids = [
+        (plate, plate.price + Decimal(random.randint(-500, 50_000)) / 100)
+        for plate in (plates[i % args.plates] for i in range(args.bids))
+    ]
+
+    started = time.perf_counter()
+    rejected = 0
+    for plate, amount in bids:
+        rejected += bool(
+            rules_for(plate).check(plate.price, plate.bid_count > 0, amount)
+        )
+    per_bid = (time.perf_counter() - started) / args.bids * 1e6
+
+    info = compile_rules.cache_info()
+    print(f"{args.bids} bids on {args.plates} plates: {per_bid:.2f} us per check")
+    print(f"rejected {rejected}, compiled rule sets {info.currsize}, cache hits {info.hits}")
+    if per_bid > BUDGET_US:
+        print(f"FAIL: exceeds {BUDGET_US} us budget")
+        sys.exit(1)
+    print(f"OK: within {BUDGET_US} us budget")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Celery task throughput with a loop per task vs. the persistent worker loop.
+
+Runs send_bid_notification in eager mode against a scratch SQLite database,
+first the old way (asyncio.run() around each call, a fresh event loop per
+task) and then through the worker loop, and reports tasks/sec and how many
+tasks failed.
+
+    python -m benchmarks.celery_task_throughput --tasks 2000
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def timed(call, tasks: int):
+    succeeded = 0
+    started = time.perf_counter()
+    for _ in range(tasks):
+        succeeded += call() is True
+    elapsed = time.perf_counter() - started
+    return tasks / elapsed, tasks - succeeded
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--tasks", type=int, default=2000)
+    args = parser.parse_args()
+
+    os.environ["DATABASE_URL"] = (
+        f"sqlite+aiosqlite:///{tempfile.mkdtemp()}/celery_tasks.db"
+    )
+    sys.path.insert(0, ROOT)
+    from benchmarks.sse_vs_websocket import prepare_database
+    from app.core.celery_app import celery_app
+    from app.core.worker_loop import worker_loop
+    from app.tasks.notification_tasks import (
+        _send_notification_async,
+        send_bid_notification,
+    )
+
+    plate_id, _ = asyncio.run(prepare_database())
+    user_id = 1
+    celery_app.conf.task_always_eager = True
+    logging.getLogger("app.tasks").setLevel(logging.WARNING)
+
+    @celery_app.task(name="benchmark_send_bid_notification_asyncio_run")
+    def per_task_loop(plate_id: int, user_id: int, amount: float):
+        try:
+            return asyncio.run(_send_notification_async(plate_id, user_id, amount))
+        except Exception:
+            return False
+
+    cases = {
+        "asyncio.run per task": lambda: per_task_loop.delay(plate_id, user_id, 100).get(),
+        "worker loop": lambda: send_bid_notification.delay(plate_id, user_id, 100).get(),
+    }
+
+    print(f"{'mode':<22} {'tasks/sec':>10} {'failed':>7}")
+    results = {}
+    for name, call in cases.items():
+        call()  # warm up
+        results[name] = timed(call, args.tasks)
+        print(f"{name:<22} {results[name][0]:>10.0f} {results[name][1]:>7}")
+    worker_loop.stop()
+
+    before, after = (rate for rate, _ in results.values())
+    print(f"speedup: {after / before:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
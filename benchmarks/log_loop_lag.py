@@ -0,0 +1,134 @@
+"""
+Event loop lag while logging to a slow sink, synchronous versus queued.
+
+Tasks on one event loop log bid events at a steady rate to a stream whose
+every write takes --write-ms (a congested stdout pipe or log shipper),
+while a monitor task sleeps 1 ms at a time and records how late it wakes
+up. Runs once with a plain StreamHandler, writing on the loop, and once
+with the app's queue handler and listener thread. Fails if the queued p99
+lag exceeds the budget.
+
+    python -m benchmarks.log_loop_lag --seconds 3 --rate 500 --write-ms 2
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import queue
+import statistics
+import sys
+import time
+from logging.handlers import QueueListener
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+BUDGET_P99_MS = 5.0
+TICK = 0.001
+
+
+class SlowStream:
+    def __init__(self, write_seconds: float):
+        self.write_seconds = write_seconds
+        self.lines = 0
+
+    def write(self, text: str) -> None:
+        time.sleep(self.write_seconds)
+        self.lines += text.count("\n")
+
+    def flush(self) -> None:
+        pass
+
+
+async def monitor(lags: list, until: float):
+    loop = asyncio.get_running_loop()
+    while loop.time() < until:
+        started = loop.time()
+        await asyncio.sleep(TICK)
+        lags.append((loop.time() - started - TICK) * 1000)
+
+
+async def bidder(logger: logging.Logger, interval: float, until: float, n: int):
+    loop = asyncio.get_running_loop()
+    while loop.time() < until:
+        logger.info(
+            "Bid placed", extra={"plate_id": n, "user_id": n, "amount": "200.00"}
+        )
+        await asyncio.sleep(interval)
+
+
+async def measure(handler: logging.Handler, args) -> list:
+    logger = logging.getLogger("benchmarks.log_loop_lag")
+    logger.handlers = [handler]
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+    until = asyncio.get_running_loop().time() + args.seconds
+    lags: list = []
+    await asyncio.gather(
+        monitor(lags, until),
+        *(bidder(logger, args.tasks / args.rate, until, n) for n in range(args.tasks)),
+    )
+    return lags
+
+
+def percentile(values: list, share: float) -> float:
+    return statistics.quantiles(values, n=100)[int(share * 100) - 1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=3.0)
+    parser.add_argument("--rate", type=float, default=500, help="records per second")
+    parser.add_argument("--tasks", type=int, default=50)
+    parser.add_argument("--write-ms", type=float, default=2.0)
+    args = parser.parse_args()
+
+    from app.core.logging import ContextFilter, DroppingQueueHandler, JsonFormatter
+
+    print(
+        f"{args.rate:.0f} records/s from {args.tasks} tasks for {args.seconds}s,"
+        f" {args.write_ms} ms per write"
+    )
+    print(
+        f"{'handler':<8} {'p50 ms':>7} {'p99 ms':>7} {'max ms':>7}"
+        f" {'written':>8} {'dropped':>8}"
+    )
+    results = {}
+    for name in ("sync", "queued"):
+        stream = SlowStream(args.write_ms / 1000)
+        output = logging.StreamHandler(stream)
+        output.setFormatter(JsonFormatter())
+        listener = None
+        if name == "sync":
+            handler = output
+        else:
+            handler = DroppingQueueHandler(queue.Queue(10000))
+            listener = QueueListener(handler.queue, output)
+            listener.start()
+        handler.addFilter(ContextFilter())
+
+        lags = asyncio.run(measure(handler, args))
+        dropped = getattr(handler, "dropped", 0)
+        if listener is not None:
+            # Written out after the run, off the loop
+            listener.stop()
+        results[name] = percentile(lags, 0.99)
+        print(
+            f"{name:<8} {statistics.median(lags):>7.2f} {results[name]:>7.2f}"
+            f" {max(lags):>7.2f} {stream.lines:>8} {dropped:>8}"
+        )
+
+    if results["queued"] > BUDGET_P99_MS:
+        print(
+            f"FAIL: queued p99 lag {results['queued']:.2f} ms,"
+            f" budget {BUDGET_P99_MS} ms"
+        )
+        sys.exit(1)
+    print(
+        f"OK: queued p99 lag {results['queued']:.2f} ms (budget {BUDGET_P99_MS} ms),"
+        f" synchronous {results['sync']:.2f} ms"
+    )
+
+
+if __name__ == "__main__":
+    main()
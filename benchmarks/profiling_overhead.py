@@ -0,0 +1,99 @@
+"""
+Per-request cost of ProfilingMiddleware, off and on.
+
+Drives the middleware directly with ASGI messages against a minimal app,
+best of several runs, and compares with calling the app directly:
+profiling off (the production default), on without the request being
+picked, every request sampled, and every request under cProfile. Fails if
+switched-off profiling costs more than the budget.
+
+    python -m benchmarks.profiling_overhead --requests 20000
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+BUDGET_US = 1.0
+
+
+async def app(scope, receive, send):
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b"{}"})
+
+
+async def receive():
+    return {"type": "http.request", "body": b"", "more_body": False}
+
+
+async def send(message):
+    pass
+
+
+async def timed(handler, scopes, repeat: int = 5):
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for scope in scopes:
+            await handler(scope, receive, send)
+        best = min(best, time.perf_counter() - started)
+    return best / len(scopes) * 1e6
+
+
+async def run(args):
+    from app.core.profiling import Profiler, ProfilingMiddleware
+
+    profiler = Profiler()
+    middleware = ProfilingMiddleware(app, profiler)
+
+    def scopes(headers=()):
+        return [
+            {
+                "type": "http",
+                "method": "GET",
+                "path": "/api/v1/plates/",
+                "headers": list(headers),
+            }
+            for _ in range(args.requests)
+        ]
+
+    baseline = await timed(app, scopes())
+    off = await timed(middleware, scopes())
+    profiler.enable(sample_rate=0)
+    unpicked = await timed(middleware, scopes())
+    profiler.enable(sample_rate=1)
+    sampled = await timed(middleware, scopes())
+    profiler.enable(sample_rate=0)
+    profiled = await timed(
+        middleware, scopes([(b"x-profile", profiler.token.encode())]), repeat=1
+    )
+    profiler.disable()
+
+    print(f"{'case':<22} {'us/request':>11} {'overhead us':>12}")
+    print(f"{'no middleware':<22} {baseline:>11.2f} {'':>12}")
+    for name, cost in (
+        ("off", off),
+        ("on, not picked", unpicked),
+        ("on, sampled", sampled),
+        ("on, cProfile", profiled),
+    ):
+        print(f"{name:<22} {cost:>11.2f} {cost - baseline:>12.2f}")
+
+    if off - baseline > BUDGET_US:
+        print(f"FAIL: off costs {off - baseline:.2f} us, budget {BUDGET_US} us")
+        sys.exit(1)
+    print(f"OK: off costs {off - baseline:.2f} us (budget {BUDGET_US} us)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=20_000)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
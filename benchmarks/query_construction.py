@@ -0,0 +1,175 @@
+"""
+Python-side cost of the queries of one bid request, built per call versus
+the prebuilt statements of app.queries.
+
+A bid request runs the user lookup of authentication and the two queries
+of BidController._settle. Measures, per request: building the statements
+and their cache keys, compiling them (what every request would pay
+without the engine's compiled cache), and executing them on an empty
+in-memory SQLite database with the compiled cache on and off. Fails if
+the prebuilt statements do not cut construction and cache key cost by at
+least MIN_SPEEDUP.
+
+    python -m benchmarks.query_construction --requests 2000
+"""
+
+import argparse
+import os
+import sys
+import time
+from decimal import Decimal
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+MIN_SPEEDUP = 20
+
+
+def inline_statements(plate_id: int, user_id: int):
+    """
+    The statements as the controllers built them on every call
+    """
+    from sqlalchemy import or_, select
+
+    from app.models.bid import Bid
+    from app.models.proxy_bid import ProxyBid
+    from app.models.user import User
+
+    return [
+        (select(User).where(User.username == "alice"), None),
+        (
+            select(ProxyBid)
+            .where(
+                ProxyBid.plate_id == plate_id,
+                ProxyBid.is_active.is_(True),
+                ProxyBid.max_amount >= Decimal("110.00"),
+            )
+            .order_by(ProxyBid.id),
+            None,
+        ),
+        (
+            select(Bid)
+            .where(
+                Bid.plate_id == plate_id,
+                or_(Bid.user_id.in_({user_id}), Bid.amount == Decimal("100.00")),
+            )
+            .order_by(Bid.id),
+            None,
+        ),
+    ]
+
+
+def prebuilt_statements(plate_id: int, user_id: int):
+    from app.queries import bids_in_play, proxies_in_play, user_by_username
+
+    return [
+        (user_by_username, {"username": "alice"}),
+        (proxies_in_play, {"plate_id": plate_id, "minimum": Decimal("110.00")}),
+        (
+            bids_in_play,
+            {"plate_id": plate_id, "user_ids": [user_id], "price": Decimal("100.00")},
+        ),
+    ]
+
+
+def per_request(requests: int, run) -> float:
+    """
+    Microseconds per request, best of three rounds
+    """
+    best = float("inf")
+    for _ in range(3):
+        started = time.perf_counter()
+        for n in range(requests):
+            run(n)
+        best = min(best, time.perf_counter() - started)
+    return best / requests * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=2000)
+    args = parser.parse_args()
+
+    from sqlalchemy import create_engine
+    from sqlalchemy.dialects import postgresql
+    from sqlalchemy.orm import Session
+
+    import app.queries  # noqa: F401, imports every model the statements use
+    from app.database import Base
+
+    dialect = postgresql.dialect()
+
+    def build(statements):
+        def run(n):
+            for statement, _ in statements(n, n):
+                statement._generate_cache_key()
+
+        return run
+
+    def compile_(n):
+        for statement, _ in inline_statements(n, n):
+            statement.compile(dialect=dialect)
+
+    def execute(engine, statements):
+        session = Session(engine)
+
+        def run(n):
+            for statement, params in statements(n, n):
+                session.execute(statement, params).scalars().all()
+
+        return run
+
+    cached = create_engine("sqlite://")
+    uncached = create_engine("sqlite://", query_cache_size=0)
+    for engine in (cached, uncached):
+        Base.metadata.create_all(engine)
+
+    rows = [
+        (
+            "build + cache key",
+            "inline",
+            per_request(args.requests, build(inline_statements)),
+        ),
+        (
+            "build + cache key",
+            "prebuilt",
+            per_request(args.requests, build(prebuilt_statements)),
+        ),
+        ("compile (PostgreSQL)", "inline", per_request(args.requests, compile_)),
+        (
+            "execute, cache on",
+            "inline",
+            per_request(args.requests, execute(cached, inline_statements)),
+        ),
+        (
+            "execute, cache on",
+            "prebuilt",
+            per_request(args.requests, execute(cached, prebuilt_statements)),
+        ),
+        (
+            "execute, cache off",
+            "inline",
+            per_request(args.requests, execute(uncached, inline_statements)),
+        ),
+    ]
+
+    print(f"3 statements per request, best of 3 rounds of {args.requests}")
+    print(f"{'step':<22} {'statements':<10} {'us/request':>11}")
+    for step, kind, cost in rows:
+        print(f"{step:<22} {kind:<10} {cost:>11.1f}")
+
+    inline, prebuilt = rows[0][2], rows[1][2]
+    if inline / prebuilt < MIN_SPEEDUP:
+        print(
+            f"FAIL: prebuilt statements only {inline / prebuilt:.0f}x cheaper to"
+            f" key, expected {MIN_SPEEDUP}x"
+        )
+        sys.exit(1)
+    print(
+        f"OK: prebuilt statements save {inline - prebuilt:.0f} us of construction"
+        f" per request ({inline / prebuilt:.0f}x),"
+        f" {rows[3][2] - rows[4][2]:.0f} us end to end"
+    )
+
+
+if __name__ == "__main__":
+    main()
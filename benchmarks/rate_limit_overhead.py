@@ -0,0 +1,102 @@
+"""
+Per-request overhead of RateLimitMiddleware with the in-process limiter.
+
+Drives the middleware directly with ASGI messages for POST /bids/ (IP, user
+and plate keys, JSON body inspected), POST /auth/login (form body) and an
+unlimited path, and compares against calling the wrapped app directly.
+
+    python -m benchmarks.rate_limit_overhead --requests 100000
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+BUDGET_US = 50.0
+
+
+async def noop_app(scope, receive, send):
+    await receive()
+
+
+async def send(message):
+    pass
+
+
+def request(path: str, body: bytes, headers, client: str):
+    scope = {
+        "type": "http",
+        "method": "POST",
+        "path": path,
+        "headers": headers,
+        "client": (client, 50000),
+    }
+
+    async def receive():
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    return scope, receive
+
+
+async def timed(app, requests):
+    started = time.perf_counter()
+    for scope, receive in requests:
+        await app(scope, receive, send)
+    return (time.perf_counter() - started) / len(requests) * 1e6
+
+
+async def run(args):
+    from app.core.config import settings
+    from app.core.rate_limit import MemoryRateLimiter, RateLimitMiddleware
+    from app.core.security import create_access_token
+
+    # Spread load over many keys so the limits themselves are never hit
+    middleware = RateLimitMiddleware(noop_app, limiter=MemoryRateLimiter())
+    tokens = [create_access_token({"sub": f"user{i}"}) for i in range(1000)]
+    cases = {
+        "POST /bids/": lambda i: request(
+            f"{settings.API_PREFIX}/bids/",
+            json.dumps({"plate_id": i % 5000, "amount": 100}).encode(),
+            [
+                (b"authorization", f"Bearer {tokens[i % 1000]}".encode()),
+                (b"content-type", b"application/json"),
+            ],
+            f"10.0.{i // 250 % 256}.{i % 250}",
+        ),
+        "POST /auth/login": lambda i: request(
+            f"{settings.API_PREFIX}/auth/login",
+            f"username=user{i}&password=secret".encode(),
+            [(b"content-type", b"application/x-www-form-urlencoded")],
+            f"10.1.{i // 250 % 256}.{i % 250}",
+        ),
+        "unlimited path": lambda i: request("/health", b"", [], "10.2.0.1"),
+    }
+
+    print(f"{'endpoint':<18} {'baseline us':>12} {'limited us':>11} {'overhead us':>12}")
+    worst = 0.0
+    for name, build in cases.items():
+        requests = [build(i) for i in range(args.requests)]
+        baseline = await timed(noop_app, requests)
+        limited = await timed(middleware, requests)
+        worst = max(worst, limited - baseline)
+        print(f"{name:<18} {baseline:>12.2f} {limited:>11.2f} {limited - baseline:>12.2f}")
+
+    if worst > BUDGET_US:
+        print(f"FAIL: overhead {worst:.1f} us exceeds {BUDGET_US} us budget")
+        sys.exit(1)
+    print(f"OK: worst overhead {worst:.1f} us (budget {BUDGET_US} us)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=100_000)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
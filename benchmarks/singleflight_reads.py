@@ -0,0 +1,86 @@
+"""
+Concurrent identical reads with and without single-flight coalescing.
+
+Fires N concurrent GET /bids/plates/{id}/highest and GET /plates/{id}
+requests in-process against a scratch SQLite database, once with
+coalescing disabled and once enabled, and reports the SQL statements the
+coalesced lookups issued, the wall time and the coalescing ratio.
+
+    python -m benchmarks.singleflight_reads --requests 500
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+async def run(args):
+    import httpx
+    from sqlalchemy import event
+
+    os.environ["DATABASE_URL"] = (
+        f"sqlite+aiosqlite:///{tempfile.mkdtemp()}/singleflight.db"
+    )
+    sys.path.insert(0, ROOT)
+    from benchmarks.sse_vs_websocket import prepare_database
+    from app.core.singleflight import highest_bid_reads, plate_reads
+    from app.database import engine
+
+    plate_id, token = await prepare_database()
+    from main import app
+
+    statements = {"highest": 0, "plate": 0}
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def count(conn, cursor, statement, *rest):
+        if statement.lstrip().upper().startswith("SELECT BIDS."):
+            statements["highest"] += 1
+        elif statement.lstrip().upper().startswith("SELECT AUTO_PLATES."):
+            statements["plate"] += 1
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        headers = {"Authorization": f"Bearer {token}"}
+        await client.post(
+            "/api/v1/bids/", json={"plate_id": plate_id, "amount": 500}, headers=headers
+        )
+        endpoints = {
+            "highest": f"/api/v1/bids/plates/{plate_id}/highest",
+            "plate": f"/api/v1/plates/{plate_id}",
+        }
+
+        print(
+            f"{'endpoint':<8} {'coalesced':>9} {'queries':>8} {'wall ms':>8} {'ratio':>6}"
+        )
+        for name, path in endpoints.items():
+            flight = highest_bid_reads if name == "highest" else plate_reads
+            for enabled in (False, True):
+                flight.enabled = enabled
+                flight.calls = flight.executions = 0
+                statements[name] = 0
+                started = time.perf_counter()
+                responses = await asyncio.gather(
+                    *(client.get(path, headers=headers) for _ in range(args.requests))
+                )
+                wall_ms = (time.perf_counter() - started) * 1000
+                assert all(r.status_code == 200 for r in responses)
+                ratio = flight.stats()["coalescing_ratio"]
+                print(
+                    f"{name:<8} {str(enabled):>9} {statements[name]:>8}"
+                    f" {wall_ms:>8.0f} {ratio:>6.2f}"
+                )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=500)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
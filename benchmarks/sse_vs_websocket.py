@@ -0,0 +1,209 @@
+"""
+Connections per worker for the SSE feed vs the websocket feed.
+
+Starts one uvicorn worker on a scratch SQLite database, opens N idle
+subscribers of each kind on the same plate, and reports the worker's resident
+memory per connection plus the time for one bid to reach every subscriber.
+
+    python -m benchmarks.sse_vs_websocket --connections 500
+
+Needs the `websockets` package for the websocket client (uvicorn needs it
+for the server side as well).
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from datetime import datetime, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MEMORY_BUDGET_MB = 1024
+
+
+async def prepare_database():
+    from app.core.security import create_access_token, get_password_hash
+    from app.database import Base, async_session_factory, engine
+    from app.models.bid import Bid  # noqa: F401
+    from app.models.plate import AutoPlate
+    from app.models.proxy_bid import ProxyBid  # noqa: F401
+    from app.models.user import User
+
+    engine.echo = False
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    async with async_session_factory() as session:
+        user = User(
+            username="bench",
+            email="bench@example.com",
+            is_staff=True,
+            hashed_password=get_password_hash("benchmark"),
+        )
+        session.add(user)
+        await session.flush()
+        plate = AutoPlate(
+            plate_number="01B001BB",
+            price=100,
+            deadline=datetime.now() + timedelta(days=1),
+            created_by_id=user.id,
+        )
+        session.add(plate)
+        await session.commit()
+        plate_id = plate.id
+    await engine.dispose()
+    return plate_id, create_access_token({"sub": "bench"})
+
+
+def rss_kb(pid: int) -> int:
+    with open(f"/proc/{pid}/status") as status:
+        for line in status:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1])
+    return 0
+
+
+def place_bid(port: int, token: str, plate_id: int, amount: float):
+    request = urllib.request.Request(
+        f"http://127.0.0.1:{port}/api/v1/bids/",
+        data=json.dumps({"plate_id": plate_id, "amount": amount}).encode(),
+        headers={"Authorization": f"Bearer {token}", "Content-Type": "application/json"},
+        method="POST",
+    )
+    urllib.request.urlopen(request).read()
+
+
+class SSEClient:
+    def __init__(self, port: int, plate_id: int):
+        self.port = port
+        self.plate_id = plate_id
+        self.buffer = b""
+
+    async def open(self):
+        self.reader, self.writer = await asyncio.open_connection("127.0.0.1", self.port)
+        self.writer.write(
+            f"GET /api/v1/plates/{self.plate_id}/events HTTP/1.1\r\n"
+            f"Host: 127.0.0.1\r\nAccept: text/event-stream\r\n\r\n".encode()
+        )
+        await self.wait_for(b"event: highest_bid")
+
+    async def wait_for(self, marker: bytes):
+        while marker not in self.buffer:
+            chunk = await self.reader.read(65536)
+            if not chunk:
+                raise ConnectionError("stream closed")
+            self.buffer += chunk
+        self.buffer = self.buffer.split(marker, 1)[1]
+
+    async def close(self):
+        self.writer.close()
+
+
+class WebSocketClient:
+    def __init__(self, port: int, plate_id: int, token: str):
+        self.url = f"ws://127.0.0.1:{port}/ws/plates/{plate_id}/bids?token={token}"
+
+    async def open(self):
+        import websockets
+
+        self.socket = await websockets.connect(self.url, max_size=None)
+        await self.wait_for("highest_bid")
+
+    async def wait_for(self, kind: str):
+        while json.loads(await self.socket.recv())["type"] != kind:
+            pass
+
+    async def close(self):
+        await self.socket.close()
+
+
+async def measure(name, clients, pid, port, token, plate_id, amount):
+    before = rss_kb(pid)
+    opened = []
+    for start in range(0, len(clients), 100):
+        batch = clients[start : start + 100]
+        results = await asyncio.gather(
+            *(asyncio.wait_for(client.open(), 10) for client in batch),
+            return_exceptions=True,
+        )
+        opened += [c for c, r in zip(batch, results) if not isinstance(r, Exception)]
+    await asyncio.sleep(1)
+    per_connection = (rss_kb(pid) - before) / max(len(opened), 1)
+
+    marker = b"event: new_bid" if name == "sse" else "new_bid"
+    started = time.perf_counter()
+    waiters = asyncio.gather(*(client.wait_for(marker) for client in opened))
+    try:
+        await asyncio.get_running_loop().run_in_executor(
+            None, place_bid, port, token, plate_id, amount
+        )
+        await asyncio.wait_for(waiters, 60)
+        fanout_ms = (time.perf_counter() - started) * 1000
+    except Exception as e:
+        # e.g. the connection pool is exhausted by open subscribers
+        waiters.cancel()
+        await asyncio.gather(waiters, return_exceptions=True)
+        print(f"{name}: bid was not delivered ({type(e).__name__}: {e})")
+        fanout_ms = float("nan")
+
+    await asyncio.gather(*(client.close() for client in opened), return_exceptions=True)
+    await asyncio.sleep(1)
+    return len(opened), per_connection, fanout_ms
+
+
+async def run(args):
+    workdir = tempfile.mkdtemp()
+    os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{workdir}/bench.db"
+    sys.path.insert(0, ROOT)
+    plate_id, token = await prepare_database()
+
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(args.port),
+         "--log-level", "critical"],
+        cwd=ROOT,
+        env=os.environ.copy(),
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        for _ in range(100):
+            try:
+                urllib.request.urlopen(f"http://127.0.0.1:{args.port}/health")
+                break
+            except OSError:
+                await asyncio.sleep(0.1)
+
+        print(f"{'transport':<10} {'connected':>9} {'KB/conn':>8} "
+              f"{'fan-out ms':>10} {'conns/GiB':>10}")
+        for amount, name in enumerate(("sse", "websocket"), start=200):
+            if name == "sse":
+                clients = [SSEClient(args.port, plate_id) for _ in range(args.connections)]
+            else:
+                clients = [
+                    WebSocketClient(args.port, plate_id, token)
+                    for _ in range(args.connections)
+                ]
+            connected, per_connection, fanout_ms = await measure(
+                name, clients, server.pid, args.port, token, plate_id, amount
+            )
+            per_worker = MEMORY_BUDGET_MB * 1024 / per_connection if per_connection > 0 else 0
+            print(f"{name:<10} {connected:>9} {per_connection:>8.1f} "
+                  f"{fanout_ms:>10.1f} {per_worker:>10.0f}")
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--connections", type=int, default=500)
+    parser.add_argument("--port", type=int, default=8765)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""
+Cold start of the web process, the Celery worker and the CLI.
+
+Runs `python -X importtime` in fresh interpreters for each entry point,
+prints the slowest top-level imports, and checks the import boundaries:
+the web app must not load Celery (it is imported on first enqueue), and
+the worker and CLI must not load FastAPI. Then starts uvicorn and times
+process start to the first 200 from /health.
+
+    python -m benchmarks.startup --top 10 --runs 3
+"""
+
+import argparse
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+BUDGET_SECONDS = 2.0
+
+ENTRY_POINTS = {
+    "web": ("import main", ("celery", "kombu")),
+    "worker": (
+        "import app.core.celery_app, app.tasks.notification_tasks, "
+        "app.tasks.user_tasks, app.tasks.plate_tasks",
+        ("fastapi", "starlette", "app.api"),
+    ),
+    "cli": ("import app.cli", ("fastapi", "starlette", "celery")),
+}
+
+
+def importtime(statement: str):
+    """
+    (module, self us, cumulative us, depth) for every import of `statement`
+    """
+    output = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stderr
+    rows = []
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        own, cumulative, name = line[len("import time:"):].split("|")
+        rows.append(
+            (name.strip(), int(own), int(cumulative), (len(name) - len(name.lstrip())) // 2)
+        )
+    return rows
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def first_request_seconds(timeout: float = 30.0) -> float:
+    port = free_port()
+    started = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=ROOT,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        while time.perf_counter() - started < timeout:
+            try:
+                with urllib.request.urlopen(f"http://127.0.0.1:{port}/health", timeout=1) as response:
+                    if response.status == 200:
+                        return time.perf_counter() - started
+            except (urllib.error.URLError, ConnectionError):
+                time.sleep(0.01)
+        raise RuntimeError(f"/health did not answer within {timeout}s")
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--top", type=int, default=10, help="slowest imports to list")
+    parser.add_argument("--runs", type=int, default=3, help="server cold starts to time")
+    args = parser.parse_args()
+
+    failed = False
+    for name, (statement, forbidden) in ENTRY_POINTS.items():
+        rows = importtime(statement)
+        total = sum(own for _, own, _, _ in rows)
+        print(f"\n{name}: {total / 1000:.0f} ms, {len(rows)} modules")
+        top_level = sorted((r for r in rows if r[3] == 1), key=lambda r: r[2], reverse=True)
+        for module, _, cumulative, _ in top_level[: args.top]:
+            print(f"  {cumulative / 1000:>8.1f} ms  {module}")
+        leaked = sorted(
+            {m for m, *_ in rows if any(m == f or m.startswith(f + ".") for f in forbidden)}
+        )
+        if leaked:
+            failed = True
+            print(f"  FAIL: imports {', '.join(leaked[:5])}{' ...' if len(leaked) > 5 else ''}")
+
+    timings = [first_request_seconds() for _ in range(args.runs)]
+    median = statistics.median(timings)
+    print(f"\ncold start to first /health: median {median:.2f}s over {args.runs} runs "
+          f"(min {min(timings):.2f}s, max {max(timings):.2f}s)")
+    if median > BUDGET_SECONDS:
+        failed = True
+        print(f"FAIL: exceeds {BUDGET_SECONDS}s budget")
+
+    if failed:
+        sys.exit(1)
+    print(f"OK: within {BUDGET_SECONDS}s budget, import boundaries hold")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Soak test: database pool usage while the number of open websockets grows.
+
+Runs uvicorn in-process on a scratch SQLite database, opens authenticated
+plate websockets in steps and, after each step, reports how many pooled
+connections are checked out and how long a REST read takes. Idle sockets must
+not hold connections, so the checked-out count has to stay flat.
+
+    python -m benchmarks.websocket_pool_soak --step 250 --steps 4
+
+Needs the `websockets` package.
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+import urllib.request
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+async def run(args):
+    import uvicorn
+    import websockets
+
+    os.environ["DATABASE_URL"] = (
+        f"sqlite+aiosqlite:///{tempfile.mkdtemp()}/soak.db"
+    )
+    sys.path.insert(0, ROOT)
+    from benchmarks.sse_vs_websocket import prepare_database
+    from app.database import engine
+
+    plate_id, token = await prepare_database()
+    from main import app
+
+    server = uvicorn.Server(
+        uvicorn.Config(app, port=args.port, log_level="critical")
+    )
+    serving = asyncio.create_task(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.05)
+
+    url = f"ws://127.0.0.1:{args.port}/ws/plates/{plate_id}/bids?token={token}"
+    loop = asyncio.get_running_loop()
+    sockets = []
+    peak = 0
+    print(f"{'sockets':>8} {'checked out':>12} {'REST read ms':>13}")
+    try:
+        for _ in range(args.steps):
+            for start in range(0, args.step, 50):
+                batch = await asyncio.gather(
+                    *(websockets.connect(url) for _ in range(min(50, args.step - start)))
+                )
+                # Wait for each snapshot so auth and snapshot queries are done
+                await asyncio.gather(*(socket.recv() for socket in batch))
+                sockets += batch
+            checked_out = engine.pool.checkedout()
+            peak = max(peak, checked_out)
+
+            started = time.perf_counter()
+            await loop.run_in_executor(
+                None,
+                urllib.request.urlopen,
+                f"http://127.0.0.1:{args.port}/api/v1/plates/{plate_id}/stats",
+            )
+            read_ms = (time.perf_counter() - started) * 1000
+            print(f"{len(sockets):>8} {checked_out:>12} {read_ms:>13.1f}")
+    finally:
+        await asyncio.gather(*(s.close() for s in sockets), return_exceptions=True)
+        server.should_exit = True
+        await serving
+
+    if peak:
+        print(f"FAIL: idle websockets held up to {peak} pooled connections")
+        sys.exit(1)
+    print("OK: pool usage independent of open websockets")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--step", type=int, default=250)
+    parser.add_argument("--steps", type=int, default=4)
+    parser.add_argument("--port", type=int, default=8766)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
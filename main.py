@@ -1,9 +1,17 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app import websocket
-from app.api import plates, bids, auth
+from app.api import admin, plates, bids, auth
+from app.core.active_bids import active_bid_views
+from app.core.actors import plate_actors
 from app.core.config import settings
-from app.core.celery_app import celery_app
+from app.core.idempotency import IdempotencyMiddleware
+from app.core.logging import RequestIdMiddleware, configure_logging, dropped_records
+from app.core.profiling import ProfilingMiddleware
+from app.core.rate_limit import RateLimitMiddleware
+from app.core.singleflight import single_flight_stats
+
+configure_logging()
 
 app = FastAPI(
     title=settings.APP_NAME,
@@ -12,6 +20,17 @@ app = FastAPI(
     openapi_url=f"/{settings.APP_VERSION}/openapi.json",
 )
 
+# Replay stored responses for retried bids carrying an Idempotency-Key
+app.add_middleware(IdempotencyMiddleware)
+
+# Reject over-limit bid and login calls before any DB or bcrypt work
+if settings.RATE_LIMIT_ENABLED:
+    app.add_middleware(RateLimitMiddleware)
+
+# Profiles sampled requests while switched on via /admin/profiling, rate
+# limiting and idempotency replay included
+app.add_middleware(ProfilingMiddleware)
+
 # Set up CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -21,10 +40,14 @@ app.add_middleware(
     allow_headers=settings.CORS_ALLOW_HEADERS,
 )
 
+# Outermost, so everything below logs with the request's id
+app.add_middleware(RequestIdMiddleware)
+
 # Include routers
 app.include_router(auth.auth_router, prefix=settings.API_PREFIX)
 app.include_router(plates.router, prefix=settings.API_PREFIX)
 app.include_router(bids.router, prefix=settings.API_PREFIX)
+app.include_router(admin.router, prefix=settings.API_PREFIX)
 app.include_router(websocket.router)
 
 
@@ -48,6 +71,19 @@ async def health_check():
     return {"status": "healthy"}
 
 
+@app.get("/metrics")
+async def metrics():
+    """
+    Request coalescing, bid actor, cache and logging counters of this worker.
+    """
+    return {
+        "single_flight": single_flight_stats(),
+        "actors": plate_actors.stats(),
+        "active_bids": active_bid_views.stats(),
+        "log_records_dropped": dropped_records(),
+    }
+
+
 if __name__ == "__main__":
     import uvicorn
 
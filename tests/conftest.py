@@ -0,0 +1,129 @@
+"""
+The app runs on scratch SQLite files: a primary, a read replica and three
+bid shards. The environment is set before anything imports app settings.
+"""
+
+import os
+import sqlite3
+import tempfile
+from argparse import Namespace
+from datetime import datetime, timedelta
+from itertools import count
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+DATA = Path(tempfile.mkdtemp(prefix="auto_plate_tests_"))
+PRIMARY = DATA / "primary.db"
+REPLICA = DATA / "replica.db"
+SHARDS = [DATA / f"shard{n}.db" for n in range(3)]
+
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{PRIMARY}"
+os.environ["DATABASE_READ_URL"] = f"sqlite+aiosqlite:///{REPLICA}"
+os.environ["BID_SHARD_URLS"] = ",".join(
+    f"sqlite+aiosqlite:///{shard}" for shard in SHARDS
+)
+os.environ["RATE_LIMIT_ENABLED"] = "false"
+
+USERNAMES = ["staff", "alice", "bob"]
+
+
+def replicate() -> None:
+    """
+    Bring the replica up to date with the primary
+    """
+    with sqlite3.connect(PRIMARY) as primary, sqlite3.connect(REPLICA) as replica:
+        primary.backup(replica)
+
+
+def migrate_shards() -> None:
+    """
+    Create the bid shards the way deployments do, so each allocates ids
+    from its own range
+    """
+    from alembic import command
+    from alembic.config import Config
+
+    config = Config(
+        str(ROOT / "alembic.ini"),
+        ini_section="shards",
+        cmd_opts=Namespace(x=["shard=all"]),
+    )
+    config.set_main_option("script_location", str(ROOT / "alembic" / "shards"))
+    command.upgrade(config, "head")
+
+
+def create_primary() -> None:
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import Session
+
+    import app.queries  # noqa: F401, imports every model
+    from app.core.security import get_password_hash
+    from app.database import Base
+    from app.models.user import User
+
+    engine = create_engine(f"sqlite:///{PRIMARY}")
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        session.add_all(
+            User(
+                username=name,
+                email=f"{name}@example.com",
+                hashed_password=get_password_hash("password123"),
+                is_staff=name == "staff",
+            )
+            for name in USERNAMES
+        )
+        session.commit()
+    engine.dispose()
+
+
+migrate_shards()
+create_primary()
+replicate()
+
+
+@pytest.fixture(scope="session")
+def client():
+    from fastapi.testclient import TestClient
+
+    from main import app
+
+    with TestClient(app) as client:
+        yield client
+
+
+@pytest.fixture(scope="session")
+def headers():
+    from app.core.security import create_access_token
+
+    return {
+        name: {"Authorization": f"Bearer {create_access_token({'sub': name})}"}
+        for name in USERNAMES
+    }
+
+
+_plate_numbers = count(1)
+
+
+@pytest.fixture
+def create_plate(client, headers):
+    """
+    Create an open plate as staff, returns its JSON
+    """
+
+    def create(price: str = "100.00") -> dict:
+        response = client.post(
+            "/api/v1/plates/",
+            json={
+                "plate_number": f"T{next(_plate_numbers):03d}AA",
+                "price": price,
+                "deadline": (datetime.now() + timedelta(days=3)).isoformat(),
+            },
+            headers=headers["staff"],
+        )
+        assert response.status_code == 201, response.text
+        return response.json()
+
+    return create
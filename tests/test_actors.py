@@ -0,0 +1,69 @@
+import asyncio
+
+from app.core.actors import PlateActors, lock_plates
+
+IDLE_SECONDS = 0.02
+
+
+async def noop():
+    return True
+
+
+def submitted_at_the_idle_deadline(submit) -> int:
+    """
+    Commands, out of 20, still unanswered after being queued right when
+    their plate's actor timed out
+    """
+
+    async def run():
+        actors = PlateActors("", [], IDLE_SECONDS)
+        loop = asyncio.get_running_loop()
+        pending = []
+        for plate_id in range(20):
+            await actors.run(plate_id, noop)
+            loop.call_later(
+                IDLE_SECONDS,
+                lambda plate_id=plate_id: pending.append(
+                    asyncio.ensure_future(submit(actors, plate_id))
+                ),
+            )
+            await asyncio.sleep(IDLE_SECONDS * 2)
+        done, hung = await asyncio.wait(pending, timeout=1)
+        for task in hung:
+            task.cancel()
+        return len(hung)
+
+    return asyncio.run(run())
+
+
+def test_commands_queued_as_the_actor_stops_still_run():
+    hung = submitted_at_the_idle_deadline(
+        lambda actors, plate_id: actors.run(plate_id, noop)
+    )
+    assert hung == 0
+
+
+def test_batches_queued_as_the_actor_stops_still_run():
+    hung = submitted_at_the_idle_deadline(
+        lambda actors, plate_id: actors.run_many([plate_id], noop)
+    )
+    assert hung == 0
+
+
+def test_plates_owned_elsewhere_are_locked_instead():
+    async def locking():
+        return lock_plates.get()
+
+    async def run():
+        actors = PlateActors("a", ["a", "b"], IDLE_SECONDS)
+        owned = next(plate_id for plate_id in range(100) if actors.owns(plate_id))
+        other = next(plate_id for plate_id in range(100) if not actors.owns(plate_id))
+        return (
+            await actors.run(owned, locking),
+            await actors.run(other, locking),
+            await actors.run_many([owned], locking),
+            await actors.run_many([owned, other], locking),
+            lock_plates.get(),
+        )
+
+    assert asyncio.run(run()) == (False, True, False, True, False)
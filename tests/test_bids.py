@@ -0,0 +1,82 @@
+import sqlite3
+
+from tests.conftest import PRIMARY
+
+
+def plate_row(plate_id):
+    with sqlite3.connect(PRIMARY) as connection:
+        return connection.execute(
+            "SELECT price, bid_count, bidder_count FROM auto_plates WHERE id = ?",
+            (plate_id,),
+        ).fetchone()
+
+
+def place_bid(client, headers, plate_id, amount):
+    return client.post(
+        "/api/v1/bids/",
+        json={"plate_id": plate_id, "amount": amount},
+        headers=headers,
+    )
+
+
+def test_deleting_a_bid_updates_the_plate_counters(client, headers, create_plate):
+    plate = create_plate()
+    placed = []
+    for name, amount in (("alice", "150.00"), ("bob", "200.00")):
+        response = place_bid(client, headers[name], plate["id"], amount)
+        assert response.status_code == 201, response.text
+        placed.append(response.json())
+    assert plate_row(plate["id"]) == (20000, 2, 2)
+
+    response = client.delete(
+        f"/api/v1/bids/{placed[0]['id']}", headers=headers["alice"]
+    )
+    assert response.status_code == 204
+    # Bids placed stay counted, the standing ones drop
+    assert plate_row(plate["id"]) == (20000, 2, 1)
+
+
+def test_deleting_the_top_bid_reprices_the_plate(client, headers, create_plate):
+    plate = create_plate("100.00")
+    alice = place_bid(client, headers["alice"], plate["id"], "150.00").json()
+    bob = place_bid(client, headers["bob"], plate["id"], "200.00").json()
+
+    response = client.delete(f"/api/v1/bids/{bob['id']}", headers=headers["bob"])
+    assert response.status_code == 204
+    assert plate_row(plate["id"])[0] == 15000
+    # Bob only has to beat the bid still standing
+    bob = place_bid(client, headers["bob"], plate["id"], "160.00")
+    assert bob.status_code == 201, bob.text
+
+    for name, bid in (("alice", alice), ("bob", bob.json())):
+        response = client.delete(f"/api/v1/bids/{bid['id']}", headers=headers[name])
+        assert response.status_code == 204
+    assert plate_row(plate["id"])[0] == 10000
+    # Without bids the start price itself is acceptable again
+    response = place_bid(client, headers["alice"], plate["id"], "100.00")
+    assert response.status_code == 201, response.text
+
+
+def active_status(client, headers, plate_id):
+    response = client.get("/api/v1/bids/active", headers=headers)
+    assert response.status_code == 200, response.text
+    return [row["status"] for row in response.json() if row["plate_id"] == plate_id]
+
+
+def test_only_the_winning_bid_of_a_tie_is_leading(client, headers, create_plate):
+    plate = create_plate("100.00")
+    # Bob's bid is the older one, Alice's proxy answers it
+    assert place_bid(client, headers["bob"], plate["id"], "100.00").status_code == 201
+    response = client.post(
+        "/api/v1/bids/proxy",
+        json={"plate_id": plate["id"], "max_amount": "200.00"},
+        headers=headers["alice"],
+    )
+    assert response.status_code in (200, 201), response.text
+
+    # Bob's raise ties the proxy maximum, the earlier proxy keeps the lead
+    response = place_bid(client, headers["bob"], plate["id"], "200.00")
+    assert response.status_code == 201, response.text
+    assert plate_row(plate["id"])[0] == 20000
+    assert active_status(client, headers["alice"], plate["id"]) == ["leading"]
+    assert active_status(client, headers["bob"], plate["id"]) == ["outbid"]
@@ -0,0 +1,36 @@
+import csv
+import io
+import json
+
+from tests.conftest import replicate
+
+# 2**53 + 1 minor units, the first amount a float cannot hold
+AMOUNT = "90071992547409.93"
+
+
+def export(client, headers, plate_id, fmt):
+    response = client.get(
+        "/api/v1/bids/export",
+        params={"format": fmt, "plate_id": plate_id},
+        headers=headers["staff"],
+    )
+    assert response.status_code == 200, response.text
+    return response.text
+
+
+def test_exported_amounts_keep_every_cent(client, headers, create_plate):
+    plate = create_plate()
+    response = client.post(
+        "/api/v1/bids/",
+        json={"plate_id": plate["id"], "amount": AMOUNT},
+        headers=headers["alice"],
+    )
+    assert response.status_code == 201, response.text
+    replicate()
+
+    rows = csv.DictReader(io.StringIO(export(client, headers, plate["id"], "csv")))
+    assert [row["amount"] for row in rows] == [AMOUNT]
+    lines = export(client, headers, plate["id"], "ndjson").splitlines()
+    assert [json.loads(line)["amount"] for line in lines] == [AMOUNT]
+    (chunk,) = export(client, headers, plate["id"], "columnar").splitlines()
+    assert json.loads(chunk)["columns"]["amount"] == [AMOUNT]
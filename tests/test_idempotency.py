@@ -0,0 +1,32 @@
+import asyncio
+
+from app.core.idempotency import MemoryIdempotencyStore
+
+
+async def store_response(store, key):
+    assert await store.begin(key, "fingerprint", wait=0) == ("proceed", None)
+    await store.complete(key, {"fingerprint": "fingerprint", "key": key})
+
+
+def test_memory_store_keeps_the_most_recently_used_keys():
+    async def run():
+        store = MemoryIdempotencyStore(ttl=60, max_keys=2)
+        await store_response(store, "a")
+        await store_response(store, "b")
+        outcome, response = await store.begin("a", "fingerprint", wait=0)
+        assert (outcome, response["key"]) == ("replay", "a")
+
+        await store_response(store, "c")
+        assert list(store._responses) == ["a", "c"]
+        assert await store.begin("b", "fingerprint", wait=0) == ("proceed", None)
+
+    asyncio.run(run())
+
+
+def test_memory_store_forgets_expired_keys():
+    async def run():
+        store = MemoryIdempotencyStore(ttl=0, max_keys=2)
+        await store_response(store, "a")
+        assert await store.begin("a", "fingerprint", wait=0) == ("proceed", None)
+
+    asyncio.run(run())
@@ -0,0 +1,65 @@
+import sqlite3
+from datetime import datetime, timedelta
+
+from sqlalchemy import false
+
+from app.controllers import import_controller
+from tests.conftest import PRIMARY
+
+DEADLINE = (datetime.now() + timedelta(days=3)).isoformat()
+
+
+def import_csv(client, headers, body: str) -> dict:
+    response = client.post(
+        "/api/v1/plates/import?format=csv",
+        content=body.encode(),
+        headers=headers["staff"],
+    )
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def description(plate_number):
+    with sqlite3.connect(PRIMARY) as connection:
+        return connection.execute(
+            "SELECT description FROM auto_plates WHERE plate_number = ?",
+            (plate_number,),
+        ).fetchall()
+
+
+def test_quoted_fields_may_span_lines(client, headers):
+    body = (
+        "plate_number,price,deadline,description\r\n"
+        f'I001AA,100,{DEADLINE},"Two lines,\r\nwith ""quotes"""\r\n'
+        f"I002AA,-5,{DEADLINE},negative price\r\n"
+        f"I003AA,100,{DEADLINE}\r\n"
+        f"I004AA,100,{DEADLINE},\r\n"
+    )
+    result = import_csv(client, headers, body)
+
+    assert result["imported"] == 2
+    assert [error["line"] for error in result["errors"]] == [4, 5]
+    assert "expected 4 columns, got 3" in result["errors"][1]["error"]
+    assert description("I001AA") == [('Two lines,\r\nwith "quotes"',)]
+    assert description("I004AA") == [(None,)]
+
+
+def test_rows_rejected_by_the_database_do_not_fail_their_batch(
+    client, headers, create_plate, monkeypatch
+):
+    taken = create_plate()["plate_number"]
+    # As if the plate was created between the duplicate check and the insert
+    real_select = import_controller.select
+    monkeypatch.setattr(
+        import_controller, "select", lambda *c: real_select(*c).where(false())
+    )
+    body = "plate_number,price,deadline\n" + "".join(
+        f"{number},100,{DEADLINE}\n" for number in ("I011AA", taken, "I012AA")
+    )
+    result = import_csv(client, headers, body)
+
+    assert result["imported"] == 2
+    assert result["failed"] == 1
+    assert result["errors"][0]["line"] == 3
+    assert "rejected by the database" in result["errors"][0]["error"]
+    assert description("I011AA") and description("I012AA")
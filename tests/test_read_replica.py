@@ -0,0 +1,43 @@
+import time
+
+import pytest
+
+from app.database import read_your_writes
+from tests.conftest import replicate
+
+
+@pytest.fixture(autouse=True)
+def unpinned(monkeypatch):
+    # Forget the writes of earlier tests
+    monkeypatch.setattr(read_your_writes, "_pinned", {})
+
+
+def test_get_routes_read_from_the_replica(client, headers, create_plate):
+    plate = create_plate()
+
+    # Not replicated yet: alice, who never wrote, only sees the replica
+    response = client.get(f"/api/v1/plates/{plate['id']}", headers=headers["alice"])
+    assert response.status_code == 404
+    assert plate["id"] not in [p["id"] for p in client.get("/api/v1/plates/").json()]
+
+    replicate()
+    response = client.get(f"/api/v1/plates/{plate['id']}", headers=headers["alice"])
+    assert response.status_code == 200
+    assert response.json()["plate_number"] == plate["plate_number"]
+
+
+def test_writer_reads_from_the_primary_until_the_pin_expires(
+    client, headers, create_plate, monkeypatch
+):
+    monkeypatch.setattr(read_your_writes, "window", 0.5)
+    plate = create_plate()
+
+    # Within the window staff sees its own write, alice does not
+    response = client.get(f"/api/v1/plates/{plate['id']}", headers=headers["staff"])
+    assert response.status_code == 200
+    response = client.get(f"/api/v1/plates/{plate['id']}", headers=headers["alice"])
+    assert response.status_code == 404
+
+    time.sleep(0.6)
+    response = client.get(f"/api/v1/plates/{plate['id']}", headers=headers["staff"])
+    assert response.status_code == 404
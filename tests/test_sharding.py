@@ -0,0 +1,86 @@
+import sqlite3
+
+from app.sharding import SHARD_ID_BITS, bid_shards
+from tests.conftest import PRIMARY, SHARDS
+
+
+def rows(path, sql, *params):
+    with sqlite3.connect(path) as connection:
+        return connection.execute(sql, params).fetchall()
+
+
+def shard_of(bid_id):
+    """
+    The shard file holding a bid, by looking at every one
+    """
+    holding = [
+        n
+        for n, shard in enumerate(SHARDS)
+        if rows(shard, "SELECT 1 FROM bids WHERE id = ?", bid_id)
+    ]
+    assert len(holding) == 1
+    return holding[0]
+
+
+def place_bid(client, headers, plate_id, amount):
+    response = client.post(
+        "/api/v1/bids/",
+        json={"plate_id": plate_id, "amount": amount},
+        headers=headers,
+    )
+    assert response.status_code == 201, response.text
+    return response.json()
+
+
+def test_bids_are_placed_by_plate_in_the_shard_id_range(client, headers, create_plate):
+    assert bid_shards.count == len(SHARDS)
+    plates = [create_plate() for _ in SHARDS]
+    for plate in plates:
+        bid = place_bid(client, headers["alice"], plate["id"], "150.00")
+        shard = plate["id"] % len(SHARDS)
+        assert shard_of(bid["id"]) == shard
+        assert bid["id"] >> SHARD_ID_BITS == shard
+        assert shard << SHARD_ID_BITS < bid["id"] < (shard + 1) << SHARD_ID_BITS
+    assert rows(PRIMARY, "SELECT id FROM bids") == []
+
+
+def test_bids_are_found_updated_and_deleted_by_id(client, headers, create_plate):
+    for plate in [create_plate() for _ in SHARDS]:
+        bid = place_bid(client, headers["bob"], plate["id"], "150.00")
+        shard = SHARDS[shard_of(bid["id"])]
+
+        response = client.get(f"/api/v1/bids/{bid['id']}", headers=headers["bob"])
+        assert response.status_code == 200
+        assert response.json()["id"] == bid["id"]
+
+        response = client.put(
+            f"/api/v1/bids/{bid['id']}",
+            json={"amount": "200.00"},
+            headers=headers["bob"],
+        )
+        assert response.status_code == 200, response.text
+        assert rows(shard, "SELECT amount FROM bids WHERE id = ?", bid["id"]) == [
+            (20000,)
+        ]
+
+        response = client.delete(f"/api/v1/bids/{bid['id']}", headers=headers["bob"])
+        assert response.status_code == 204
+        assert rows(shard, "SELECT 1 FROM bids WHERE id = ?", bid["id"]) == []
+        response = client.get(f"/api/v1/bids/{bid['id']}", headers=headers["bob"])
+        assert response.status_code == 404
+
+
+def test_user_bids_are_gathered_from_every_shard(client, headers, create_plate):
+    before = {
+        bid["id"]
+        for bid in client.get("/api/v1/bids/", headers=headers["staff"]).json()
+    }
+    placed = {
+        place_bid(client, headers["staff"], create_plate()["id"], "150.00")["id"]
+        for _ in SHARDS
+    }
+    assert {shard_of(bid_id) for bid_id in placed} == set(range(len(SHARDS)))
+
+    response = client.get("/api/v1/bids/", headers=headers["staff"])
+    assert response.status_code == 200
+    assert {bid["id"] for bid in response.json()} == before | placed
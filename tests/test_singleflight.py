@@ -0,0 +1,52 @@
+import asyncio
+
+import httpx
+import pytest
+
+from app import dependencies
+from app.controllers import plate_controller
+from app.database import async_session_factory, engine, read_your_writes
+
+# More concurrent callers than the primary's pool has connections (5 + 10)
+CALLERS = 40
+
+
+@pytest.fixture
+def no_replica(monkeypatch):
+    """
+    Reads and their flights on the primary, as when DATABASE_READ_URL is
+    not set
+    """
+    monkeypatch.setattr(dependencies, "read_engine", engine)
+    monkeypatch.setattr(plate_controller, "read_session_factory", async_session_factory)
+    monkeypatch.setattr(read_your_writes, "_pinned", {})
+
+
+def test_coalesced_reads_do_not_starve_a_shared_pool(
+    client, headers, create_plate, no_replica
+):
+    plate = create_plate()
+    response = client.post(
+        "/api/v1/bids/",
+        json={"plate_id": plate["id"], "amount": "150.00"},
+        headers=headers["alice"],
+    )
+    assert response.status_code == 201, response.text
+
+    async def read_concurrently(path):
+        transport = httpx.ASGITransport(app=client.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://t") as c:
+            responses = await asyncio.wait_for(
+                asyncio.gather(
+                    *(c.get(path, headers=headers["bob"]) for _ in range(CALLERS))
+                ),
+                timeout=10,
+            )
+        return [response.status_code for response in responses]
+
+    for path in (
+        f"/api/v1/plates/{plate['id']}",
+        f"/api/v1/bids/plates/{plate['id']}/highest",
+    ):
+        # On the app's event loop, where its engines live
+        assert client.portal.call(read_concurrently, path) == [200] * CALLERS
@@ -0,0 +1,61 @@
+import asyncio
+import time
+
+import pytest
+from starlette.testclient import WebSocketDenialResponse
+from starlette.websockets import WebSocketDisconnect
+
+from app import websocket
+from app.core.security import create_access_token
+from tests.conftest import replicate
+
+TOKEN = create_access_token({"sub": "alice"})
+
+
+def test_failed_snapshots_leave_no_subscription(client):
+    with pytest.raises((WebSocketDenialResponse, WebSocketDisconnect)):
+        with client.websocket_connect(f"/ws/plates/999999/bids?token={TOKEN}") as ws:
+            ws.receive_json()
+
+    assert 999999 not in websocket.manager.active_connections
+    assert not any(
+        999999 in plates for plates in websocket.manager.subscriptions.values()
+    )
+
+
+def test_bid_errors_are_reported_on_the_open_connection(
+    client, create_plate, monkeypatch
+):
+    async def broken(self, bid_in, user):
+        raise RuntimeError("database went away")
+
+    monkeypatch.setattr(websocket.BidController, "create_bid", broken)
+    plate = create_plate()
+    replicate()
+
+    with client.websocket_connect(f"/ws?token={TOKEN}") as ws:
+        ws.send_json({"action": "place_bid", "plate_id": plate["id"], "amount": 150})
+        assert ws.receive_json() == {"type": "error", "detail": "Could not place bid"}
+        ws.send_json({"action": "ping"})
+        assert ws.receive_json() == {"type": "pong"}
+
+
+def test_notifications_are_published_off_the_event_loop(monkeypatch):
+    published = []
+
+    def slow_broker(*args):
+        time.sleep(0.5)
+        published.append(args)
+
+    monkeypatch.setattr(websocket, "publish_bid_notification", slow_broker)
+
+    async def run():
+        started = time.perf_counter()
+        websocket.enqueue_bid_notification(1, 2, 150.0)
+        await asyncio.sleep(0)
+        blocked = time.perf_counter() - started
+        await asyncio.gather(*websocket._publishing)
+        return blocked
+
+    assert asyncio.run(run()) < 0.1
+    assert published == [(1, 2, 150.0)]
@@ -0,0 +1,34 @@
+from contextlib import ExitStack
+
+from app.core.security import create_access_token
+from app.database import engine, read_engine
+from app.sharding import bid_shards
+from tests.conftest import replicate
+
+
+def checked_out():
+    """
+    Pooled connections in use on the primary, the replica and the shards
+    """
+    engines = {engine, read_engine, *bid_shards.engines}
+    return sum(e.pool.checkedout() for e in engines)
+
+
+def test_idle_websockets_hold_no_pooled_connections(client, create_plate):
+    plate = create_plate()
+    replicate()
+    url = f"/ws/plates/{plate['id']}/bids?token={create_access_token({'sub': 'alice'})}"
+    baseline = checked_out()
+
+    with ExitStack() as stack:
+        for _ in range(4):
+            for _ in range(25):
+                socket = stack.enter_context(client.websocket_connect(url))
+                # Authenticated and sent its snapshot: done with the database
+                assert socket.receive_json()["type"] == "highest_bid"
+            assert checked_out() == baseline
+
+        # REST traffic still gets connections with 100 sockets open
+        response = client.get(f"/api/v1/plates/{plate['id']}/stats")
+        assert response.status_code == 200
+        assert checked_out() == baseline